@@ -0,0 +1,223 @@
+"""
+AsyncTaskService concurrency benchmark
+
+Runs a mixed read/write workload from many concurrent coroutines against a
+seeded database and reports throughput, per-operation latency and how long
+the event loop was blocked (the worst delay seen by a 1 ms ticker). The
+same operations run sequentially through the synchronous TaskService as a
+baseline.
+
+Usage:
+    python -m benchmarks.bench_async_service [--size 100000]
+        [--concurrency 100,500] [--operations 5000] [--readers 4]
+        [--write-ratio 0.2] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import environment, percentile, seed_database, write_results
+from src.repositories.task_repository_db import TaskRepositoryDB
+from src.services.async_task_service import AsyncTaskService
+from src.services.task_service import TaskService
+
+
+def build_workload(
+    size: int, operations: int, write_ratio: float, seed: int = 42
+) -> List[tuple]:
+    """
+    Build a reproducible list of (operation name, argument) pairs
+
+    Args:
+        size: Number of seeded tasks
+        operations: Number of operations
+        write_ratio: Fraction of operations that write
+        seed: Random seed
+
+    Returns:
+        Operations to run
+    """
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(operations):
+        task_id = rng.randint(1, size)
+        if rng.random() < write_ratio:
+            workload.append(
+                rng.choice([("mark_task_done", task_id), ("add_task", "Bench")])
+            )
+        else:
+            workload.append(
+                rng.choice(
+                    [("get_task", task_id), ("list_page", "todo"), ("counts", None)]
+                )
+            )
+    return workload
+
+
+def sync_call(service: TaskService, name: str, argument: Any) -> Any:
+    """
+    Run one workload operation on the synchronous service
+    """
+    if name == "get_task":
+        return service.repository.find_by_id(argument)
+    if name == "list_page":
+        return service.list_tasks_by_status(argument, limit=50)
+    if name == "counts":
+        return service.counts()
+    return getattr(service, name)(argument)
+
+
+def async_call(service: AsyncTaskService, name: str, argument: Any):
+    """
+    Start one workload operation on the async service
+    """
+    if name == "list_page":
+        return service.list_tasks_by_status(argument, limit=50)
+    if name == "counts":
+        return service.counts()
+    return getattr(service, name)(argument)
+
+
+def bench_sync(service: TaskService, workload: List[tuple]) -> Dict[str, Any]:
+    """
+    Run the workload sequentially on the synchronous service
+
+    Args:
+        service: Service bound to the seeded database
+        workload: Operations to run
+
+    Returns:
+        Result entry
+    """
+    latencies = []
+    start = time.perf_counter()
+    for name, argument in workload:
+        began = time.perf_counter()
+        sync_call(service, name, argument)
+        latencies.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+    return summarize_run("sync_sequential", 1, workload, elapsed, latencies, None)
+
+
+async def bench_async(
+    service: AsyncTaskService, workload: List[tuple], concurrency: int
+) -> Dict[str, Any]:
+    """
+    Run the workload from `concurrency` coroutines sharing one queue
+
+    Args:
+        service: Async service bound to the seeded database
+        workload: Operations to run
+        concurrency: Number of concurrent coroutines
+
+    Returns:
+        Result entry
+    """
+    queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+    for item in workload:
+        queue.put_nowait(item)
+    latencies: List[float] = []
+    lag: List[float] = []
+    running = True
+
+    async def ticker():
+        while running:
+            began = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag.append((time.perf_counter() - began) * 1000 - 1)
+
+    async def worker():
+        while not queue.empty():
+            name, argument = queue.get_nowait()
+            began = time.perf_counter()
+            await async_call(service, name, argument)
+            latencies.append((time.perf_counter() - began) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    running = False
+    await tick
+    return summarize_run("async", concurrency, workload, elapsed, latencies, lag)
+
+
+def summarize_run(
+    mode: str,
+    concurrency: int,
+    workload: List[tuple],
+    elapsed: float,
+    latencies: List[float],
+    lag: Any,
+) -> Dict[str, Any]:
+    """
+    Build a result entry for one run
+    """
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "operations": len(workload),
+        "ops_per_sec": round(len(workload) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_loop_lag_ms": round(max(lag), 3) if lag else None,
+    }
+
+
+def run_all(service: AsyncTaskService, workload, levels: List[int]) -> List[Dict]:
+    """
+    Run the async workload once per concurrency level on one event loop
+    """
+
+    async def runs():
+        return [await bench_async(service, workload, level) for level in levels]
+
+    return asyncio.run(runs())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--concurrency", default="100,500")
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    levels = [int(level) for level in options.concurrency.split(",")]
+    workload = build_workload(options.size, options.operations, options.write_ratio)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        handler = seed_database(os.path.join(temp_dir, "bench.db"), options.size)
+        service = TaskService(TaskRepositoryDB(handler))
+        results = [bench_sync(service, workload)]
+        async_service = AsyncTaskService(service, readers=options.readers)
+        try:
+            results.extend(run_all(async_service, workload, levels))
+        finally:
+            async_service.close()
+            handler.close()
+
+    write_results(
+        {
+            "benchmark": "async_service",
+            "environment": environment(),
+            "size": options.size,
+            "readers": options.readers,
+            "write_ratio": options.write_ratio,
+            "results": results,
+        },
+        options.output,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
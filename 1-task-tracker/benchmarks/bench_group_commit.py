@@ -0,0 +1,240 @@
+"""
+Group commit benchmark
+
+Compares per-operation commits with group commit for task inserts:
+
+- per_op: DBHandler default, one transaction per save_task
+  (synchronous=NORMAL, and synchronous=FULL for equal durability)
+- group_pipelined: one producer submitting writes and collecting the
+  futures, for several group sizes
+- group_threads: several threads calling the blocking save_task
+
+Reports writes/sec, p50/p99 latency until a write is committed and how
+many commits were needed.
+
+Usage:
+    python -m benchmarks.bench_group_commit [--writes 5000]
+        [--batch-sizes 1,8,32,128,512] [--delay-ms 2] [--threads 8]
+        [--output results.json]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import wait
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import environment, percentile, write_results
+from src.models.task import Task
+from src.utils.db_handler import DBHandler
+
+
+def fresh_handler(temp_dir: str, name: str, **options: Any) -> DBHandler:
+    """
+    Create a handler on a new, initialized database
+
+    Args:
+        temp_dir: Directory for the database file
+        name: Database file name
+        **options: DBHandler options
+
+    Returns:
+        Handler with its schema created
+    """
+    handler = DBHandler(os.path.join(temp_dir, f"{name}.db"), **options)
+    handler.get_next_id()
+    return handler
+
+
+def result_entry(
+    mode: str,
+    writes: int,
+    elapsed: float,
+    latencies: List[float],
+    stats: Optional[Dict[str, int]],
+    **extra: Any,
+) -> Dict[str, Any]:
+    """
+    Build a result entry for one run
+    """
+    return {
+        "mode": mode,
+        **extra,
+        "writes": writes,
+        "writes_per_sec": round(writes / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "commits": stats["commits"] if stats else writes,
+    }
+
+
+def bench_per_op(temp_dir: str, writes: int, synchronous: str) -> Dict[str, Any]:
+    """
+    Insert with one commit per write
+
+    Args:
+        temp_dir: Directory for the database file
+        writes: Number of inserts
+        synchronous: PRAGMA synchronous level of the connection
+
+    Returns:
+        Result entry
+    """
+    handler = fresh_handler(temp_dir, f"per_op_{synchronous}")
+    handler._get_connection().execute(f"PRAGMA synchronous = {synchronous}")
+    latencies = []
+    start = time.perf_counter()
+    for i in range(writes):
+        began = time.perf_counter()
+        handler.save_task(Task(None, f"Task {i}"))
+        latencies.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+    handler.close()
+    return result_entry(
+        "per_op", writes, elapsed, latencies, None, synchronous=synchronous
+    )
+
+
+def bench_pipelined(
+    temp_dir: str, writes: int, batch_size: int, delay_ms: float
+) -> Dict[str, Any]:
+    """
+    Submit every write from one thread, then wait for all futures
+
+    Args:
+        temp_dir: Directory for the database file
+        writes: Number of inserts
+        batch_size: Maximum writes per group commit
+        delay_ms: Group commit wait for more writes
+
+    Returns:
+        Result entry
+    """
+    handler = fresh_handler(
+        temp_dir,
+        f"pipelined_{batch_size}",
+        group_commit=True,
+        commit_batch_size=batch_size,
+        commit_delay_ms=delay_ms,
+    )
+    latencies: List[float] = []
+    futures = []
+    start = time.perf_counter()
+    for i in range(writes):
+        began = time.perf_counter()
+        future = handler.submit_save_task(Task(None, f"Task {i}"))
+        future.add_done_callback(
+            lambda _, began=began: latencies.append(
+                (time.perf_counter() - began) * 1000
+            )
+        )
+        futures.append(future)
+    wait(futures)
+    elapsed = time.perf_counter() - start
+    stats = handler.group_commit_stats()
+    handler.close()
+    return result_entry(
+        "group_pipelined",
+        writes,
+        elapsed,
+        latencies,
+        stats,
+        batch_size=batch_size,
+        delay_ms=delay_ms,
+    )
+
+
+def bench_threads(
+    temp_dir: str, writes: int, threads: int, batch_size: int, delay_ms: float
+) -> Dict[str, Any]:
+    """
+    Call the blocking save_task from several threads at once
+
+    Args:
+        temp_dir: Directory for the database file
+        writes: Total number of inserts
+        threads: Number of writer threads
+        batch_size: Maximum writes per group commit
+        delay_ms: Group commit wait for more writes
+
+    Returns:
+        Result entry
+    """
+    handler = fresh_handler(
+        temp_dir,
+        f"threads_{threads}",
+        group_commit=True,
+        commit_batch_size=batch_size,
+        commit_delay_ms=delay_ms,
+    )
+    latencies: List[float] = []
+    per_thread = writes // threads
+
+    def writer(n: int) -> None:
+        for i in range(per_thread):
+            began = time.perf_counter()
+            handler.save_task(Task(None, f"Thread {n} task {i}"))
+            latencies.append((time.perf_counter() - began) * 1000)
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    stats = handler.group_commit_stats()
+    handler.close()
+    return result_entry(
+        "group_threads",
+        per_thread * threads,
+        elapsed,
+        latencies,
+        stats,
+        threads=threads,
+        batch_size=batch_size,
+        delay_ms=delay_ms,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writes", type=int, default=5000)
+    parser.add_argument("--batch-sizes", default="1,8,32,128,512")
+    parser.add_argument("--delay-ms", type=float, default=2.0)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    batch_sizes = [int(size) for size in options.batch_sizes.split(",")]
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for synchronous in ("NORMAL", "FULL"):
+            results.append(bench_per_op(temp_dir, options.writes, synchronous))
+        for batch_size in batch_sizes:
+            results.append(
+                bench_pipelined(temp_dir, options.writes, batch_size, options.delay_ms)
+            )
+        results.append(
+            bench_threads(
+                temp_dir,
+                options.writes,
+                options.threads,
+                max(batch_sizes),
+                options.delay_ms,
+            )
+        )
+
+    write_results(
+        {"benchmark": "group_commit", "environment": environment(), "results": results},
+        options.output,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
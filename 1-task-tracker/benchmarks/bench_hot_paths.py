@@ -0,0 +1,195 @@
+"""
+Hot path benchmark suite
+
+Seeds databases of several sizes through DBHandler, then times each
+TaskService operation in process and full `main.py` invocations end to
+end. Results are JSON and can be compared against a previous run to catch
+scaling regressions.
+
+Usage:
+    python -m benchmarks.bench_hot_paths [--sizes 1000,100000,1000000]
+        [--repeat 5] [--output results.json]
+        [--compare baseline.json] [--threshold 1.25]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from benchmarks.common import (
+    PROJECT_DIR,
+    environment,
+    seed_database,
+    time_call,
+    write_results,
+)
+from src.repositories.task_repository_db import TaskRepositoryDB
+from src.services.task_service import TaskService
+
+
+def bench_service(service: TaskService, size: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Time TaskService operations against a seeded database
+
+    Args:
+        service: Service bound to the seeded database
+        size: Number of seeded tasks
+        repeat: Timed runs per operation
+
+    Returns:
+        One result entry per operation
+    """
+    middle_id = size // 2 or 1
+    scratch_ids: List[int] = []
+
+    def add():
+        scratch_ids.append(service.add_task("Benchmark add").id)
+
+    def delete():
+        service.delete_task(scratch_ids.pop())
+
+    operations = {
+        "add_task": (add, None),
+        "find_by_id": (lambda: service.repository.find_by_id(middle_id), None),
+        "update_task": (lambda: service.update_task(middle_id, "Benchmark update"), None),
+        "mark_task_done": (lambda: service.mark_task_done(middle_id), None),
+        "mark_task_in_progress": (
+            lambda: service.mark_task_in_progress(middle_id),
+            None,
+        ),
+        "list_page_50": (lambda: service.list_tasks_by_status("all", limit=50), None),
+        "list_todo_page_50": (
+            lambda: service.list_tasks_by_status("todo", limit=50),
+            None,
+        ),
+        "list_all": (lambda: sum(1 for _ in service.iter_tasks_by_status("all")), None),
+        "list_done": (
+            lambda: sum(1 for _ in service.iter_tasks_by_status("done")),
+            None,
+        ),
+        "mark_tasks_status_range": (
+            lambda: service.mark_tasks_status([], [(1, min(size, 1000))], "todo"),
+            None,
+        ),
+        "delete_task": (delete, add),
+    }
+
+    results = []
+    for name, (func, setup) in operations.items():
+        timing = time_call(func, repeat=repeat, setup=setup)
+        results.append({"size": size, "kind": "service", "operation": name, **timing})
+    return results
+
+
+def bench_cli(db_path: str, size: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Time complete CLI processes against a seeded database
+
+    Args:
+        db_path: Seeded database file
+        size: Number of seeded tasks
+        repeat: Timed runs per command
+
+    Returns:
+        One result entry per command
+    """
+    env = dict(os.environ, TASK_TRACKER_DB=db_path)
+    middle_id = str(size // 2 or 1)
+    commands = {
+        "cli_usage": [],
+        "cli_add": ["add", "Benchmark CLI add"],
+        "cli_done": ["done", middle_id],
+        "cli_list_page_50": ["list", "--limit", "50"],
+        "cli_list_todo": ["list", "todo"],
+    }
+
+    results = []
+    for name, arguments in commands.items():
+
+        def run(arguments=arguments):
+            subprocess.run(
+                [sys.executable, "main.py", *arguments],
+                cwd=PROJECT_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+
+        timing = time_call(run, repeat=repeat)
+        results.append({"size": size, "kind": "cli", "operation": name, **timing})
+    return results
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline_path: str, threshold: float
+) -> List[str]:
+    """
+    Compare results against a baseline run
+
+    Args:
+        results: Current results
+        baseline_path: JSON file written by a previous run
+        threshold: Allowed slowdown ratio of the median
+
+    Returns:
+        Human readable description of each regression
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    previous = {
+        (entry["size"], entry["operation"]): entry["median_ms"]
+        for entry in baseline["results"]
+    }
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["size"], entry["operation"]))
+        if before and entry["median_ms"] > before * threshold:
+            regressions.append(
+                f"{entry['operation']} @ {entry['size']}: "
+                f"{before:.3f} ms -> {entry['median_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-cli", action="store_true")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    options = parser.parse_args()
+
+    sizes = [int(size) for size in options.sizes.split(",")]
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            db_path = os.path.join(temp_dir, f"bench_{size}.db")
+            handler = seed_database(db_path, size)
+            service = TaskService(TaskRepositoryDB(handler))
+            results.extend(bench_service(service, size, options.repeat))
+            handler.close()
+            if not options.skip_cli:
+                results.extend(bench_cli(db_path, size, options.repeat))
+
+    write_results(
+        {"benchmark": "hot_paths", "environment": environment(), "results": results},
+        options.output,
+    )
+
+    if options.compare:
+        regressions = compare(results, options.compare, options.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+HTTP JSON API load test
+
+Starts `main.py serve` on a seeded database (or targets a running instance
+with --url) and drives it from several client threads, each holding one
+keep-alive connection. Reports requests/sec and latency percentiles per
+endpoint mix, next to the cost of the equivalent one-shot CLI process.
+
+Usage:
+    python -m benchmarks.bench_http_server [--size 100000] [--clients 8]
+        [--requests 5000] [--workers N] [--url http://127.0.0.1:8080]
+        [--output results.json]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.common import (
+    PROJECT_DIR,
+    environment,
+    percentile,
+    seed_database,
+    time_call,
+    write_results,
+)
+
+# name -> (share of requests, request builder(rng, size) -> (method, path, body))
+MIXES = {
+    "read_only": [
+        (0.5, lambda rng, size: ("GET", f"/tasks/{rng.randint(1, size)}", None)),
+        (0.4, lambda rng, size: ("GET", "/tasks?status=todo&limit=50", None)),
+        (0.1, lambda rng, size: ("GET", "/stats", None)),
+    ],
+    "mixed": [
+        (0.4, lambda rng, size: ("GET", f"/tasks/{rng.randint(1, size)}", None)),
+        (0.3, lambda rng, size: ("GET", "/tasks?status=todo&limit=50", None)),
+        (
+            0.2,
+            lambda rng, size: (
+                "PATCH",
+                f"/tasks/{rng.randint(1, size)}",
+                {"status": rng.choice(["todo", "in-progress", "done"])},
+            ),
+        ),
+        (0.1, lambda rng, size: ("POST", "/tasks", {"description": "Load test"})),
+    ],
+}
+
+
+def start_server(db_path: str, workers: Optional[int]) -> Tuple[subprocess.Popen, str]:
+    """
+    Start `main.py serve` on a free port
+
+    Args:
+        db_path: Database file to serve
+        workers: Worker pool size, or None for the server default
+
+    Returns:
+        (server process, base URL)
+    """
+    command = [sys.executable, "main.py", "serve", "--port", "0"]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(
+        command,
+        cwd=PROJECT_DIR,
+        env=dict(os.environ, TASK_TRACKER_DB=db_path),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    if not line.startswith("Serving on "):
+        process.kill()
+        raise RuntimeError(f"Server failed to start: {line!r}")
+    return process, line.split()[2]
+
+
+def run_client(
+    url: str, mix: list, size: int, count: int, seed: int, latencies: List[float]
+) -> int:
+    """
+    Send `count` requests over one keep-alive connection
+
+    Args:
+        url: Server base URL
+        mix: Weighted request builders
+        size: Number of seeded tasks
+        count: Number of requests
+        seed: Random seed of this client
+        latencies: List the request latencies (ms) are appended to
+
+    Returns:
+        Number of responses with a 5xx status
+    """
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    rng = random.Random(seed)
+    weights = [share for share, _ in mix]
+    builders = [builder for _, builder in mix]
+    failures = 0
+    try:
+        for _ in range(count):
+            method, path, body = rng.choices(builders, weights)[0](rng, size)
+            payload = None if body is None else json.dumps(body)
+            began = time.perf_counter()
+            conn.request(method, path, body=payload)
+            response = conn.getresponse()
+            response.read()
+            latencies.append((time.perf_counter() - began) * 1000)
+            failures += response.status >= 500
+    finally:
+        conn.close()
+    return failures
+
+
+def bench_mix(
+    url: str, name: str, size: int, clients: int, requests: int
+) -> Dict[str, Any]:
+    """
+    Drive one request mix from concurrent clients
+
+    Args:
+        url: Server base URL
+        name: Name of the request mix
+        size: Number of seeded tasks
+        clients: Number of concurrent keep-alive connections
+        requests: Total number of requests
+
+    Returns:
+        Result entry
+    """
+    latencies: List[float] = []
+    failures = [0] * clients
+    per_client = max(1, requests // clients)
+
+    def client(index: int) -> None:
+        failures[index] = run_client(
+            url, MIXES[name], size, per_client, index, latencies
+        )
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mix": name,
+        "clients": clients,
+        "requests": len(latencies),
+        "failures": sum(failures),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(max(latencies), 3),
+    }
+
+
+def bench_cli_baseline(db_path: str, repeat: int) -> Dict[str, float]:
+    """
+    Time one-shot CLI processes doing a comparable single operation
+
+    Args:
+        db_path: Database file
+        repeat: Number of timed runs
+
+    Returns:
+        Timing summary of `main.py list todo --limit 50`
+    """
+    env = dict(os.environ, TASK_TRACKER_DB=db_path)
+    return time_call(
+        lambda: subprocess.run(
+            [sys.executable, "main.py", "list", "todo", "--limit", "50"],
+            cwd=PROJECT_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        ),
+        repeat=repeat,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, help="Server worker pool size")
+    parser.add_argument("--mixes", default=",".join(MIXES))
+    parser.add_argument("--url", help="Target a running server instead")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "benchmark": "http_server",
+        "environment": environment(),
+        "size": options.size,
+    }
+    mixes = options.mixes.split(",")
+
+    if options.url:
+        results["results"] = [
+            bench_mix(options.url, mix, options.size, options.clients, options.requests)
+            for mix in mixes
+        ]
+        write_results(results, options.output)
+        return 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "bench.db")
+        seed_database(db_path, options.size).close()
+        process, url = start_server(db_path, options.workers)
+        try:
+            results["results"] = [
+                bench_mix(url, mix, options.size, options.clients, options.requests)
+                for mix in mixes
+            ]
+        finally:
+            process.terminate()
+            process.wait()
+        results["cli_process_baseline"] = bench_cli_baseline(db_path, repeat=5)
+
+    write_results(results, options.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Multi-process write stress test
+
+Runs several processes against one database at the same time, each doing
+a mix of adds, description updates, status changes and deletes through
+TaskService, the way concurrent task-cli invocations or servers would.
+
+Reports for every process count the operations per second, p50/p99
+operation latency, the distribution of time spent waiting for the write
+lock, how many BEGIN IMMEDIATE retries were needed and how many writes
+gave up with DatabaseBusyError (which should stay at zero).
+
+Usage:
+    python -m benchmarks.bench_multiprocess_writes [--processes 1,2,4,8]
+        [--ops 500] [--seed-tasks 1000] [--busy-timeout-ms 5000]
+        [--retries 4] [--output results.json]
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import environment, percentile, seed_database, write_results
+from src.container.di_container import DIContainer
+from src.utils.db_handler import DatabaseBusyError
+
+# Share of each operation in the mix
+OPERATION_MIX = (("add", 0.4), ("update", 0.25), ("status", 0.25), ("delete", 0.1))
+
+
+def worker(
+    db_path: str,
+    ops: int,
+    seed_tasks: int,
+    busy_timeout_ms: int,
+    retries: int,
+    worker_id: int,
+    start: Any,
+    results: Any,
+) -> None:
+    """
+    Run one process's share of the workload and report its samples
+
+    Args:
+        db_path: Database shared by all processes
+        ops: Number of operations to run
+        seed_tasks: Number of tasks the database was seeded with
+        busy_timeout_ms: SQLite busy timeout of the process
+        retries: BEGIN IMMEDIATE retries after the busy timeout
+        worker_id: Index of the process, used as random seed
+        start: Event set once every process is ready
+        results: Queue receiving the samples
+    """
+    container = DIContainer(db_path=db_path, busy_timeout_ms=busy_timeout_ms)
+    handler = container.db_handler
+    handler.write_retries = retries
+    service = container.service
+    service.counts()  # open the connection before the clock starts
+    rng = random.Random(worker_id)
+    names = [name for name, _ in OPERATION_MIX]
+    weights = [weight for _, weight in OPERATION_MIX]
+
+    latencies: List[float] = []
+    lock_waits: List[float] = []
+    busy_errors = misses = 0
+    start.wait()
+    began = time.perf_counter()
+    for i in range(ops):
+        operation = rng.choices(names, weights)[0]
+        task_id = rng.randint(1, seed_tasks)
+        waited = handler.write_stats()["lock_wait_ms"]
+        op_started = time.perf_counter()
+        try:
+            if operation == "add":
+                service.add_task(f"Worker {worker_id} task {i}")
+            elif operation == "update":
+                service.update_task(task_id, f"Updated by worker {worker_id}")
+            elif operation == "status":
+                service.mark_task_done(task_id)
+            else:
+                service.delete_task(task_id)
+        except DatabaseBusyError:
+            busy_errors += 1
+        except ValueError:
+            misses += 1  # the task was deleted by another process
+        latencies.append((time.perf_counter() - op_started) * 1000)
+        lock_waits.append(handler.write_stats()["lock_wait_ms"] - waited)
+    elapsed = time.perf_counter() - began
+
+    results.put(
+        {
+            "elapsed": elapsed,
+            "latencies": latencies,
+            "lock_waits": lock_waits,
+            "busy_retries": handler.write_stats()["busy_retries"],
+            "busy_errors": busy_errors,
+            "misses": misses,
+        }
+    )
+    container.reset()
+
+
+def run(
+    temp_dir: str,
+    processes: int,
+    ops: int,
+    seed_tasks: int,
+    busy_timeout_ms: int,
+    retries: int,
+) -> Dict[str, Any]:
+    """
+    Run the workload with the given number of processes on a fresh database
+
+    Args:
+        temp_dir: Directory for the database file
+        processes: Number of concurrent processes
+        ops: Operations per process
+        seed_tasks: Tasks to seed the database with
+        busy_timeout_ms: SQLite busy timeout of every process
+        retries: BEGIN IMMEDIATE retries after the busy timeout
+
+    Returns:
+        Result entry
+    """
+    db_path = os.path.join(temp_dir, f"stress_{processes}.db")
+    seed_database(db_path, seed_tasks).close()
+
+    start = multiprocessing.Event()
+    results: Any = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=worker,
+            args=(
+                db_path,
+                ops,
+                seed_tasks,
+                busy_timeout_ms,
+                retries,
+                n,
+                start,
+                results,
+            ),
+        )
+        for n in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    time.sleep(0.5)  # let every process import and connect
+    start.set()
+    samples = []
+    while len(samples) < len(workers):
+        try:
+            samples.append(results.get(timeout=1))
+        except queue.Empty:
+            if any(process.exitcode not in (None, 0) for process in workers):
+                raise RuntimeError("A worker process failed") from None
+    for process in workers:
+        process.join()
+    # Wall-clock time of the workload, measured by the processes themselves
+    # so that process start-up and teardown are not counted
+    wall = max(sample["elapsed"] for sample in samples)
+
+    latencies = [value for sample in samples for value in sample["latencies"]]
+    lock_waits = [value for sample in samples for value in sample["lock_waits"]]
+    waited = [value for value in lock_waits if value >= 1.0]
+    return {
+        "processes": processes,
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / wall, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "lock_wait": {
+            "waited_1ms_or_more": len(waited),
+            "p50_ms": round(statistics.median(lock_waits), 3),
+            "p90_ms": round(percentile(lock_waits, 0.90), 3),
+            "p99_ms": round(percentile(lock_waits, 0.99), 3),
+            "max_ms": round(max(lock_waits), 3),
+        },
+        "busy_retries": sum(sample["busy_retries"] for sample in samples),
+        "busy_errors": sum(sample["busy_errors"] for sample in samples),
+        "missing_tasks": sum(sample["misses"] for sample in samples),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", default="1,2,4,8")
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--seed-tasks", type=int, default=1000)
+    parser.add_argument("--busy-timeout-ms", type=int, default=5000)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for processes in (int(count) for count in options.processes.split(",")):
+            results.append(
+                run(
+                    temp_dir,
+                    processes,
+                    options.ops,
+                    options.seed_tasks,
+                    options.busy_timeout_ms,
+                    options.retries,
+                )
+            )
+
+    write_results(
+        {
+            "benchmark": "multiprocess_writes",
+            "environment": environment(),
+            "busy_timeout_ms": options.busy_timeout_ms,
+            "retries": options.retries,
+            "results": results,
+        },
+        options.output,
+    )
+    failed = sum(result["busy_errors"] for result in results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+CLI startup benchmark
+
+Measures cold-start wall time of `main.py` for a few representative
+invocations, subtracts the bare interpreter start (`python -c pass`) and
+checks the remaining overhead against a budget. One `-X importtime` run
+per scenario reports which modules the CLI imported and the slowest ones.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 15] [--output results.json]
+        [--usage-budget-ms 40] [--command-budget-ms 90]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import PROJECT_DIR, environment, seed_database, summarize, write_results
+
+
+def time_process(arguments: List[str], env: Dict[str, str], repeat: int) -> Dict[str, float]:
+    """
+    Time a Python process from launch to exit
+
+    Args:
+        arguments: Arguments passed to the interpreter
+        env: Environment for the process
+        repeat: Number of timed launches
+
+    Returns:
+        Median, min and max wall time in milliseconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *arguments],
+            cwd=PROJECT_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def import_profile(arguments: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Run main.py once under -X importtime
+
+    Args:
+        arguments: CLI arguments
+        env: Environment for the process
+
+    Returns:
+        Project modules imported, total import time and the slowest modules
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *arguments],
+        cwd=PROJECT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us), name))
+
+    top_level = [module for module in modules if not module[3].startswith("  ")]
+    slowest = sorted(modules, key=lambda module: module[1], reverse=True)[:10]
+    return {
+        "total_import_ms": round(sum(module[2] for module in top_level) / 1000, 3),
+        "project_modules": sorted(
+            module[0] for module in modules if module[0].startswith("src")
+        ),
+        "slowest_self_ms": {module[0]: round(module[1] / 1000, 3) for module in slowest},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--usage-budget-ms", type=float, default=40.0)
+    parser.add_argument("--command-budget-ms", type=float, default=90.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "startup.db")
+        seed_database(db_path, 1000).close()
+        env = dict(os.environ, TASK_TRACKER_DB=db_path)
+
+        floor = time_process(["-c", "pass"], env, options.repeat)
+        scenarios = {
+            "usage": ([], options.usage_budget_ms),
+            "list_page": (["list", "--limit", "1"], options.command_budget_ms),
+            "add": (["add", "Startup benchmark"], options.command_budget_ms),
+            "done": (["done", "1"], options.command_budget_ms),
+        }
+
+        results = []
+        over_budget = []
+        for name, (arguments, budget) in scenarios.items():
+            timing = time_process(["main.py", *arguments], env, options.repeat)
+            overhead = round(timing["median_ms"] - floor["median_ms"], 3)
+            results.append(
+                {
+                    "scenario": name,
+                    **timing,
+                    "overhead_ms": overhead,
+                    "budget_ms": budget,
+                    "within_budget": overhead <= budget,
+                    "imports": import_profile(arguments, env),
+                }
+            )
+            if overhead > budget:
+                over_budget.append(f"{name}: {overhead:.1f} ms > {budget:.1f} ms")
+
+    write_results(
+        {
+            "benchmark": "startup",
+            "environment": environment(),
+            "interpreter_floor": floor,
+            "results": results,
+        },
+        options.output,
+    )
+    for message in over_budget:
+        print(f"OVER BUDGET {message}", file=sys.stderr)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Task hydration benchmark
+
+Compares the original way of loading rows (sqlite3.Row -> dict -> Task()
+with two clock reads -> timestamps overwritten) against Task.from_row on
+plain row tuples. Reports wall time and peak traced memory for holding
+the hydrated tasks.
+
+Usage:
+    python -m benchmarks.bench_task_model [--rows N] [--output results.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.models.task import Task
+from src.utils.timestamps import to_epoch_us
+
+
+class LegacyTask:
+    """Task model as it was before __slots__ and from_row"""
+
+    def __init__(self, id: int, description: str, status: str = "todo"):
+        self.id = id
+        self.description = description
+        self.status = status
+        self.created_at = datetime.now().isoformat()
+        self.updated_at = self.created_at
+
+
+def make_rows(count: int) -> List[tuple]:
+    """
+    Build rows shaped like DBHandler.iter_tasks output
+
+    Args:
+        count: Number of rows
+
+    Returns:
+        List of (id, description, status, created_at, updated_at) tuples
+    """
+    timestamp = to_epoch_us("2026-02-18T20:45:30.123456")
+    return [(i, f"Task {i}", "todo", timestamp, timestamp) for i in range(count)]
+
+
+def hydrate_legacy(rows: Sequence[tuple]) -> List[LegacyTask]:
+    """Hydrate rows the way TaskRepositoryDB originally did"""
+    columns = ("id", "description", "status", "created_at", "updated_at")
+    tasks = []
+    for row in rows:
+        task_data = dict(zip(columns, row))
+        task = LegacyTask(task_data["id"], task_data["description"], task_data["status"])
+        task.created_at = task_data["created_at"]
+        task.updated_at = task_data["updated_at"]
+        tasks.append(task)
+    return tasks
+
+
+def hydrate_from_row(rows: Sequence[tuple]) -> List[Task]:
+    """Hydrate rows with Task.from_row"""
+    return list(map(Task.from_row, rows))
+
+
+def measure(hydrate: Callable[[Sequence[tuple]], list], rows: Sequence[tuple]) -> Dict[str, Any]:
+    """
+    Time a hydration strategy and measure the memory its result holds
+
+    Args:
+        hydrate: Function turning rows into task objects
+        rows: Input rows
+
+    Returns:
+        Timing and memory figures
+    """
+    start = time.perf_counter()
+    tasks = hydrate(rows)
+    elapsed = time.perf_counter() - start
+    del tasks
+
+    tracemalloc.start()
+    tasks = hydrate(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+
+    return {
+        "seconds": round(elapsed, 4),
+        "ns_per_row": round(elapsed / len(rows) * 1e9, 1),
+        "peak_bytes": peak,
+        "bytes_per_row": round(peak / len(rows), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    rows = make_rows(options.rows)
+    results = {
+        "benchmark": "task_hydration",
+        "rows": options.rows,
+        "legacy": measure(hydrate_legacy, rows),
+        "from_row": measure(hydrate_from_row, rows),
+    }
+
+    payload = json.dumps(results, indent=2)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            file.write(payload + "\n")
+    print(payload)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Shared helpers for the benchmark scripts: seeding databases, timing
+operations and writing/comparing JSON results.
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.models.task import Task
+from src.utils.db_handler import DBHandler
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATUSES = ("todo", "in-progress", "done")
+
+
+def generate_tasks(count: int) -> Iterator[Task]:
+    """
+    Generate tasks with distinct, increasing creation times and a mix of
+    statuses
+
+    Args:
+        count: Number of tasks
+
+    Yields:
+        Tasks ready for DBHandler.save_tasks
+    """
+    start = datetime(2026, 1, 1)
+    for i in range(count):
+        timestamp = (start + timedelta(seconds=i)).isoformat()
+        yield Task(None, f"Benchmark task {i}", STATUSES[i % 3], timestamp, timestamp)
+
+
+def seed_database(db_path: str, count: int) -> DBHandler:
+    """
+    Create a database at db_path holding count tasks
+
+    Args:
+        db_path: Absolute path of the database file
+        count: Number of tasks to insert
+
+    Returns:
+        Handler connected to the seeded database
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    handler = DBHandler(db_path)
+    handler.save_tasks(generate_tasks(count), batch_size=50000)
+    return handler
+
+
+def time_call(
+    func: Callable[[], Any], repeat: int = 5, setup: Optional[Callable[[], Any]] = None
+) -> Dict[str, float]:
+    """
+    Time a callable several times
+
+    Args:
+        func: Operation to time
+        repeat: Number of timed runs
+        setup: Optional untimed callable run before every run
+
+    Returns:
+        Median, min and max wall time in milliseconds
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples
+
+    Args:
+        samples_ms: Samples in milliseconds
+
+    Returns:
+        Median, min and max in milliseconds
+    """
+    return {
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "min_ms": round(min(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        samples: Samples to rank
+        fraction: Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        The sample at that rank
+    """
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describe where the benchmark ran so results can be compared
+
+    Returns:
+        Python/SQLite versions, platform, git commit and timestamp
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def write_results(results: Dict[str, Any], output: Optional[str]) -> None:
+    """
+    Print results as JSON and optionally save them
+
+    Args:
+        results: Benchmark results
+        output: Optional file to write
+    """
+    payload = json.dumps(results, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(payload + "\n")
+    print(payload)
@@ -1,6 +1,11 @@
-import sys
-from src.container.di_container import DIContainer
-from src.cli.app import TaskCLI
+import time
+
+STARTED = time.perf_counter()
+
+import os  # noqa: E402  (imports are timed by --profile)
+import sys  # noqa: E402
+from src.container.di_container import DIContainer  # noqa: E402
+from src.cli.app import TaskCLI  # noqa: E402
 
 
 def main():
@@ -10,9 +15,28 @@ def main():
     Returns:
         None
     """
-    container = DIContainer()
+    busy_timeout = os.environ.get("TASK_TRACKER_BUSY_TIMEOUT_MS")
+    if busy_timeout and not busy_timeout.isdigit():
+        print("Error: TASK_TRACKER_BUSY_TIMEOUT_MS must be a number of milliseconds")
+        sys.exit(1)
+    container = DIContainer(
+        db_path=os.environ.get("TASK_TRACKER_DB"),
+        group_commit=os.environ.get("TASK_TRACKER_GROUP_COMMIT") == "1",
+        busy_timeout_ms=int(busy_timeout) if busy_timeout else None,
+    )
+    try:
+        container.select_database(project=os.environ.get("TASK_TRACKER_PROJECT"))
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
     cli = TaskCLI(container)
-    cli.run(sys.argv)
+    try:
+        cli.run(sys.argv, started=STARTED)
+    except BrokenPipeError:
+        # Output was piped into a command that exited early (e.g. head)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
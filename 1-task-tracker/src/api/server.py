@@ -0,0 +1,567 @@
+"""
+HTTP JSON API over TaskService
+
+A small standard-library server so other tools can talk to one long-lived
+process instead of spawning a CLI process per operation. Connections use
+HTTP/1.1 keep-alive and are served by a fixed pool of worker threads; a
+worker only holds a connection while a request is being answered.
+
+Endpoints:
+    GET    /tasks?status=&limit=&after=   One page of tasks, newest first
+    POST   /tasks                         Add a task {"description": ...}
+    GET    /tasks/<id>                    One task
+    PATCH  /tasks/<id>                    Update {"description": ...} and/or
+                                          {"status": ...}, optionally only
+                                          while at {"version": ...}
+    DELETE /tasks/<id>                    Delete a task
+    POST   /tasks/status                  Batch status change
+                                          {"ids": [...], "ranges": [[a, b]],
+                                          "status": ...}
+    POST   /tasks/delete                  Batch delete {"ids": [...],
+                                          "ranges": [[a, b]]}; batch
+                                          responses list the IDs not
+                                          found as "missing": [[a, b]]
+    GET    /search?q=&status=&limit=      Full-text search
+    GET    /stats                         Number of tasks per status
+"""
+
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from src.models.task import Task
+from src.services.task_service import TaskNotFoundError, TaskService
+from src.utils.db_handler import MAX_TASK_ID, DatabaseBusyError, TaskConflictError
+
+
+# Page size of GET /tasks when no limit is given
+DEFAULT_PAGE_SIZE = 100
+# Largest limit SQLite can bind (signed 64-bit)
+MAX_QUERY_LIMIT = 2**63 - 1
+# Identity map capacity while the server keeps the process warm, so
+# repeated GET /tasks/<id> of hot tasks are answered from memory
+CACHE_SIZE = 4096
+# Seconds an idle keep-alive connection is kept open, and a started request
+# may take to arrive
+KEEP_ALIVE_TIMEOUT = 15
+
+
+def default_workers() -> int:
+    """
+    Worker pool size for the machine, as ThreadPoolExecutor sizes I/O pools
+
+    Returns:
+        Number of worker threads
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class RequestError(ValueError):
+    """A request that cannot be served, with the HTTP status to answer"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's TaskService"""
+
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    disable_nagle_algorithm = True
+    server: "TaskHTTPServer"
+
+    def __init__(self, request, client_address, server):
+        # Unlike BaseRequestHandler, only set the connection up: the server
+        # calls handle_ready() each time a request arrives and finish() when
+        # the connection is done
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.setup()
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def handle_ready(self) -> bool:
+        """
+        Answer the requests already sent on the connection
+
+        Returns:
+            True if the connection stays open for more requests
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._request_buffered():
+            self.handle_one_request()
+        return not self.close_connection
+
+    def _request_buffered(self) -> bool:
+        """
+        Check without blocking whether another request has already arrived
+
+        A client may send its next request before reading the response, so
+        it can sit in the read buffer where the idle selector cannot see it.
+
+        Returns:
+            True if there is data to read
+        """
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _handle(self, method: str) -> None:
+        """
+        Dispatch a request and write the JSON response
+
+        Args:
+            method: HTTP method
+        """
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            body = self._read_body()
+            status, payload = self._dispatch(method, parts, query, body)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except DatabaseBusyError as e:
+            status, payload = 503, {"error": str(e)}
+        except TaskConflictError as e:
+            status, payload = 409, {"error": str(e), "version": e.current}
+        except TaskNotFoundError as e:
+            status, payload = 404, {"error": str(e)}
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception:
+            self.log_error("Unhandled error serving %s %s", method, self.path)
+            status, payload = 500, {"error": "Internal server error"}
+        self._send_json(status, payload)
+
+    def _dispatch(
+        self, method: str, parts: List[str], query: Dict[str, str], body: Any
+    ) -> Tuple[int, Any]:
+        """
+        Run the service operation for a route
+
+        Args:
+            method: HTTP method
+            parts: Path segments
+            query: Query parameters (last value wins)
+            body: Decoded JSON body, or None
+
+        Returns:
+            (HTTP status, JSON payload)
+        """
+        service = self.server.service
+        route = (method, "/".join(parts))
+
+        if route == ("GET", "tasks"):
+            limit = self._int(query.get("limit"), DEFAULT_PAGE_SIZE, "Limit")
+            tasks = list(
+                service.iter_tasks_by_status(
+                    query.get("status", "all").lower(),
+                    limit,
+                    query.get("after"),
+                    since=query.get("since"),
+                    until=query.get("until"),
+                    updated_since=query.get("updated_since"),
+                )
+            )
+            cursor = service.page_cursor(tasks[-1]) if len(tasks) == limit else None
+            return 200, {"tasks": [task.to_dict() for task in tasks], "next": cursor}
+
+        if route == ("POST", "tasks"):
+            task = service.add_task(self._field(body, "description", str))
+            return 201, self._task_payload(task)
+
+        if len(parts) == 2 and parts[0] == "tasks" and parts[1].isdigit():
+            task_id = int(parts[1])
+            if not 1 <= task_id <= MAX_TASK_ID:
+                # No task can have this ID, and SQLite could not bind it
+                raise TaskNotFoundError(f"Task with id {task_id} not found")
+            return self._dispatch_task(method, task_id, body)
+
+        if route == ("POST", "tasks/status"):
+            task_ids, id_ranges = self._selection(body)
+            count, missing = service.mark_tasks_status(
+                task_ids, id_ranges, self._field(body, "status", str)
+            )
+            return 200, {"count": count, "missing": missing}
+
+        if route == ("POST", "tasks/delete"):
+            count, missing = service.delete_tasks(*self._selection(body))
+            return 200, {"count": count, "missing": missing}
+
+        if route == ("GET", "search"):
+            tasks = service.search_tasks(
+                query.get("q", ""),
+                query.get("status"),
+                self._int(query.get("limit"), 20, "Limit"),
+            )
+            return 200, {"tasks": [task.to_dict() for task in tasks]}
+
+        if route == ("GET", "stats"):
+            return 200, service.counts()
+
+        raise RequestError(404, f"No route for {method} {self.path}")
+
+    def _dispatch_task(self, method: str, task_id: int, body: Any) -> Tuple[int, Any]:
+        """
+        Run an operation on a single task
+
+        Args:
+            method: HTTP method
+            task_id: Task ID from the path
+            body: Decoded JSON body, or None
+
+        Returns:
+            (HTTP status, JSON payload)
+        """
+        service = self.server.service
+        if method == "GET":
+            task = service.get_task(task_id)
+            if task is None:
+                raise TaskNotFoundError(f"Task with id {task_id} not found")
+            return 200, self._task_payload(task)
+
+        if method == "DELETE":
+            service.delete_task(task_id)
+            return 204, None
+
+        if method == "PATCH":
+            if not isinstance(body, dict) or not (
+                "description" in body or "status" in body
+            ):
+                raise RequestError(400, "Body must contain description or status")
+            description = status = version = None
+            if "description" in body:
+                description = self._field(body, "description", str)
+            if "status" in body:
+                status = body["status"]
+                if status not in ("todo", "in-progress", "done"):
+                    raise RequestError(
+                        400, "Invalid status: Use 'todo', 'in-progress' or 'done'"
+                    )
+            if "version" in body:
+                version = self._field(body, "version", int)
+            task = service.patch_task(task_id, description, status, version)
+            return 200, self._task_payload(task)
+
+        raise RequestError(405, f"Method {method} not allowed on a task")
+
+    def _read_body(self) -> Any:
+        """
+        Read and decode the JSON request body
+
+        Returns:
+            Decoded body, or None when the request has none
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The end of the body is unknown, so the connection cannot be reused
+            self.close_connection = True
+            raise RequestError(400, "Invalid Content-Length")
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise RequestError(400, "Invalid JSON body") from None
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        """
+        Write a JSON response, keeping the connection open unless the
+        request cannot be followed by another
+
+        Args:
+            status: HTTP status
+            payload: JSON-serializable payload, or None for an empty body
+        """
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _task_payload(task: Task) -> Dict[str, Any]:
+        """
+        JSON form of a single task, with the version to send back in a
+        later PATCH
+
+        Args:
+            task: Task loaded or changed by the request
+
+        Returns:
+            Task fields and version
+        """
+        payload = task.to_dict()
+        payload["version"] = task.version
+        return payload
+
+    @staticmethod
+    def _field(body: Any, name: str, kind: type) -> Any:
+        """
+        Get a required field of the JSON body
+
+        Args:
+            body: Decoded JSON body
+            name: Field name
+            kind: Expected type
+
+        Returns:
+            Field value
+        """
+        if not isinstance(body, dict) or not isinstance(body.get(name), kind):
+            raise RequestError(400, f"Body must contain '{name}'")
+        return body[name]
+
+    @staticmethod
+    def _int(value: Optional[str], default: int, name: str) -> int:
+        """
+        Parse a positive integer query parameter
+
+        Args:
+            value: Raw parameter value, or None
+            default: Value when the parameter is missing
+            name: Parameter name for error messages
+
+        Returns:
+            Parsed value
+        """
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise RequestError(400, f"{name} must be a number") from None
+        if number < 1:
+            raise RequestError(400, f"{name} must be a positive number")
+        if number > MAX_QUERY_LIMIT:
+            raise RequestError(400, f"{name} must be at most {MAX_QUERY_LIMIT}")
+        return number
+
+    @staticmethod
+    def _selection(body: Any) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """
+        Get the IDs and inclusive ID ranges of a batch request
+
+        IDs must be JSON integers (not booleans or floats) between 1 and
+        MAX_TASK_ID; ranges are [first, last] pairs of such IDs.
+
+        Args:
+            body: Decoded JSON body
+
+        Returns:
+            (individual IDs, (first, last) ranges)
+        """
+        if not isinstance(body, dict):
+            raise RequestError(400, "Body must contain 'ids' or 'ranges'")
+        task_ids = body.get("ids", [])
+        id_ranges = body.get("ranges", [])
+        if not isinstance(task_ids, list) or not isinstance(id_ranges, list):
+            raise RequestError(400, "'ids' and 'ranges' must be lists")
+        if not (task_ids or id_ranges):
+            raise RequestError(400, "Body must contain 'ids' or 'ranges'")
+        if not all(
+            isinstance(id_range, list) and len(id_range) == 2
+            for id_range in id_ranges
+        ):
+            raise RequestError(400, "Ranges must be [first, last] pairs")
+        for task_id in (*task_ids, *(bound for pair in id_ranges for bound in pair)):
+            if isinstance(task_id, bool) or not isinstance(task_id, int):
+                raise RequestError(400, "IDs must be integers")
+            if not 1 <= task_id <= MAX_TASK_ID:
+                raise RequestError(400, f"IDs must be between 1 and {MAX_TASK_ID}")
+        return task_ids, [(first, last) for first, last in id_ranges]
+
+
+class TaskHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP server serving TaskService over a bounded worker pool
+
+    ThreadingHTTPServer starts a thread per connection; this server hands
+    connections to a fixed ThreadPoolExecutor instead, so a burst of clients
+    queues rather than spawning unbounded threads. Each worker thread keeps
+    its own SQLite connection in DBHandler.
+
+    Idle keep-alive connections do not hold a worker: between requests a
+    connection waits in a selector watched by one thread, which hands it to
+    the pool when the next request arrives and closes it after
+    KEEP_ALIVE_TIMEOUT seconds of silence.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: TaskService,
+        workers: Optional[int] = None,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            address: (host, port) to bind; port 0 picks a free port
+            service: Service answering the requests
+            workers: Number of worker threads (default: default_workers())
+            verbose: Log every request to stderr
+        """
+        super().__init__(address, TaskRequestHandler)
+        self.service = service
+        self.verbose = verbose
+        self.workers = workers or default_workers()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="task-http"
+        )
+        self._closing = False
+        self._idle = selectors.DefaultSelector()
+        self._parked: List[TaskRequestHandler] = []
+        self._parked_lock = threading.Lock()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._idle.register(self._wake_reader, selectors.EVENT_READ)
+        self._watcher = threading.Thread(
+            target=self._watch_idle, name="task-http-idle", daemon=True
+        )
+        self._watcher.start()
+
+    @property
+    def url(self) -> str:
+        """Base URL the server is listening on"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address) -> None:
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        # A new connection waits for its first request like an idle one
+        self._park(handler)
+
+    def _serve(self, handler: TaskRequestHandler) -> None:
+        """
+        Answer the requests of a connection on a worker thread, then park it
+
+        Args:
+            handler: Handler of a connection with data to read
+        """
+        try:
+            keep_open = handler.handle_ready()
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+            keep_open = False
+        if keep_open and not self._closing:
+            self._park(handler)
+        else:
+            self._close_connection(handler)
+
+    def _park(self, handler: TaskRequestHandler) -> None:
+        """
+        Queue a connection for the idle selector
+
+        Args:
+            handler: Handler of a connection waiting for a request
+        """
+        with self._parked_lock:
+            self._parked.append(handler)
+        self._wake_writer.send(b"\0")
+
+    def _watch_idle(self) -> None:
+        """Hand idle connections to the pool as soon as a request arrives"""
+        while not self._closing:
+            now = time.monotonic()
+            deadlines = [
+                key.data[1] for key in self._idle.get_map().values() if key.data
+            ]
+            timeout = max(0.0, min(deadlines) - now) if deadlines else None
+            for key, _ in self._idle.select(timeout):
+                if key.data is None:
+                    self._take_parked()
+                    continue
+                self._idle.unregister(key.fileobj)
+                self._pool.submit(self._serve, key.data[0])
+
+            now = time.monotonic()
+            for key in list(self._idle.get_map().values()):
+                if key.data and key.data[1] <= now:
+                    self._idle.unregister(key.fileobj)
+                    self._close_connection(key.data[0])
+
+        for key in list(self._idle.get_map().values()):
+            if key.data:
+                self._close_connection(key.data[0])
+        with self._parked_lock:
+            parked, self._parked = self._parked, []
+        for handler in parked:
+            self._close_connection(handler)
+        self._idle.close()
+        self._wake_reader.close()
+
+    def _take_parked(self) -> None:
+        """Register the connections queued by _park() with the selector"""
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self._parked_lock:
+            parked, self._parked = self._parked, []
+        deadline = time.monotonic() + KEEP_ALIVE_TIMEOUT
+        for handler in parked:
+            self._idle.register(
+                handler.connection, selectors.EVENT_READ, (handler, deadline)
+            )
+
+    def _close_connection(self, handler: TaskRequestHandler) -> None:
+        """
+        Flush and close a connection
+
+        Args:
+            handler: Handler of the connection
+        """
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._closing = True
+        self._wake_writer.send(b"\0")
+        self._watcher.join()
+        self._wake_writer.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
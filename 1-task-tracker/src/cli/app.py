@@ -1,32 +1,40 @@
+import os
 import sys
-from typing import List, Dict
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, TextIO, Tuple
 from src.container.di_container import DIContainer
-from src.cli.validators import ArgumentValidator
 
+if TYPE_CHECKING:
+    from src.cli.commands import BaseCommand
+    from src.utils.profiler import Profiler
 
 class TaskCLI:
     """Main CLI application class with dependency injection"""
 
     def __init__(self, container: DIContainer = None):
         self.container = container or DIContainer()
-        self.commands = self._register_commands()
+        self.commands: Dict[str, "BaseCommand"] = {}
+        self.profiler: Optional["Profiler"] = None
 
-    def _register_commands(self) -> Dict[str, any]:
+    def _get_command(self, name: str) -> Optional["BaseCommand"]:
         """
-        Register all available commands using DI container
+        Get a command, importing and building it on first use
+
+        Only the command being run is constructed, so launching the CLI
+        does not pay for the other commands or, for usage output, for the
+        database stack at all.
+
+        Args:
+            name: Command name
 
         Returns:
-            Dictionary of command names to command instances
-        """
-        return {
-            "add": self.container.create_command("add"),
-            "update": self.container.create_command("update"),
-            "delete": self.container.create_command("delete"),
-            "list": self.container.create_command("list"),
-            "todo": self.container.create_command("todo"),
-            "in-progress": self.container.create_command("in-progress"),
-            "done": self.container.create_command("done"),
-        }
+            Command instance, or None if no such command exists
+        """
+        if name not in self.commands:
+            if name not in self.container.command_names():
+                return None
+            self.commands[name] = self.container.create_command(name)
+        return self.commands[name]
 
     def _show_usage(self) -> None:
         """
@@ -35,21 +43,136 @@ class TaskCLI:
         print("Usage: task-cli <command> [arguments]")
         print("Available commands:")
         print(" add <description>       - Add a new task")
+        print(" import <file>           - Import tasks from a .jsonl or .csv file")
         print(" update <id> <description> - Update a task")
-        print(" delete <id>             - Delete a task")
+        print(" delete <id>...          - Delete tasks (IDs or ranges like 10-20)")
         print(" list [status]           - List all tasks")
         print(" list all                - List all tasks")
         print(" list todo               - List tasks with todo status")
         print(" list in-progress        - List tasks with in-progress status")
         print(" list done               - List tasks with done status")
-        print(" todo <id>               - Mark a task as todo")
-        print(" in-progress <id>        - Mark a task as in progress")
-        print(" done <id>               - Mark a task as done")
+        print(" list [status] --limit N [--after CURSOR] - List one page of tasks")
+        print(" list [status] --format jsonl|csv|tsv|table - List tasks for other tools")
+        print(
+            " list [status] --since T [--until T] [--updated-since T]"
+            " - Filter by date (ISO date, today, yesterday or 2h/7d ago)"
+        )
+        print(" search <words> [--status S] [--limit N] - Search descriptions (word* = prefix)")
+        print(" list [status] --include-archived - Also list archived tasks")
+        print(" list [status] --all-projects - List the tasks of every project")
+        print(" stats [--check] [--repair] - Show the number of tasks per status")
+        print(
+            " archive --older-than 30d [--batch-size N] [--compact]"
+            " - Move old done tasks to the archive"
+        )
+        print(" serve [--host H] [--port P] [--workers N] - Serve an HTTP JSON API")
+        print(" todo <id>...            - Mark tasks as todo")
+        print(" in-progress <id>...     - Mark tasks as in progress")
+        print(" done <id>...            - Mark tasks as done")
+        print(" shell [--stdin]         - Run commands in one session (one per line)")
+        print(
+            " --profile[=cprofile|tracemalloc|all] <command> - Print where the time went"
+        )
+        print(" --project NAME <command> - Use the database of a project")
+        print(" --db PATH <command>     - Use another database file")
 
-    def run(self, args: List[str]) -> None:
+    def run(self, args: List[str], started: Optional[float] = None) -> None:
         """
         Run the CLI application
 
+        Leading global options come before the command: --project NAME or
+        --db PATH choose the database, and --profile[=mode] (or
+        TASK_TRACKER_PROFILE=1 or a mode name in the environment) prints a
+        timing breakdown of the run to stderr.
+
+        Args:
+            args: List of command line arguments
+            started: perf_counter() value taken before the program's imports,
+                so a profile can report import time
+        """
+        parsed = self._global_options(args)
+        if parsed is None:
+            return
+        args, options = parsed
+        if "project" in options or "db" in options:
+            try:
+                self.container.select_database(
+                    options.get("db"), options.get("project")
+                )
+            except ValueError as e:
+                print(f"Error: {str(e)}")
+                return
+
+        mode = options.get("profile")
+        if mode is None:
+            mode = os.environ.get("TASK_TRACKER_PROFILE", "")
+            if mode in ("0", ""):
+                self._dispatch(args)
+                return
+            if mode == "1":
+                mode = "timing"
+
+        from src.utils.profiler import Profiler, profile_session
+
+        try:
+            self.profiler = Profiler(mode, started)
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return
+        self.container.set_profiler(self.profiler)
+        with profile_session(self.profiler):
+            self._dispatch(args)
+
+    @staticmethod
+    def _global_options(
+        args: List[str],
+    ) -> Optional[Tuple[List[str], Dict[str, str]]]:
+        """
+        Strip the global options that precede the command
+
+        Args:
+            args: List of command line arguments
+
+        Returns:
+            The remaining arguments and the options by name (profile,
+            project, db), or None if an option is missing its value
+        """
+        options: Dict[str, str] = {}
+        index = 1
+        while index < len(args):
+            name, has_value, value = args[index].partition("=")
+            if name == "--profile":
+                options["profile"] = value or "timing"
+            elif name in ("--project", "--db"):
+                if not has_value:
+                    index += 1
+                    if index == len(args):
+                        print(f"Error: Option {name} requires a value")
+                        return None
+                    value = args[index]
+                # A --db path is relative to the working directory
+                options[name[2:]] = os.path.abspath(value) if name == "--db" else value
+            else:
+                break
+            index += 1
+        return [args[0], *args[index:]], options
+
+    def _phase(self, name: str) -> Any:
+        """
+        Time a block as a profile phase when profiling
+
+        Args:
+            name: Phase name
+
+        Returns:
+            Context manager
+        """
+        return self.profiler.phase(name) if self.profiler else nullcontext()
+
+    def _dispatch(self, args: List[str]) -> None:
+        """
+        Run one command line
+
         Args:
             args: List of command line arguments
         """
@@ -59,8 +182,90 @@ class TaskCLI:
 
         command = args[1]
 
-        if command in self.commands:
-            self.commands[command].execute(args)
+        if command == "--stdin" or (command == "shell" and "--stdin" in args[2:]):
+            self.run_shell(sys.stdin, interactive=False)
+        elif command == "shell":
+            self.run_shell(sys.stdin, interactive=sys.stdin.isatty())
         else:
-            print(f"Unknown command: {command}")
-            self._show_usage()
+            with self._phase("container"):
+                found = self._get_command(command)
+            if found is None:
+                print(f"Unknown command: {command}")
+                self._show_usage()
+                return
+            with self._phase("formatting"):
+                found.execute(args)
+
+    def run_shell(self, stream: TextIO, interactive: bool = True) -> None:
+        """
+        Run commands read line by line from a stream in this process
+
+        The container, service and database connection stay warm for the
+        whole session, so each line costs only the command itself. Lines
+        use shell quoting and omit the program name, e.g. add "Buy milk".
+        Blank lines and lines starting with # are ignored; exit or quit
+        ends the session.
+
+        Args:
+            stream: Input to read commands from
+            interactive: Show a prompt and read with input() when True
+        """
+        import shlex
+
+        if interactive:
+            try:
+                import readline  # noqa: F401  (line editing and history)
+            except ImportError:
+                pass
+            print("Task Tracker shell. Type 'help' for commands, 'exit' to quit.")
+
+        while True:
+            line = self._read_line(stream, interactive)
+            if line is None:
+                break
+
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line in ("exit", "quit"):
+                break
+            if line == "help":
+                self._show_usage()
+                continue
+
+            try:
+                tokens = shlex.split(line)
+            except ValueError as e:
+                print(f"Error: {str(e)}")
+                continue
+
+            if tokens[0] in ("shell", "--stdin"):
+                print("Error: Already in a shell session")
+                continue
+            self._dispatch(["task-cli", *tokens])
+
+        sys.stdout.flush()
+
+    @staticmethod
+    def _read_line(stream: TextIO, interactive: bool) -> Optional[str]:
+        """
+        Read the next shell line
+
+        Args:
+            stream: Input to read from when not interactive
+            interactive: Prompt with input() when True
+
+        Returns:
+            The line, or None at end of input
+        """
+        if interactive:
+            try:
+                return input("task-cli> ")
+            except EOFError:
+                print()
+                return None
+            except KeyboardInterrupt:
+                print()
+                return ""
+        line = stream.readline()
+        return line if line else None
@@ -1,14 +1,19 @@
+import sys
 from abc import ABC, abstractmethod
-from typing import List
-from src.services.task_service import TaskService
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 from src.cli.validators import ArgumentValidator
-from src.cli.formatters import TaskFormatter
+from src.cli.formatters import MACHINE_FORMATS, TaskFormatter
+
+if TYPE_CHECKING:
+    from src.api.server import TaskHTTPServer
+    from src.services.cross_project_service import CrossProjectService
+    from src.services.task_service import TaskService
 
 
 class BaseCommand(ABC):
     """Base class for all CLI commands"""
 
-    def __init__(self, service: TaskService, formatter: TaskFormatter):
+    def __init__(self, service: "TaskService", formatter: TaskFormatter):
         self.service = service
         self.formatter = formatter
 
@@ -38,6 +43,30 @@ class AddCommand(BaseCommand):
             print(f"Error: {str(e)}")
 
 
+class ImportCommand(BaseCommand):
+    """Command to bulk import tasks from a JSON Lines or CSV file"""
+
+    def execute(self, args: List[str]) -> None:
+        """
+        Execute the import command.
+
+        Args:
+            args: List of command line arguments
+        """
+        file_path = ArgumentValidator.validate_file_path(args)
+        if file_path is None:
+            return
+
+        # Imported here so other commands do not pay for csv/json at startup
+        from src.utils.task_importer import iter_task_records
+
+        try:
+            count = self.service.add_tasks(iter_task_records(file_path))
+            print(self.formatter.format_bulk_message("import", count))
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+
+
 class UpdateCommand(BaseCommand):
     """Command to update a task description"""
 
@@ -53,7 +82,7 @@ class UpdateCommand(BaseCommand):
             return
 
         task_id = ArgumentValidator.validate_task_id(args)
-        new_description = ArgumentValidator.validate_description(args[2:])
+        new_description = ArgumentValidator.validate_description(args[1:])
         if task_id is None or new_description is None:
             return
 
@@ -65,7 +94,7 @@ class UpdateCommand(BaseCommand):
 
 
 class DeleteCommand(BaseCommand):
-    """Command to delete a task"""
+    """Command to delete one or more tasks"""
 
     def execute(self, args: List[str]) -> None:
         """
@@ -74,13 +103,21 @@ class DeleteCommand(BaseCommand):
         Args:
             args: List of command line arguments
         """
-        task_id = ArgumentValidator.validate_task_id(args)
-        if task_id is None:
+        selection = ArgumentValidator.validate_task_ids(args)
+        if selection is None:
             return
+        task_ids, id_ranges = selection
 
         try:
-            self.service.delete_task(task_id)
-            print(self.formatter.format_success_message("delete", task_id))
+            if len(task_ids) == 1 and not id_ranges:
+                self.service.delete_task(task_ids[0])
+                print(self.formatter.format_success_message("delete", task_ids[0]))
+                return
+
+            count, missing = self.service.delete_tasks(task_ids, id_ranges)
+            print(self.formatter.format_bulk_message("delete", count))
+            if missing:
+                print(self.formatter.format_missing_ids(missing))
         except ValueError as e:
             print(f"Error: {str(e)}")
 
@@ -88,6 +125,18 @@ class DeleteCommand(BaseCommand):
 class ListCommand(BaseCommand):
     """Command to list tasks"""
 
+    # Ask the container for a factory of the cross-project service
+    uses_all_projects = True
+
+    def __init__(
+        self,
+        service: "TaskService",
+        formatter: TaskFormatter,
+        all_projects: Optional[Callable[[], "CrossProjectService"]] = None,
+    ):
+        super().__init__(service, formatter)
+        self.all_projects = all_projects
+
     def execute(self, args: List[str]) -> None:
         """
         Execute the list command.
@@ -95,77 +144,281 @@ class ListCommand(BaseCommand):
         Args:
             args: List of command line arguments
         """
-        status_filter = ArgumentValidator.validate_list_args(args)
+        options = ArgumentValidator.validate_list_options(args)
+        if options is None:
+            return
+
+        if options["all_projects"] or options["format"] != "text":
+            self._write_rows(options)
+            return
 
         try:
-            if status_filter:
-                tasks = self.service.list_tasks_by_status(status_filter)
-            else:
-                tasks = self.service.list_all_tasks()
+            tasks = self.service.iter_tasks_by_status(
+                options["status"],
+                options["limit"],
+                options["after"],
+                since=options["since"],
+                until=options["until"],
+                updated_since=options["updated_since"],
+                include_archived=options["include_archived"],
+            )
+            last_task = None
+
+            def track_last(tasks):
+                nonlocal last_task
+                for last_task in tasks:
+                    yield last_task
+
+            count = self.formatter.write_task_list(track_last(tasks))
+            if options["limit"] is not None and count == options["limit"]:
+                cursor = self.service.page_cursor(last_task)
+                print(self.formatter.format_next_cursor(cursor))
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+
+    def _write_rows(self, options: Dict[str, Any]) -> None:
+        """
+        List tasks in a jsonl, csv, tsv or table format straight from rows.
+
+        With --all-projects the rows come from every project database,
+        merged newest first and labelled with their project, in any format.
+        For the machine-readable formats the next-page hint and errors go to
+        stderr so stdout stays parseable.
+
+        Args:
+            options: Validated list options
+        """
+        messages = sys.stderr if options["format"] in MACHINE_FORMATS else sys.stdout
+        with_project = options["all_projects"]
+        try:
+            if with_project and self.all_projects is None:
+                raise ValueError("Listing all projects is not available here")
+            source = self.all_projects() if with_project else self.service
+            rows = source.iter_task_rows(
+                options["status"],
+                options["limit"],
+                options["after"],
+                since=options["since"],
+                until=options["until"],
+                updated_since=options["updated_since"],
+                include_archived=options["include_archived"],
+            )
+            last_row = None
+
+            def track_last(rows):
+                nonlocal last_row
+                for last_row in rows:
+                    yield last_row
+
+            count = self.formatter.write_rows(
+                track_last(rows), options["format"], with_project=with_project
+            )
+            if options["limit"] is not None and count == options["limit"]:
+                cursor = self.service.row_cursor(last_row)
+                print(self.formatter.format_next_cursor(cursor), file=messages)
+        except ValueError as e:
+            print(f"Error: {str(e)}", file=messages)
+
 
-            print(self.formatter.format_task_list(tasks))
+class SearchCommand(BaseCommand):
+    """Command to search task descriptions"""
+
+    def execute(self, args: List[str]) -> None:
+        """
+        Execute the search command.
+
+        Args:
+            args: List of command line arguments
+        """
+        options = ArgumentValidator.validate_search_options(args)
+        if options is None:
+            return
+
+        try:
+            tasks = self.service.search_tasks(
+                options["query"], options["status"], options["limit"]
+            )
+            self.formatter.write_task_list(tasks)
         except ValueError as e:
             print(f"Error: {str(e)}")
 
 
-class TodoCommand(BaseCommand):
-    """Command to mark a task as todo"""
+class StatsCommand(BaseCommand):
+    """Command to show the number of tasks per status"""
 
     def execute(self, args: List[str]) -> None:
         """
-        Execute the todo command.
+        Execute the stats command.
 
         Args:
             args: List of command line arguments
         """
-        task_id = ArgumentValidator.validate_task_id(args)
-        if task_id is None:
+        options = ArgumentValidator.validate_stats_options(args)
+        if options is None:
             return
 
         try:
-            self.service.mark_task_todo(task_id)
-            print(self.formatter.format_success_message("todo", task_id))
+            if options["repair"]:
+                self.service.repair_counts()
+            print(
+                self.formatter.format_stats(
+                    self.service.counts(), self.service.count_archived()
+                )
+            )
+            if options["check"]:
+                mismatches = self.service.verify_counts()
+                print(self.formatter.format_count_mismatches(mismatches))
         except ValueError as e:
             print(f"Error: {str(e)}")
 
 
-class InProgressCommand(BaseCommand):
-    """Command to mark a task as in progress"""
+class ArchiveCommand(BaseCommand):
+    """Command to move old done tasks out of the hot table"""
 
     def execute(self, args: List[str]) -> None:
         """
-        Execute the in progress command.
+        Execute the archive command.
 
         Args:
             args: List of command line arguments
         """
-        task_id = ArgumentValidator.validate_task_id(args)
-        if task_id is None:
+        options = ArgumentValidator.validate_archive_options(args)
+        if options is None:
             return
 
         try:
-            self.service.mark_task_in_progress(task_id)
-            print(self.formatter.format_success_message("in progress", task_id))
+            count = self.service.archive_tasks(
+                options["older_than"], options["batch_size"], options["compact"]
+            )
+            print(self.formatter.format_bulk_message("archive", count))
         except ValueError as e:
             print(f"Error: {str(e)}")
 
 
-class DoneCommand(BaseCommand):
-    """Command to mark a task as done"""
+class ServeCommand(BaseCommand):
+    """Command to serve the tasks over a local HTTP JSON API"""
+
+    # Ask the container for its server factory, which also sets up caching
+    uses_http_server = True
+
+    def __init__(
+        self,
+        service: "TaskService",
+        formatter: TaskFormatter,
+        http_server: Optional[Callable[..., "TaskHTTPServer"]] = None,
+    ):
+        super().__init__(service, formatter)
+        self.http_server = http_server
 
     def execute(self, args: List[str]) -> None:
         """
-        Execute the done command.
+        Execute the serve command. Blocks until interrupted.
 
         Args:
             args: List of command line arguments
         """
-        task_id = ArgumentValidator.validate_task_id(args)
-        if task_id is None:
+        options = ArgumentValidator.validate_serve_options(args)
+        if options is None:
             return
 
+        http_server = self.http_server or self._http_server
         try:
-            self.service.mark_task_done(task_id)
-            print(self.formatter.format_success_message("done", task_id))
+            server = http_server(
+                options["host"],
+                options["port"],
+                workers=options["workers"],
+                verbose=options["verbose"],
+            )
+        except OSError as e:
+            print(f"Error: Cannot listen on {options['host']}:{options['port']}: {e}")
+            return
+
+        print(f"Serving on {server.url} with {server.workers} workers", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def _http_server(self, host: str, port: int, **options: Any) -> "TaskHTTPServer":
+        """
+        Build a server for this command's service, without a container
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on
+            **options: workers and verbose
+
+        Returns:
+            Server ready for serve_forever()
+        """
+        # Imported here so other commands do not pay for http.server at startup
+        from src.api.server import TaskHTTPServer
+
+        return TaskHTTPServer((host, port), self.service, **options)
+
+
+class StatusCommand(BaseCommand):
+    """Base class for commands that change the status of tasks"""
+
+    status: str
+
+    def execute(self, args: List[str]) -> None:
+        """
+        Execute the status change for one task, or for a batch of IDs and
+        ranges in a single transaction.
+
+        Args:
+            args: List of command line arguments
+        """
+        selection = ArgumentValidator.validate_task_ids(args)
+        if selection is None:
+            return
+        task_ids, id_ranges = selection
+
+        try:
+            if len(task_ids) == 1 and not id_ranges:
+                self._mark_one(task_ids[0])
+                print(self.formatter.format_success_message(self.status, task_ids[0]))
+                return
+
+            count, missing = self.service.mark_tasks_status(
+                task_ids, id_ranges, self.status
+            )
+            print(self.formatter.format_bulk_message(self.status, count))
+            if missing:
+                print(self.formatter.format_missing_ids(missing))
         except ValueError as e:
             print(f"Error: {str(e)}")
+
+    @abstractmethod
+    def _mark_one(self, task_id: int) -> None:
+        pass
+
+
+class TodoCommand(StatusCommand):
+    """Command to mark tasks as todo"""
+
+    status = "todo"
+
+    def _mark_one(self, task_id: int) -> None:
+        self.service.mark_task_todo(task_id)
+
+
+class InProgressCommand(StatusCommand):
+    """Command to mark tasks as in progress"""
+
+    status = "in-progress"
+
+    def _mark_one(self, task_id: int) -> None:
+        self.service.mark_task_in_progress(task_id)
+
+
+class DoneCommand(StatusCommand):
+    """Command to mark tasks as done"""
+
+    status = "done"
+
+    def _mark_one(self, task_id: int) -> None:
+        self.service.mark_task_done(task_id)
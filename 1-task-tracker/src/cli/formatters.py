@@ -1,7 +1,14 @@
-from typing import List
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
 from src.models.task import Task
 
 
+# Output formats of the list command; "text" is the labelled default
+LIST_FORMATS = ("text", "jsonl", "csv", "tsv", "table")
+# Formats meant for other programs: extra messages go to stderr
+MACHINE_FORMATS = ("jsonl", "csv", "tsv")
+
+
 class TaskFormatter:
     @staticmethod
     def format_task_list(tasks: List[Task]) -> str:
@@ -28,6 +35,224 @@ class TaskFormatter:
 
         return "\n".join(output)
 
+    @staticmethod
+    def write_task_list(
+        tasks: Iterable[Task], stream: Optional[TextIO] = None, chunk_size: int = 500
+    ) -> int:
+        """
+        Stream a list of tasks to an output stream in chunks.
+
+        Produces the same text as printing format_task_list, but only
+        chunk_size tasks are held in memory at a time and the first chunk
+        is written as soon as it is ready.
+
+        Args:
+            tasks: An iterable of Task objects
+            stream: Output stream, stdout by default
+            chunk_size: Number of tasks formatted per write
+
+        Returns:
+            The number of tasks written
+        """
+        stream = stream or sys.stdout
+        count = 0
+        buffer = []
+        for task in tasks:
+            buffer.append(
+                f"ID: {task.id}\n"
+                f"Description: {task.description}\n"
+                f"Status: {task.status}\n"
+                f"Created at: {task.created_at}\n"
+                f"Updated at: {task.updated_at}\n\n"
+            )
+            count += 1
+            if len(buffer) >= chunk_size:
+                stream.write("".join(buffer))
+                buffer.clear()
+
+        if buffer:
+            stream.write("".join(buffer))
+        elif count == 0:
+            stream.write("No tasks found\n")
+        stream.flush()
+        return count
+
+    @staticmethod
+    def write_rows(
+        rows: Iterable[Tuple[Any, ...]],
+        output_format: str,
+        stream: Optional[TextIO] = None,
+        chunk_size: int = 1000,
+        with_project: bool = False,
+    ) -> int:
+        """
+        Stream raw task rows in a machine-readable or tabular format.
+
+        Rows are serialised straight into strings, without building Task
+        objects or going through the csv/json modules per row, and written
+        chunk_size at a time:
+
+        - jsonl: one JSON object per line
+        - csv: RFC 4180 with a header row; descriptions are always quoted
+        - tsv: header row, then tab-separated fields; tabs, newlines and
+          backslashes in descriptions are escaped as \\t, \\n and \\\\
+        - table: aligned columns for reading in a terminal
+        - text: the labelled layout of write_task_list
+
+        Args:
+            rows: (id, description, status, created_at, updated_at) tuples
+                with timestamps in microseconds since the epoch, written as
+                ISO 8601
+            output_format: One of jsonl, csv, tsv, table or text
+            stream: Output stream, stdout by default
+            chunk_size: Number of rows serialised per write
+            with_project: Rows carry a sixth project name field, written as
+                a project key, column or label
+
+        Returns:
+            The number of rows written
+        """
+        from src.utils.timestamps import from_epoch_us as iso
+
+        stream = stream or sys.stdout
+        header = ""
+        if output_format == "jsonl":
+            from json.encoder import encode_basestring_ascii as quote
+
+            def line(row):
+                return (
+                    f'{{"id": {row[0]}, "description": {quote(row[1])}, '
+                    f'"status": "{row[2]}", "created_at": "{iso(row[3])}", '
+                    f'"updated_at": "{iso(row[4])}"}}\n'
+                )
+
+        elif output_format == "csv":
+            header = "id,description,status,created_at,updated_at\r\n"
+
+            def line(row):
+                description = row[1].replace('"', '""')
+                return (
+                    f'{row[0]},"{description}",{row[2]},'
+                    f"{iso(row[3])},{iso(row[4])}\r\n"
+                )
+
+        elif output_format == "tsv":
+            header = "id\tdescription\tstatus\tcreated_at\tupdated_at\n"
+
+            def line(row):
+                description = row[1]
+                if not description.isprintable() or "\\" in description:
+                    description = (
+                        description.replace("\\", "\\\\")
+                        .replace("\t", "\\t")
+                        .replace("\n", "\\n")
+                        .replace("\r", "\\r")
+                    )
+                return (
+                    f"{row[0]}\t{description}\t{row[2]}\t"
+                    f"{iso(row[3])}\t{iso(row[4])}\n"
+                )
+
+        elif output_format == "table":
+            header = (
+                f"{'ID':>8}  {'Status':<11}  {'Created at':<26}  Description\n"
+                f"{'-' * 8}  {'-' * 11}  {'-' * 26}  {'-' * 11}\n"
+            )
+
+            def line(row):
+                description = row[1].replace("\n", " ")
+                return f"{row[0]:>8}  {row[2]:<11}  {iso(row[3]):<26}  {description}\n"
+
+        elif output_format == "text":
+
+            def line(row):
+                return (
+                    f"ID: {row[0]}\nDescription: {row[1]}\nStatus: {row[2]}\n"
+                    f"Created at: {iso(row[3])}\nUpdated at: {iso(row[4])}\n\n"
+                )
+
+        else:
+            raise ValueError(f"Unsupported format: {output_format}")
+
+        if with_project:
+            header, line = TaskFormatter._project_column(output_format, header, line)
+        stream.write(header)
+        count = 0
+        for chunk in TaskFormatter._chunks(rows, chunk_size):
+            stream.write("".join(map(line, chunk)))
+            count += len(chunk)
+        if count == 0 and output_format == "text":
+            stream.write("No tasks found\n")
+        stream.flush()
+        return count
+
+    @staticmethod
+    def _project_column(
+        output_format: str, header: str, line: Callable[[Tuple[Any, ...]], str]
+    ) -> Tuple[str, Callable[[Tuple[Any, ...]], str]]:
+        """
+        Put the project name (the sixth row field) in front of each row.
+
+        Project names are limited to letters, digits, '-' and '_', so they
+        need no quoting or escaping in any format.
+
+        Args:
+            output_format: One of jsonl, csv, tsv, table or text
+            header: Header written before the rows
+            line: Serialiser of one row
+
+        Returns:
+            The header and row serialiser with the project added
+        """
+        if output_format == "jsonl":
+            return header, lambda row: f'{{"project": "{row[5]}", {line(row)[1:]}'
+        if output_format == "text":
+            return header, lambda row: f"Project: {row[5]}\n{line(row)}"
+        if output_format == "table":
+            titles = (f"{'Project':<12}  ", f"{'-' * 12}  ")
+            lines = header.splitlines(keepends=True)
+            header = "".join(title + part for title, part in zip(titles, lines))
+            return header, lambda row: f"{row[5]:<12}  {line(row)}"
+        separator = "," if output_format == "csv" else "\t"
+        return (
+            f"project{separator}{header}",
+            lambda row: f"{row[5]}{separator}{line(row)}",
+        )
+
+    @staticmethod
+    def _chunks(rows: Iterable[Any], size: int) -> Iterable[List[Any]]:
+        """
+        Split an iterable into lists of at most size items.
+
+        Args:
+            rows: Items to split
+            size: Maximum items per list
+
+        Yields:
+            Consecutive lists of items
+        """
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def format_next_cursor(cursor: str) -> str:
+        """
+        Format the hint that points to the next page of a listing.
+
+        Args:
+            cursor: Cursor of the last task shown
+
+        Returns:
+            A line telling the user how to fetch the next page
+        """
+        return f"Next page: --after {cursor}"
+
     @staticmethod
     def format_success_message(action: str, task_id: int) -> str:
         """
@@ -49,3 +274,88 @@ class TaskFormatter:
             "done": f"Task ID:{task_id} marked as done",
         }
         return message.get(action, f"Task ID:{task_id} {action} successfully")
+
+    @staticmethod
+    def format_bulk_message(action: str, count: int) -> str:
+        """
+        Format a success message for an operation on many tasks.
+
+        Args:
+            action: The action performed (import)
+            count: The number of tasks affected
+
+        Returns:
+            A formatted success message string
+        """
+        noun = "task" if count == 1 else "tasks"
+        message = {
+            "import": f"{count} {noun} imported successfully",
+            "delete": f"{count} {noun} deleted successfully",
+            "archive": f"{count} {noun} archived",
+            "todo": f"{count} {noun} marked as todo",
+            "in-progress": f"{count} {noun} marked as in progress",
+            "done": f"{count} {noun} marked as done",
+        }
+        return message.get(action, f"{count} {noun} {action} successfully")
+
+    @staticmethod
+    def format_missing_ids(id_ranges: List[Tuple[int, int]]) -> str:
+        """
+        Format the IDs of a batch operation that matched no task.
+
+        Single IDs are shown on their own, longer runs as first-last.
+
+        Args:
+            id_ranges: Sorted, inclusive (first, last) ranges not found
+
+        Returns:
+            A formatted error message string
+        """
+        parts = [
+            str(first) if first == last else f"{first}-{last}"
+            for first, last in id_ranges
+        ]
+        single = len(id_ranges) == 1 and id_ranges[0][0] == id_ranges[0][1]
+        noun = "Task" if single else "Tasks"
+        return f"Error: {noun} not found: {', '.join(parts)}"
+
+    @staticmethod
+    def format_stats(counts: Dict[str, int], archived: Optional[int] = None) -> str:
+        """
+        Format the number of tasks per status.
+
+        Args:
+            counts: Counts by status plus the total
+            archived: Number of archived tasks, shown when given
+
+        Returns:
+            A formatted summary string
+        """
+        message = (
+            f"Todo: {counts['todo']}\n"
+            f"In progress: {counts['in-progress']}\n"
+            f"Done: {counts['done']}\n"
+            f"Total: {counts['total']}"
+        )
+        if archived is not None:
+            message += f"\nArchived: {archived}"
+        return message
+
+    @staticmethod
+    def format_count_mismatches(mismatches: Dict[str, Tuple[int, int]]) -> str:
+        """
+        Format the result of checking the counters against the tasks table.
+
+        Args:
+            mismatches: (counter value, actual count) by status
+
+        Returns:
+            A formatted check result string
+        """
+        if not mismatches:
+            return "Counters are consistent"
+        lines = [
+            f"Error: {status} counter is {stored}, actual count is {actual}"
+            for status, (stored, actual) in mismatches.items()
+        ]
+        return "\n".join(lines)
@@ -1,4 +1,8 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Largest task ID SQLite can store; kept here so validation does not import
+# the database layer (same as db_handler.MAX_TASK_ID)
+MAX_TASK_ID = 2**63 - 1
 
 
 class ArgumentValidator:
@@ -17,10 +21,67 @@ class ArgumentValidator:
             print("Error: Task ID is required")
             return None
         try:
-            return int(args[2])
+            task_id = int(args[2])
         except ValueError:
             print("Error: Task ID must be a number")
             return None
+        if task_id < 1:
+            print("Error: Task ID must be a positive number")
+            return None
+        if task_id > MAX_TASK_ID:
+            print(f"Error: Task ID must be at most {MAX_TASK_ID}")
+            return None
+        return task_id
+
+    @staticmethod
+    def validate_task_ids(
+        args: List[str],
+    ) -> Optional[Tuple[List[int], List[Tuple[int, int]]]]:
+        """
+        Validate a selection of task IDs and inclusive ID ranges.
+
+        Accepts arguments such as "1 2 3 10-500", optionally after a "--"
+        end-of-options marker. IDs below 1 or above SQLite's 64-bit limit
+        are rejected.
+
+        Args:
+            args: The command line arguments
+
+        Returns:
+            (individual IDs, (first, last) ranges), or None if validation fails
+        """
+        selection = args[3:] if args[2:3] == ["--"] else args[2:]
+        if not selection:
+            print("Error: Task ID is required")
+            return None
+
+        task_ids: List[int] = []
+        id_ranges: List[Tuple[int, int]] = []
+        for arg in selection:
+            try:
+                # Tried before splitting so "-5" is a negative ID, not a range
+                task_ids.append(int(arg))
+                continue
+            except ValueError:
+                pass
+            first, _, last = arg.partition("-")
+            try:
+                id_range = (int(first), int(last))
+            except ValueError:
+                print("Error: Task ID must be a number")
+                return None
+            if id_range[0] > id_range[1]:
+                print(f"Error: Invalid ID range: {arg}")
+                return None
+            id_ranges.append(id_range)
+
+        if min([*task_ids, *(first for first, _ in id_ranges)]) < 1:
+            print("Error: Task ID must be a positive number")
+            return None
+        if max([*task_ids, *(last for _, last in id_ranges)]) > MAX_TASK_ID:
+            print(f"Error: Task ID must be at most {MAX_TASK_ID}")
+            return None
+        return task_ids, id_ranges
 
     @staticmethod
     def validate_description(args: List[str]) -> Optional[str]:
@@ -45,16 +106,257 @@ class ArgumentValidator:
         return description.strip()
 
     @staticmethod
-    def validate_list_args(args: List[str]) -> Optional[str]:
+    def validate_file_path(args: List[str]) -> Optional[str]:
+        """
+        Validate that a file path is provided.
+
+        Args:
+            args: The command line arguments
+
+        Returns:
+            The file path, or None if validation fails
+        """
+        if len(args) < 3 or not args[2].strip():
+            print("Error: File path is required")
+            return None
+        return args[2]
+
+    @staticmethod
+    def split_options(
+        args: List[str], value_options: Iterable[str], flag_options: Iterable[str] = ()
+    ) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+        """
+        Separate --options from positional arguments.
+
+        Value options accept both "--name value" and "--name=value"; flag
+        options take no value and are stored as True.
+
+        Args:
+            args: The command arguments after the command name
+            value_options: Names of options that take a value (without --)
+            flag_options: Names of options that take no value (without --)
+
+        Returns:
+            (positional arguments, options by name), or None if validation fails
+        """
+        value_options = set(value_options)
+        flag_options = set(flag_options)
+        positional: List[str] = []
+        options: Dict[str, Any] = {}
+        index = 0
+        while index < len(args):
+            arg = args[index]
+            index += 1
+            if not arg.startswith("--"):
+                positional.append(arg)
+                continue
+
+            name, has_value, value = arg[2:].partition("=")
+            if name in flag_options and not has_value:
+                options[name] = True
+            elif name in value_options:
+                if not has_value:
+                    if index >= len(args):
+                        print(f"Error: Option --{name} requires a value")
+                        return None
+                    value = args[index]
+                    index += 1
+                options[name] = value
+            else:
+                print(f"Error: Unknown option: --{name}")
+                return None
+        return positional, options
+
+    @staticmethod
+    def validate_list_options(args: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Validate the status filter and paging options of the list command.
+
+        Args:
+            args: The command line arguments
+
+        Returns:
+            Dictionary with status, limit, after, format, the since, until
+            and updated_since date filters, include_archived and
+            all_projects, or None if validation fails
+        """
+        parsed = ArgumentValidator.split_options(
+            args[2:],
+            ["limit", "after", "format", "since", "until", "updated-since"],
+            ["include-archived", "all-projects"],
+        )
+        if parsed is None:
+            return None
+        positional, options = parsed
+
+        limit = options.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                print("Error: Limit must be a number")
+                return None
+
+        output_format = options.get("format", "text").lower()
+        if output_format not in ("text", "jsonl", "csv", "tsv", "table"):
+            print("Error: Invalid format: Use 'text', 'jsonl', 'csv', 'tsv' or 'table'")
+            return None
+
+        return {
+            "status": positional[0].lower() if positional else "all",
+            "limit": limit,
+            "after": options.get("after"),
+            "format": output_format,
+            "since": options.get("since"),
+            "until": options.get("until"),
+            "updated_since": options.get("updated-since"),
+            "include_archived": options.get("include-archived", False),
+            "all_projects": options.get("all-projects", False),
+        }
+
+    @staticmethod
+    def validate_search_options(args: List[str]) -> Optional[Dict[str, Any]]:
         """
-        Validate that a list argument is provided and is valid.
+        Validate the query, status filter and limit of the search command.
 
         Args:
             args: The command line arguments
 
         Returns:
-            The list argument as a string, or None if validation fails
+            Dictionary with query, status and limit, or None if validation fails
         """
-        if len(args) >= 3:
-            return args[2].lower()
-        return None
+        parsed = ArgumentValidator.split_options(args[2:], ["status", "limit"])
+        if parsed is None:
+            return None
+        positional, options = parsed
+
+        query = " ".join(positional).strip()
+        if not query:
+            print("Error: Search query is required")
+            return None
+
+        limit = options.get("limit", "20")
+        try:
+            limit = int(limit)
+        except ValueError:
+            print("Error: Limit must be a number")
+            return None
+
+        status = options.get("status")
+        return {
+            "query": query,
+            "status": status.lower() if status else None,
+            "limit": limit,
+        }
+
+    @staticmethod
+    def validate_stats_options(args: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Validate the options of the stats command.
+
+        Args:
+            args: The command line arguments
+
+        Returns:
+            Dictionary with check and repair flags, or None if validation fails
+        """
+        parsed = ArgumentValidator.split_options(args[2:], [], ["check", "repair"])
+        if parsed is None:
+            return None
+        positional, options = parsed
+        if positional:
+            print(f"Error: Unexpected argument: {positional[0]}")
+            return None
+        return {
+            "check": options.get("check", False),
+            "repair": options.get("repair", False),
+        }
+
+    @staticmethod
+    def validate_archive_options(args: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Validate the options of the archive command.
+
+        Args:
+            args: The command line arguments
+
+        Returns:
+            Dictionary with older_than, batch_size and compact, or None if
+            validation fails
+        """
+        parsed = ArgumentValidator.split_options(
+            args[2:], ["older-than", "batch-size"], ["compact"]
+        )
+        if parsed is None:
+            return None
+        positional, options = parsed
+        if positional:
+            print(f"Error: Unexpected argument: {positional[0]}")
+            return None
+
+        older_than = options.get("older-than")
+        if not older_than:
+            print("Error: --older-than is required (e.g. --older-than 30d)")
+            return None
+
+        try:
+            batch_size = int(options.get("batch-size", "1000"))
+        except ValueError:
+            print("Error: Batch size must be a number")
+            return None
+
+        return {
+            "older_than": older_than,
+            "batch_size": batch_size,
+            "compact": options.get("compact", False),
+        }
+
+    @staticmethod
+    def validate_serve_options(args: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Validate the address and worker options of the serve command.
+
+        The port must fit in 16 bits (0 picks a free one) and the worker
+        count must be positive.
+
+        Args:
+            args: The command line arguments
+
+        Returns:
+            Dictionary with host, port, workers and verbose, or None if
+            validation fails
+        """
+        parsed = ArgumentValidator.split_options(
+            args[2:], ["host", "port", "workers"], ["verbose"]
+        )
+        if parsed is None:
+            return None
+        positional, options = parsed
+        if positional:
+            print(f"Error: Unexpected argument: {positional[0]}")
+            return None
+
+        numbers = {}
+        for name, default in (("port", "8080"), ("workers", None)):
+            value = options.get(name, default)
+            if value is None:
+                numbers[name] = None
+                continue
+            try:
+                numbers[name] = int(value)
+            except ValueError:
+                print(f"Error: {name.capitalize()} must be a number")
+                return None
+
+        if not 0 <= numbers["port"] <= 65535:
+            print("Error: Port must be between 0 and 65535")
+            return None
+        if numbers["workers"] is not None and numbers["workers"] < 1:
+            print("Error: Workers must be a positive number")
+            return None
+        return {
+            "host": options.get("host", "127.0.0.1"),
+            "port": numbers["port"],
+            "workers": numbers["workers"],
+            "verbose": options.get("verbose", False),
+        }
@@ -4,23 +4,53 @@ Dependency Injection Container
 Centralized dependency management for the Task Tracker application.
 Provides lazy loading and singleton pattern for all services.
 SQLite-only implementation.
+
+Nothing heavy is imported at module level: the database stack, the
+formatter and each command class are imported the first time they are
+needed, so a CLI launch only pays for the command it actually runs.
 """
 
-from typing import Dict, Type
-from src.utils.db_handler import DBHandler
-from src.repositories.task_repository_db import TaskRepositoryDB
-from src.services.task_service import TaskService
-from src.cli.formatters import TaskFormatter
-from src.cli.commands import (
-    BaseCommand,
-    AddCommand,
-    UpdateCommand,
-    DeleteCommand,
-    ListCommand,
-    TodoCommand,
-    InProgressCommand,
-    DoneCommand,
-)
+import glob
+import os
+import re
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+
+if TYPE_CHECKING:
+    from src.api.server import TaskHTTPServer
+    from src.cli.commands import BaseCommand
+    from src.cli.formatters import TaskFormatter
+    from src.repositories.task_repository_db import TaskRepositoryDB
+    from src.services.async_task_service import AsyncTaskService
+    from src.services.cross_project_service import CrossProjectService
+    from src.services.task_service import TaskService
+    from src.utils.db_handler import DBHandler
+    from src.utils.profiler import Profiler
+
+
+# Command name -> "module:ClassName", resolved on first use
+COMMAND_REGISTRY: Dict[str, str] = {
+    "add": "src.cli.commands:AddCommand",
+    "import": "src.cli.commands:ImportCommand",
+    "update": "src.cli.commands:UpdateCommand",
+    "delete": "src.cli.commands:DeleteCommand",
+    "list": "src.cli.commands:ListCommand",
+    "search": "src.cli.commands:SearchCommand",
+    "stats": "src.cli.commands:StatsCommand",
+    "archive": "src.cli.commands:ArchiveCommand",
+    "serve": "src.cli.commands:ServeCommand",
+    "todo": "src.cli.commands:TodoCommand",
+    "in-progress": "src.cli.commands:InProgressCommand",
+    "done": "src.cli.commands:DoneCommand",
+}
+
+# Name of the project stored in the default database
+DEFAULT_PROJECT = "default"
+
+# Other projects live in projects/<name>.db inside the data directory
+PROJECTS_DIR = "projects"
+
+PROJECT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
 
 
 class DIContainer:
@@ -32,42 +62,298 @@ class DIContainer:
     SQLite-only implementation.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        cache_size: int = 0,
+        group_commit: bool = False,
+        busy_timeout_ms: Optional[int] = None,
+        project: Optional[str] = None,
+    ):
+        self._db_path = db_path
+        self._default_db_path = db_path
+        self._project = DEFAULT_PROJECT
+        self._cache_size = cache_size
+        self._group_commit = group_commit
+        self._busy_timeout_ms = busy_timeout_ms
+        self._profiler: Optional["Profiler"] = None
         self._db_handler = None
         self._repository = None
         self._service = None
+        self._async_service = None
         self._formatter = None
-        self._commands: Dict[str, BaseCommand] = {}
+        self._commands: Dict[str, "BaseCommand"] = {}
+        self._project_handlers: List["DBHandler"] = []
+        self._cross_project_service: Optional["CrossProjectService"] = None
+        self._cross_project_databases: Dict[str, str] = {}
+        if project:
+            self.select_database(project=project)
+
+    def _handler_options(self) -> Dict[str, Any]:
+        """
+        Keyword arguments shared by every DBHandler the container builds
+
+        Returns:
+            DBHandler options
+        """
+        options = {"group_commit": self._group_commit, "profiler": self._profiler}
+        if self._busy_timeout_ms is not None:
+            options["busy_timeout_ms"] = self._busy_timeout_ms
+        return options
 
     @property
-    def db_handler(self) -> DBHandler:
+    def db_handler(self) -> "DBHandler":
         """Get or create DBHandler instance (lazy loading)"""
         if self._db_handler is None:
-            self._db_handler = DBHandler()
+            from src.utils.db_handler import DBHandler
+
+            options = self._handler_options()
+            if self._db_path:
+                self._db_handler = DBHandler(self._db_path, **options)
+            else:
+                self._db_handler = DBHandler(**options)
         return self._db_handler
 
     @property
-    def repository(self) -> TaskRepositoryDB:
+    def repository(self) -> "TaskRepositoryDB":
         """Get or create TaskRepository instance (lazy loading)"""
         if self._repository is None:
-            self._repository = TaskRepositoryDB(self.db_handler)
+            from src.repositories.task_repository_db import TaskRepositoryDB
+
+            self._repository = TaskRepositoryDB(
+                self.db_handler, cache_size=self._cache_size, profiler=self._profiler
+            )
         return self._repository
 
+    def set_profiler(self, profiler: Optional["Profiler"]) -> None:
+        """
+        Profile the database stack built from now on
+
+        Must be called before the first command runs; components that
+        already exist are not instrumented.
+
+        Args:
+            profiler: Profiler to report statement and hydration times to
+        """
+        self._profiler = profiler
+
+    def select_database(
+        self, db_path: Optional[str] = None, project: Optional[str] = None
+    ) -> None:
+        """
+        Choose the database the service works on
+
+        A project name selects projects/<name>.db inside the data
+        directory; the default project is the default database. Must be
+        called before the first command runs.
+
+        Args:
+            db_path: Database file, absolute or relative to the data directory
+            project: Project name
+
+        Raises:
+            ValueError: If both are given or the project name is invalid
+        """
+        if db_path and project:
+            raise ValueError("Use either --db or --project, not both")
+        if project is not None:
+            if not PROJECT_NAME.fullmatch(project):
+                raise ValueError(
+                    f"Invalid project name: {project!r}"
+                    " (use letters, digits, '-' and '_')"
+                )
+            self._project = project
+            if project == DEFAULT_PROJECT:
+                self._db_path = self._default_db_path
+            else:
+                self._db_path = os.path.join(PROJECTS_DIR, f"{project}.db")
+        elif db_path:
+            self._db_path = self._default_db_path = db_path
+            self._project = DEFAULT_PROJECT
+
     @property
-    def service(self) -> TaskService:
+    def project(self) -> str:
+        """Name of the selected project"""
+        return self._project
+
+    def project_databases(self) -> Dict[str, str]:
+        """
+        Every project database that exists, without opening any of them
+
+        The default database (or the one chosen with --db) comes first,
+        followed by the projects in name order.
+
+        Returns:
+            Dictionary mapping project names to database paths
+        """
+        from src.utils.db_handler import DATA_DIR
+
+        databases = {}
+        default = os.path.abspath(
+            os.path.join(DATA_DIR, self._default_db_path or "tasks.db")
+        )
+        if os.path.exists(default):
+            databases[DEFAULT_PROJECT] = default
+        pattern = os.path.join(DATA_DIR, PROJECTS_DIR, "*.db")
+        for path in sorted(glob.glob(pattern)):
+            name = os.path.basename(path)[: -len(".db")]
+            if not PROJECT_NAME.fullmatch(name) or name == DEFAULT_PROJECT:
+                continue
+            if os.path.abspath(path) != default:
+                databases[name] = os.path.abspath(path)
+        return databases
+
+    def cross_project_service(self) -> "CrossProjectService":
+        """
+        Get a read-only service over every project database
+
+        Each project gets its own DBHandler, repository and TaskService.
+        The service is reused while the set of project databases stays the
+        same, so repeated listings in a shell do not open more handlers;
+        when a project appears or disappears the old handlers are closed
+        and the service is rebuilt. reset() closes the handlers.
+
+        Returns:
+            CrossProjectService over all projects
+        """
+        databases = self.project_databases()
+        if (
+            self._cross_project_service is not None
+            and databases == self._cross_project_databases
+        ):
+            return self._cross_project_service
+
+        from src.repositories.task_repository_db import TaskRepositoryDB
+        from src.services.cross_project_service import CrossProjectService
+        from src.services.task_service import TaskService
+        from src.utils.db_handler import DBHandler
+
+        self._close_project_handlers()
+        services = {}
+        for name, path in databases.items():
+            handler = DBHandler(path, **self._handler_options())
+            self._project_handlers.append(handler)
+            services[name] = TaskService(TaskRepositoryDB(handler))
+        self._cross_project_service = CrossProjectService(services)
+        self._cross_project_databases = databases
+        return self._cross_project_service
+
+    def _close_project_handlers(self) -> None:
+        """Stop the cross-project service and close its handlers"""
+        if self._cross_project_service is not None:
+            self._cross_project_service.close()
+        for handler in self._project_handlers:
+            handler.close()
+        self._project_handlers = []
+        self._cross_project_service = None
+        self._cross_project_databases = {}
+
+    def set_cache_size(self, cache_size: int) -> None:
+        """
+        Set the repository identity map capacity (0 disables it)
+
+        Applies to the repository if it already exists, otherwise to the
+        one created later.
+
+        Args:
+            cache_size: Maximum number of cached tasks
+        """
+        self._cache_size = cache_size
+        if self._repository is not None:
+            self._repository.resize_cache(cache_size)
+
+    @property
+    def service(self) -> "TaskService":
         """Get or create TaskService instance (lazy loading)"""
         if self._service is None:
+            from src.services.task_service import TaskService
+
             self._service = TaskService(self.repository)
         return self._service
 
     @property
-    def formatter(self) -> TaskFormatter:
+    def async_service(self) -> "AsyncTaskService":
+        """Get or create AsyncTaskService instance (lazy loading)"""
+        if self._async_service is None:
+            from src.services.async_task_service import AsyncTaskService
+
+            self._async_service = AsyncTaskService(self.service)
+        return self._async_service
+
+    def create_http_server(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: Optional[int] = None,
+        verbose: bool = False,
+    ) -> "TaskHTTPServer":
+        """
+        Create an HTTP JSON API server bound to the shared service
+
+        The repository identity map is enabled (at least CACHE_SIZE
+        tasks) for the life of the server, so hot tasks are served from
+        memory. Writes made through the server keep it coherent; writes
+        by other processes are not seen for tasks already cached.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+            workers: Number of worker threads (default sized to the CPU count)
+            verbose: Log every request to stderr
+
+        Returns:
+            Server ready for serve_forever()
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        from src.api.server import CACHE_SIZE, TaskHTTPServer
+
+        self.set_cache_size(max(self._cache_size, CACHE_SIZE))
+        return TaskHTTPServer(
+            (host, port), self.service, workers=workers, verbose=verbose
+        )
+
+    @property
+    def formatter(self) -> "TaskFormatter":
         """Get or create TaskFormatter instance (lazy loading)"""
         if self._formatter is None:
+            from src.cli.formatters import TaskFormatter
+
             self._formatter = TaskFormatter()
         return self._formatter
 
-    def create_command(self, command_type: str) -> BaseCommand:
+    @staticmethod
+    def command_names() -> List[str]:
+        """
+        Names of all registered commands, without importing any of them
+
+        Returns:
+            List of command names
+        """
+        return list(COMMAND_REGISTRY)
+
+    @staticmethod
+    def _load_command_class(command_type: str) -> Type["BaseCommand"]:
+        """
+        Import the class registered for a command
+
+        Args:
+            command_type: Type of command to load
+
+        Returns:
+            Command class
+
+        Raises:
+            ValueError: If command type is unknown
+        """
+        target = COMMAND_REGISTRY.get(command_type)
+        if target is None:
+            raise ValueError(f"Unknown command: {command_type}")
+        module_name, class_name = target.split(":")
+        return getattr(import_module(module_name), class_name)
+
+    def create_command(self, command_type: str) -> "BaseCommand":
         """
         Factory method for creating commands with injected dependencies
 
@@ -80,50 +366,39 @@ class DIContainer:
         Raises:
             ValueError: If command type is unknown
         """
-        command_classes: Dict[str, Type[BaseCommand]] = {
-            "add": AddCommand,
-            "update": UpdateCommand,
-            "delete": DeleteCommand,
-            "list": ListCommand,
-            "todo": TodoCommand,
-            "in-progress": InProgressCommand,
-            "done": DoneCommand,
-        }
-
-        command_class = command_classes.get(command_type)
-        if command_class is None:
-            raise ValueError(f"Unknown command: {command_type}")
+        command_class = self._load_command_class(command_type)
 
         # Create command with injected dependencies
-        return command_class(service=self.service, formatter=self.formatter)
+        options: Dict[str, Any] = {}
+        if getattr(command_class, "uses_all_projects", False):
+            options["all_projects"] = self.cross_project_service
+        if getattr(command_class, "uses_http_server", False):
+            options["http_server"] = self.create_http_server
+        return command_class(service=self.service, formatter=self.formatter, **options)
 
-    def get_all_commands(self) -> Dict[str, BaseCommand]:
+    def get_all_commands(self) -> Dict[str, "BaseCommand"]:
         """
         Get all available commands with dependencies injected
 
         Returns:
             Dictionary mapping command names to command instances
         """
-        if not self._commands:
-            command_types = [
-                "add",
-                "update",
-                "delete",
-                "list",
-                "todo",
-                "in-progress",
-                "done",
-            ]
-
-            for command_type in command_types:
+        for command_type in COMMAND_REGISTRY:
+            if command_type not in self._commands:
                 self._commands[command_type] = self.create_command(command_type)
 
         return self._commands
 
     def reset(self) -> None:
         """Reset all cached instances (useful for testing)"""
+        if self._async_service is not None:
+            self._async_service.close()
+        if self._db_handler is not None:
+            self._db_handler.close()
+        self._close_project_handlers()
         self._db_handler = None
         self._repository = None
         self._service = None
+        self._async_service = None
         self._formatter = None
         self._commands = {}
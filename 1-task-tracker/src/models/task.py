@@ -1,14 +1,63 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
+from src.utils.timestamps import from_epoch_us
 
 
 class Task:
-    def __init__(self, id: int, description: str, status: str = "todo"):
+    __slots__ = (
+        "id",
+        "description",
+        "status",
+        "created_at",
+        "updated_at",
+        "version",
+        "created_at_us",
+    )
+
+    def __init__(
+        self,
+        id: Optional[int],
+        description: str,
+        status: str = "todo",
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        version: Optional[int] = 1,
+    ):
         self.id = id
         self.description = description
         self.status = status
-        self.created_at = datetime.now().isoformat()
-        self.updated_at = self.created_at
+        self.created_at = created_at or datetime.now().isoformat()
+        self.updated_at = updated_at or self.created_at
+        # Incremented by every write; None when loaded without it
+        self.version = version
+        # Stored creation time (epoch microseconds); set by from_row only
+        self.created_at_us: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Task":
+        """
+        Build a task straight from a database row
+
+        Skips __init__, so no clock is read and no intermediate dict is
+        created. The row's integer timestamps (microseconds since the
+        epoch) become ISO 8601 strings; the creation time is also kept as
+        created_at_us, since a local time string is ambiguous in the hour
+        repeated when clocks go back. Listing rows do not carry the
+        version, so it is left as None.
+
+        Args:
+            row: (id, description, status, created_at, updated_at)
+
+        Returns:
+            Task instance
+        """
+        task = cls.__new__(cls)
+        task.id, task.description, task.status, created_at, updated_at = row
+        task.created_at = from_epoch_us(created_at)
+        task.created_at_us = created_at
+        task.updated_at = from_epoch_us(updated_at)
+        task.version = None
+        return task
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from src.models.task import Task
+
+
+class TaskIdentityMap:
+    """
+    Bounded LRU identity map of loaded tasks
+
+    Holds at most one Task object per ID so repeated lookups of a hot task
+    return the same instance without a database round trip. The least
+    recently used entry is evicted once capacity is reached. A capacity
+    of 0 disables the map. Safe to share between threads.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self.capacity = max(0, capacity)
+        self._tasks: "OrderedDict[int, Task]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the map holds any entries at all"""
+        return self.capacity > 0
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """
+        Look up a task and mark it as recently used
+
+        Args:
+            task_id: Task ID to look up
+
+        Returns:
+            The cached task, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                self.misses += 1
+                return None
+            self._tasks.move_to_end(task_id)
+            self.hits += 1
+            return task
+
+    def put(self, task: Task) -> None:
+        """
+        Store a task, evicting the least recently used one if full
+
+        Args:
+            task: Task to store
+        """
+        if not self.enabled or task.id is None:
+            return
+        with self._lock:
+            self._tasks[task.id] = task
+            self._tasks.move_to_end(task.id)
+            self._evict()
+
+    def discard(self, task_ids: Iterable[int]) -> None:
+        """
+        Drop tasks from the map
+
+        Args:
+            task_ids: IDs to drop; unknown IDs are ignored
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for task_id in task_ids:
+                self._tasks.pop(task_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._tasks.clear()
+
+    def resize(self, capacity: int) -> None:
+        """
+        Change the capacity, evicting entries that no longer fit
+
+        Args:
+            capacity: New maximum number of entries; 0 disables the map
+        """
+        with self._lock:
+            self.capacity = max(0, capacity)
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report size and hit/miss/eviction counters
+
+        Returns:
+            Dictionary of counters
+        """
+        with self._lock:
+            return {
+                "size": len(self._tasks),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self) -> None:
+        """Evict least recently used entries down to capacity (lock held)"""
+        while len(self._tasks) > self.capacity:
+            self._tasks.popitem(last=False)
+            self.evictions += 1
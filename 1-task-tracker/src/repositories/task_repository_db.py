@@ -1,32 +1,118 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from src.models.task import Task
+from src.repositories.identity_map import TaskIdentityMap
 from src.utils.db_handler import DBHandler
 
+if TYPE_CHECKING:
+    from src.utils.profiler import Profiler
+
 
 class TaskRepositoryDB:
-    def __init__(self, db_handler: DBHandler):
+    def __init__(
+        self,
+        db_handler: DBHandler,
+        cache_size: int = 0,
+        profiler: Optional["Profiler"] = None,
+    ):
+        """
+        Args:
+            db_handler: Database access layer
+            cache_size: Capacity of the identity map for point lookups;
+                0 (the default) disables it
+            profiler: Time building Task objects from rows as "hydration"
+        """
         self.db_handler = db_handler
+        self.identity_map = TaskIdentityMap(cache_size)
+        self.profiler = profiler
+
+    def _hydrate(self, rows: Iterable[Tuple[Any, ...]]) -> Iterator[Task]:
+        """
+        Build Task objects from row tuples, lazily
+
+        Args:
+            rows: Rows as returned by DBHandler.iter_tasks
+
+        Returns:
+            Iterator over tasks
+        """
+        if self.profiler is not None:
+            return self.profiler.timed_map("hydration", Task.from_row, rows)
+        return map(Task.from_row, rows)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Report identity map size and hit/miss/eviction counters
+
+        Returns:
+            Dictionary of counters
+        """
+        return self.identity_map.stats()
+
+    def resize_cache(self, cache_size: int) -> None:
+        """
+        Change the identity map capacity; 0 disables it
+
+        Args:
+            cache_size: New capacity
+        """
+        self.identity_map.resize(cache_size)
+
+    @staticmethod
+    def _to_task(task_data: Dict[str, Any]) -> Task:
+        """
+        Build a Task from a database row
+
+        Args:
+            task_data: Row data as returned by DBHandler
+
+        Returns:
+            Task instance
+        """
+        return Task(
+            task_data["id"],
+            task_data["description"],
+            task_data["status"],
+            task_data["created_at"],
+            task_data["updated_at"],
+            task_data["version"],
+        )
 
     def get_next_id(self) -> int:
         """
         Get the next available task ID
 
+        Advisory only; save_task assigns the real ID.
+
         Returns:
             Next task ID
         """
-        tasks = self.db_handler.get_all_tasks()
-        if not tasks:
-            return 1
-        return max(task["id"] for task in tasks) + 1
+        return self.db_handler.get_next_id()
 
-    def save_task(self, task: Task) -> None:
+    def save_task(self, task: Task) -> int:
         """
-        Save a task
+        Save a task and record the ID SQLite assigned to it
 
         Args:
             task: Task to save
+
+        Returns:
+            ID of the saved task
         """
-        self.db_handler.save_task(task)
+        task.id = self.db_handler.save_task(task)
+        self.identity_map.put(task)
+        return task.id
+
+    def save_tasks(self, tasks: Iterable[Task]) -> int:
+        """
+        Save many tasks in one transaction
+
+        Args:
+            tasks: Tasks to save
+
+        Returns:
+            Number of tasks saved
+        """
+        return self.db_handler.save_tasks(tasks)
 
     def find_by_id(self, task_id: int) -> Optional[Task]:
         """
@@ -38,16 +124,41 @@ class TaskRepositoryDB:
         Returns:
             Task with the given ID or None if not found
         """
-        tasks = self.db_handler.get_all_tasks()
-        for task_data in tasks:
-            if task_data["id"] == task_id:
-                task = Task(
-                    task_data["id"], task_data["description"], task_data["status"]
-                )
-                task.created_at = task_data["created_at"]
-                task.updated_at = task_data["updated_at"]
-                return task
-        return None
+        task = self.identity_map.get(task_id)
+        if task is not None:
+            return task
+
+        task_data = self.db_handler.get_task_by_id(task_id)
+        if task_data is None:
+            return None
+        task = self._to_task(task_data)
+        self.identity_map.put(task)
+        return task
+
+    def find_by_ids(self, task_ids: List[int]) -> List[Task]:
+        """
+        Find several tasks by ID
+
+        Args:
+            task_ids: Task IDs to find
+
+        Returns:
+            Tasks that exist, ordered like task_ids; missing IDs are skipped
+        """
+        by_id: Dict[int, Task] = {}
+        for task_id in task_ids:
+            task = self.identity_map.get(task_id)
+            if task is not None:
+                by_id[task_id] = task
+
+        to_load = [task_id for task_id in task_ids if task_id not in by_id]
+        for task_data in self.db_handler.get_tasks_by_ids(to_load):
+            task = self._to_task(task_data)
+            self.identity_map.put(task)
+            by_id[task.id] = task
+        return [
+            by_id[task_id] for task_id in dict.fromkeys(task_ids) if task_id in by_id
+        ]
 
     def find_all(self) -> List[Task]:
         """
@@ -56,14 +167,7 @@ class TaskRepositoryDB:
         Returns:
             List of all tasks
         """
-        tasks_data = self.db_handler.get_all_tasks()
-        tasks = []
-        for task_data in tasks_data:
-            task = Task(task_data["id"], task_data["description"], task_data["status"])
-            task.created_at = task_data["created_at"]
-            task.updated_at = task_data["updated_at"]
-            tasks.append(task)
-        return tasks
+        return list(self.iter_all())
 
     def find_by_status(self, status: str) -> List[Task]:
         """
@@ -75,26 +179,280 @@ class TaskRepositoryDB:
         Returns:
             List of tasks with the given status
         """
-        tasks_data = self.db_handler.get_all_tasks()
-        tasks = []
-        for task_data in tasks_data:
-            if task_data["status"] == status:
-                task = Task(
-                    task_data["id"], task_data["description"], task_data["status"]
-                )
-                task.created_at = task_data["created_at"]
-                task.updated_at = task_data["updated_at"]
-                tasks.append(task)
-        return tasks
+        return list(self.iter_by_status(status))
+
+    def iter_all(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        updated_since: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Task]:
+        """
+        Stream all tasks, newest first
+
+        Args:
+            limit: Maximum number of tasks to return
+            after: Optional (created_at, id) keyset position to resume after
+            since: Only tasks created at or after this time (epoch microseconds)
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Yields:
+            One task at a time
+        """
+        rows = self.db_handler.iter_tasks(
+            limit=limit,
+            after=after,
+            since=since,
+            until=until,
+            updated_since=updated_since,
+            include_archived=include_archived,
+        )
+        return self._hydrate(rows)
+
+    def iter_by_status(
+        self,
+        status: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        updated_since: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Task]:
+        """
+        Stream tasks with the given status, newest first
+
+        Args:
+            status: Task status to filter by
+            limit: Maximum number of tasks to return
+            after: Optional (created_at, id) keyset position to resume after
+            since: Only tasks created at or after this time (epoch microseconds)
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Yields:
+            One task at a time
+        """
+        rows = self.db_handler.iter_tasks(
+            status,
+            limit=limit,
+            after=after,
+            since=since,
+            until=until,
+            updated_since=updated_since,
+            include_archived=include_archived,
+        )
+        return self._hydrate(rows)
+
+    def iter_rows(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        updated_since: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream raw task rows, newest first, without building Task objects
+
+        Args:
+            status: Optional task status to filter by
+            limit: Maximum number of rows to return
+            after: Optional (created_at, id) keyset position to resume after
+            since: Only tasks created at or after this time (epoch microseconds)
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Returns:
+            Iterator over (id, description, status, created_at, updated_at)
+            tuples, timestamps in microseconds since the epoch
+        """
+        return self.db_handler.iter_tasks(
+            status,
+            limit=limit,
+            after=after,
+            since=since,
+            until=until,
+            updated_since=updated_since,
+            include_archived=include_archived,
+        )
+
+    def search(
+        self, match_query: str, status: Optional[str] = None, limit: int = 20
+    ) -> List[Task]:
+        """
+        Find tasks whose description matches a full-text query
+
+        Args:
+            match_query: FTS5 MATCH expression
+            status: Optional task status to filter by
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Matching tasks, best matches first
+        """
+        rows = self.db_handler.search_tasks(match_query, status, limit)
+        return list(self._hydrate(rows))
 
     def update_task(self, task: Task) -> None:
         """
-        Update a task
+        Update a task, keeping the identity map in step
+
+        A task loaded with its version is only written while the stored
+        row still has that version; its version is advanced on success.
+
+        Raises:
+            TaskConflictError: If the task was changed by another writer
+        """
+        try:
+            version = self.db_handler.update_task(task)
+        except Exception:
+            # The caller may have changed the cached object already
+            self.identity_map.discard([task.id])
+            raise
+        if version is not None:
+            task.version = version
+        self.identity_map.put(task)
+
+    def modify_task(
+        self,
+        task_id: int,
+        updated_at: int,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Task]:
+        """
+        Change some fields of a task in one statement, without reading it
+        first
+
+        Args:
+            task_id: Task ID to change
+            updated_at: New update time in microseconds since the epoch
+            description: New description, or None to keep it
+            status: New status, or None to keep it
+            expected_version: Only apply the change while the task has this
+                version
+
+        Returns:
+            The changed task, or None if it does not exist
+
+        Raises:
+            TaskConflictError: If the task has another version than expected
         """
-        self.db_handler.update_task(task)
+        try:
+            row = self.db_handler.modify_task(
+                task_id, updated_at, description, status, expected_version
+            )
+        except Exception:
+            self.identity_map.discard([task_id])
+            raise
+        if row is None:
+            self.identity_map.discard([task_id])
+            return None
+        task = Task.from_row(row[:5])
+        task.version = row[5]
+        self.identity_map.put(task)
+        return task
 
     def delete_task(self, task_id: int) -> bool:
         """
-        Delete a task
+        Delete a task, dropping it from the identity map
         """
+        self.identity_map.discard([task_id])
         return self.db_handler.delete_task(task_id)
+
+    def update_status_many(
+        self,
+        task_ids: List[int],
+        id_ranges: List[Tuple[int, int]],
+        status: str,
+        updated_at: int,
+    ) -> List[int]:
+        """
+        Set the status of many tasks at once
+
+        Returns:
+            IDs of the tasks that were updated
+        """
+        updated = self.db_handler.update_status_many(
+            task_ids, id_ranges, status, updated_at
+        )
+        self.identity_map.discard(updated)
+        return updated
+
+    def delete_many(
+        self, task_ids: List[int], id_ranges: List[Tuple[int, int]]
+    ) -> List[int]:
+        """
+        Delete many tasks at once
+
+        Returns:
+            IDs of the tasks that were deleted
+        """
+        deleted = self.db_handler.delete_many(task_ids, id_ranges)
+        self.identity_map.discard(deleted)
+        return deleted
+
+    def archive_done(self, cutoff: int, batch_size: int = 1000) -> List[int]:
+        """
+        Move done tasks last updated before cutoff into the archive
+
+        Args:
+            cutoff: Archive tasks updated before this time (epoch microseconds)
+            batch_size: Number of tasks moved per transaction
+
+        Returns:
+            IDs of the archived tasks
+        """
+        archived = self.db_handler.archive_done_tasks(cutoff, batch_size)
+        self.identity_map.discard(archived)
+        return archived
+
+    def count_archived(self) -> int:
+        """
+        Count archived tasks
+
+        Returns:
+            Number of archived tasks
+        """
+        return self.db_handler.count_archived()
+
+    def compact(self) -> None:
+        """
+        Rebuild the database file with incremental auto-vacuum enabled
+        """
+        self.db_handler.compact()
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Get the maintained number of tasks by status
+
+        Returns:
+            Number of tasks by status
+        """
+        return self.db_handler.get_status_counts()
+
+    def recount_by_status(self) -> Dict[str, int]:
+        """
+        Count tasks by status directly from the tasks table
+
+        Returns:
+            Number of tasks by status
+        """
+        return self.db_handler.count_tasks_by_status()
+
+    def rebuild_counts(self) -> None:
+        """
+        Recompute the maintained counters from the tasks table
+        """
+        self.db_handler.rebuild_status_counts()
@@ -0,0 +1,274 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from src.models.task import Task
+from src.services.task_service import TaskService
+
+T = TypeVar("T")
+
+
+class AsyncTaskService:
+    """
+    Awaitable facade over TaskService for use inside an event loop
+
+    SQLite calls block, so every operation runs on a worker thread. Writes
+    go through a single-thread executor, which serializes them in the order
+    they were awaited and avoids writers contending for the database lock.
+    Reads run on a separate pool; each worker thread keeps its own WAL
+    connection in DBHandler, so readers never wait for the writer.
+    """
+
+    def __init__(self, service: TaskService, readers: int = 4):
+        """
+        Args:
+            service: Synchronous service doing the actual work
+            readers: Number of threads serving read operations
+        """
+        self.service = service
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="task-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=max(1, readers), thread_name_prefix="task-reader"
+        )
+
+    async def __aenter__(self) -> "AsyncTaskService":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        # Waiting for pending operations must not block the event loop
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        """
+        Wait for pending operations and stop the worker threads
+        """
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+    async def _write(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a write operation on the writer thread
+
+        Args:
+            func: Synchronous operation to run
+            *args: Arguments for func
+
+        Returns:
+            The result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, functools.partial(func, *args))
+
+    async def _read(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a read operation on the reader pool
+
+        Args:
+            func: Synchronous operation to run
+            *args: Arguments for func
+
+        Returns:
+            The result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(func, *args))
+
+    async def add_task(self, description: str) -> Task:
+        """
+        Add a new task
+
+        Args:
+            description: Task description
+
+        Returns:
+            The created task
+        """
+        return await self._write(self.service.add_task, description)
+
+    async def add_tasks(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk add tasks in one transaction
+
+        Args:
+            records: Task records with a description and optional status
+
+        Returns:
+            Number of tasks added
+        """
+        return await self._write(self.service.add_tasks, records)
+
+    async def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Get a single task
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            The task, or None if it does not exist
+        """
+        return await self._read(self.service.get_task, task_id)
+
+    async def list_all_tasks(self) -> List[Task]:
+        """
+        List all tasks
+
+        Returns:
+            List of all tasks
+        """
+        return await self._read(self.service.list_all_tasks)
+
+    async def list_tasks_by_status(
+        self, status: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Task]:
+        """
+        List tasks by status
+
+        Args:
+            status: Task status to filter
+            limit: Maximum number of tasks to return
+            after: Cursor of the last task of the previous page
+
+        Returns:
+            List of tasks with the given status
+        """
+        return await self._read(self.service.list_tasks_by_status, status, limit, after)
+
+    async def search_tasks(
+        self, query: str, status: Optional[str] = None, limit: int = 20
+    ) -> List[Task]:
+        """
+        Search task descriptions
+
+        Args:
+            query: Words to search for
+            status: Optional status filter
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Matching tasks, best match first
+        """
+        return await self._read(self.service.search_tasks, query, status, limit)
+
+    async def counts(self) -> Dict[str, int]:
+        """
+        Number of tasks per status
+
+        Returns:
+            Counts for todo, in-progress and done, plus the total
+        """
+        return await self._read(self.service.counts)
+
+    async def update_task(
+        self, task_id: int, new_description: str, expected_version: Optional[int] = None
+    ) -> Task:
+        """
+        Update a task description
+
+        Args:
+            task_id: Task ID
+            new_description: New description
+            expected_version: Only update while the task has this version
+
+        Returns:
+            The updated task
+        """
+        return await self._write(
+            self.service.update_task, task_id, new_description, expected_version
+        )
+
+    async def delete_task(self, task_id: int) -> bool:
+        """
+        Delete a task
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            True if the task was deleted
+        """
+        return await self._write(self.service.delete_task, task_id)
+
+    async def mark_task_todo(
+        self, task_id: int, expected_version: Optional[int] = None
+    ) -> Task:
+        """
+        Mark a task as todo
+
+        Args:
+            task_id: Task ID
+            expected_version: Only update while the task has this version
+
+        Returns:
+            The updated task
+        """
+        return await self._write(self.service.mark_task_todo, task_id, expected_version)
+
+    async def mark_task_in_progress(
+        self, task_id: int, expected_version: Optional[int] = None
+    ) -> Task:
+        """
+        Mark a task as in progress
+
+        Args:
+            task_id: Task ID
+            expected_version: Only update while the task has this version
+
+        Returns:
+            The updated task
+        """
+        return await self._write(
+            self.service.mark_task_in_progress, task_id, expected_version
+        )
+
+    async def mark_task_done(
+        self, task_id: int, expected_version: Optional[int] = None
+    ) -> Task:
+        """
+        Mark a task as done
+
+        Args:
+            task_id: Task ID
+            expected_version: Only update while the task has this version
+
+        Returns:
+            The updated task
+        """
+        return await self._write(self.service.mark_task_done, task_id, expected_version)
+
+    async def mark_tasks_status(
+        self, task_ids: List[int], id_ranges: List[Tuple[int, int]], status: str
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Set the status of many tasks in one transaction
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+            status: New status
+
+        Returns:
+            Number of tasks updated and the sorted, inclusive (first, last)
+            ranges of requested IDs that were not found
+        """
+        return await self._write(
+            self.service.mark_tasks_status, task_ids, id_ranges, status
+        )
+
+    async def delete_tasks(
+        self, task_ids: List[int], id_ranges: List[Tuple[int, int]]
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Delete many tasks in one transaction
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+
+        Returns:
+            Number of tasks deleted and the sorted, inclusive (first, last)
+            ranges of requested IDs that were not found
+        """
+        return await self._write(self.service.delete_tasks, task_ids, id_ranges)
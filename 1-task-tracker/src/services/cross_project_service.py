@@ -0,0 +1,174 @@
+import heapq
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.services.task_service import TaskService
+from src.utils.db_handler import LISTING_KEY
+
+
+class CrossProjectService:
+    """
+    Read-only listing over the databases of several projects
+
+    Every project keeps its own TaskService. A listing queries all of them
+    at once on a thread pool (sqlite3 releases the GIL while a statement
+    runs) and merges the per-project streams, which are already sorted,
+    into one time-ordered stream. Each project reads ahead one chunk while
+    the merge consumes the previous one, so memory stays bounded by
+    projects x chunk_size rows however large the databases are.
+
+    The reader threads are kept between listings, so their per-thread
+    SQLite connections are reused rather than opened for every listing;
+    close() stops them.
+    """
+
+    def __init__(
+        self,
+        services: Dict[str, TaskService],
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+    ):
+        """
+        Args:
+            services: Service of each project, by project name
+            workers: Number of reader threads (default one per project, max 8)
+            chunk_size: Rows fetched from a project per read-ahead
+        """
+        self.services = services
+        self.workers = workers or min(8, max(1, len(services)))
+        self.chunk_size = chunk_size
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        """
+        Stop the reader threads
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def projects(self) -> List[str]:
+        """Names of the projects being listed"""
+        return list(self.services)
+
+    def iter_task_rows(
+        self,
+        status: str = "all",
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream raw task rows of every project, merged newest first
+
+        Arguments are validated before anything is read, so a bad status
+        or cursor raises here rather than in the middle of the output.
+
+        Args:
+            status: Task status to filter, or 'all'
+            limit: Maximum number of rows to return in total
+            after: Cursor of the last task of the previous page; (created_at,
+                id) positions are assumed unique across projects
+            since: Only tasks created at or after this time
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Returns:
+            Iterator over (id, description, status, created_at, updated_at,
+            project) tuples, newest first, timestamps in microseconds since
+            the epoch
+        """
+        streams = {
+            name: service.iter_task_rows(
+                status, limit, after, since, until, updated_since, include_archived
+            )
+            for name, service in self.services.items()
+        }
+        return self._merge(streams, limit)
+
+    def _merge(
+        self, streams: Dict[str, Iterator[Tuple[Any, ...]]], limit: Optional[int]
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Merge sorted per-project streams while they are read in parallel
+
+        Args:
+            streams: Row iterator of each project
+            limit: Maximum number of rows to yield
+
+        Returns:
+            Merged iterator over project-tagged rows
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="project-reader"
+            )
+        pool = self._pool
+        # Latest read of each project, so an early end can stop them
+        reads: Dict[str, Future] = {}
+        try:
+            # Start every project's first chunk before the merge blocks on one
+            for name, rows in streams.items():
+                reads[name] = pool.submit(self._read_chunk, rows, name)
+            merged = heapq.merge(
+                *(
+                    self._read_ahead(pool, rows, name, reads)
+                    for name, rows in streams.items()
+                ),
+                key=LISTING_KEY,
+                reverse=True,
+            )
+            yield from islice(merged, limit)
+        finally:
+            # Stops queued read-aheads when the consumer ends early and
+            # waits for running ones before their row iterators are dropped
+            running = [future for future in reads.values() if not future.cancel()]
+            wait(running)
+
+    def _read_ahead(
+        self,
+        pool: ThreadPoolExecutor,
+        rows: Iterator[Tuple[Any, ...]],
+        name: str,
+        reads: Dict[str, Future],
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Yield one project's rows, fetching the next chunk in the background
+
+        Args:
+            pool: Executor running the reads
+            rows: Row iterator of the project
+            name: Project name added to every row
+            reads: Pending read of each project, starting with the first
+                chunk; updated with every read-ahead
+
+        Returns:
+            Iterator over project-tagged rows
+        """
+        while True:
+            chunk = reads[name].result()
+            if len(chunk) == self.chunk_size:
+                reads[name] = pool.submit(self._read_chunk, rows, name)
+            yield from chunk
+            if len(chunk) < self.chunk_size:
+                return
+
+    def _read_chunk(
+        self, rows: Iterator[Tuple[Any, ...]], name: str
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Read the next chunk of one project's rows on a pool thread
+
+        Args:
+            rows: Row iterator of the project
+            name: Project name added to every row
+
+        Returns:
+            Up to chunk_size project-tagged rows
+        """
+        return [(*row, name) for row in islice(rows, self.chunk_size)]
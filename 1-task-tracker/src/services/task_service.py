@@ -1,7 +1,14 @@
-from typing import List
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from src.models.task import Task
 from src.repositories.task_repository_db import TaskRepositoryDB
+from src.utils.db_handler import MAX_TASK_ID
+from src.utils.timestamps import now_us, parse_duration, parse_time, to_epoch_us
+
+
+class TaskNotFoundError(ValueError):
+    """No task has the requested ID"""
 
 
 class TaskService:
@@ -21,12 +28,108 @@ class TaskService:
         if not description or not description.strip():
             raise ValueError("Description cannot be empty")
 
-        description = description.strip()
-        task_id = self.repository.get_next_id()
-        task = Task(task_id, description)
+        task = Task(None, description.strip())
         self.repository.save_task(task)
         return task
 
+    def add_tasks(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add many tasks in a single transaction
+
+        Records are validated as they are consumed; an invalid record
+        aborts the whole import.
+
+        Args:
+            records: Dictionaries with a description and optional status,
+                created_at and updated_at
+
+        Returns:
+            Number of tasks added
+        """
+        return self.repository.save_tasks(self._tasks_from_records(records))
+
+    def _tasks_from_records(
+        self, records: Iterable[Dict[str, Any]]
+    ) -> Iterator[Task]:
+        """
+        Validate import records and turn them into tasks
+
+        Args:
+            records: Import records
+
+        Yields:
+            Task for each record
+
+        Raises:
+            ValueError: Naming the record number, if a record has a field
+                of the wrong type or an invalid value
+        """
+        now = datetime.now().isoformat()
+        for number, record in enumerate(records, start=1):
+            description = record.get("description")
+            if description is not None and not isinstance(description, str):
+                raise ValueError(f"Record {number}: Description must be a string")
+            description = (description or "").strip()
+            if not description:
+                raise ValueError(f"Record {number}: Description cannot be empty")
+
+            status = record.get("status") or "todo"
+            if status not in ["todo", "in-progress", "done"]:
+                raise ValueError(
+                    f"Record {number}: Invalid status: "
+                    "Use 'todo', 'in-progress' or 'done'"
+                )
+
+            created_at = self._record_time(record, "created_at", number) or now
+            yield Task(
+                None,
+                description,
+                status,
+                created_at,
+                self._record_time(record, "updated_at", number) or created_at,
+            )
+
+    @staticmethod
+    def _record_time(
+        record: Dict[str, Any], field: str, number: int
+    ) -> Optional[str]:
+        """
+        Check a timestamp field of an import record
+
+        Args:
+            record: Import record
+            field: created_at or updated_at
+            number: Record number for error messages
+
+        Returns:
+            The ISO 8601 timestamp, or None if the field is missing or empty
+
+        Raises:
+            ValueError: If the field is not an ISO 8601 string
+        """
+        value = record.get(field)
+        if value is None or value == "":
+            return None
+        if not isinstance(value, str):
+            raise ValueError(f"Record {number}: {field} must be an ISO 8601 string")
+        try:
+            to_epoch_us(value)
+        except ValueError:
+            raise ValueError(f"Record {number}: Invalid {field}: {value}") from None
+        return value
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Get a single task
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            The task, or None if it does not exist
+        """
+        return self.repository.find_by_id(task_id)
+
     def list_all_tasks(self) -> List[Task]:
         """
         List all tasks
@@ -36,113 +139,551 @@ class TaskService:
         """
         return self.repository.find_all()
 
-    def list_tasks_by_status(self, status: str) -> List[Task]:
+    def list_tasks_by_status(
+        self, status: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Task]:
         """
         List tasks by status
 
         Args:
             status: Task status to filter
+            limit: Maximum number of tasks to return
+            after: Cursor of the last task of the previous page
 
         Returns:
             List of tasks with the given status
         """
+        return list(self.iter_tasks_by_status(status, limit, after))
+
+    def iter_tasks_by_status(
+        self,
+        status: str = "all",
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Task]:
+        """
+        Stream tasks by status without loading them all into memory
+
+        Args:
+            status: Task status to filter, or 'all'
+            limit: Maximum number of tasks to return
+            after: Cursor of the last task of the previous page
+            since: Only tasks created at or after this time
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Returns:
+            Iterator over the matching tasks, newest first
+        """
+        position = self._listing_position(status, limit, after)
+        window = self._listing_window(since, until, updated_since)
+        window["include_archived"] = include_archived
+        if status == "all":
+            return self.repository.iter_all(limit, position, **window)
+        return self.repository.iter_by_status(status, limit, position, **window)
+
+    def iter_task_rows(
+        self,
+        status: str = "all",
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream raw task rows by status for serialisation, skipping Task objects
+
+        Args:
+            status: Task status to filter, or 'all'
+            limit: Maximum number of rows to return
+            after: Cursor of the last task of the previous page
+            since: Only tasks created at or after this time
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Returns:
+            Iterator over (id, description, status, created_at, updated_at)
+            tuples, newest first, timestamps in microseconds since the epoch
+        """
+        position = self._listing_position(status, limit, after)
+        window = self._listing_window(since, until, updated_since)
+        window["include_archived"] = include_archived
+        return self.repository.iter_rows(
+            None if status == "all" else status, limit, position, **window
+        )
+
+    @staticmethod
+    def _listing_position(
+        status: str, limit: Optional[int], after: Optional[str]
+    ) -> Optional[Tuple[Any, int]]:
+        """
+        Validate listing arguments and decode the page cursor
+
+        Args:
+            status: Task status to filter, or 'all'
+            limit: Maximum number of tasks to return
+            after: Cursor of the last task of the previous page
+
+        Returns:
+            (created_at, id) keyset position, or None to start from the top;
+            created_at is in microseconds since the epoch
+        """
         if status not in ["all", "todo", "in-progress", "done"]:
             raise ValueError(
                 "Invalid status: Use 'all', 'todo', 'in-progress' or 'done'"
             )
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be a positive number")
+
+        if not after:
+            return None
+        from src.utils.pagination import decode_cursor
+
+        created_at, task_id = decode_cursor(after)
+        try:
+            if isinstance(created_at, str):
+                # Cursor issued before timestamps were stored as integers
+                created_at = to_epoch_us(created_at)
+        except ValueError:
+            raise ValueError("Invalid cursor") from None
+        if not isinstance(created_at, int):
+            raise ValueError("Invalid cursor")
+        return created_at, task_id
+
+    @staticmethod
+    def _listing_window(
+        since: Optional[str], until: Optional[str], updated_since: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Parse the date filters of a listing
 
-        if status == "all":
-            return self.repository.find_all()
-        return self.repository.find_by_status(status)
+        Args:
+            since: Only tasks created at or after this time
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+
+        Returns:
+            The filters in microseconds since the epoch, None when not given
+        """
+        now = now_us()
+        return {
+            "since": parse_time(since, now) if since else None,
+            "until": parse_time(until, now) if until else None,
+            "updated_since": parse_time(updated_since, now) if updated_since else None,
+        }
+
+    def search_tasks(
+        self, query: str, status: Optional[str] = None, limit: int = 20
+    ) -> List[Task]:
+        """
+        Search task descriptions
+
+        Every word must appear in the description; a word ending in *
+        matches as a prefix (e.g. "groc*"). Results are ranked by
+        relevance.
+
+        Args:
+            query: Words to search for
+            status: Optional task status to filter by
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Matching tasks, best matches first
+        """
+        if status is not None and status not in ["todo", "in-progress", "done"]:
+            raise ValueError("Invalid status: Use 'todo', 'in-progress' or 'done'")
+        if limit < 1:
+            raise ValueError("Limit must be a positive number")
+
+        terms = []
+        for word in (query or "").split():
+            prefix = word.endswith("*")
+            word = word.rstrip("*")
+            if word:
+                quoted = '"' + word.replace('"', '""') + '"'
+                terms.append(quoted + "*" if prefix else quoted)
+        if not terms:
+            raise ValueError("Search query cannot be empty")
+
+        return self.repository.search(" ".join(terms), status, limit)
+
+    @staticmethod
+    def page_cursor(task: Task) -> str:
+        """
+        Cursor that continues a listing after the given task
+
+        Uses the stored creation time of listed tasks rather than parsing
+        created_at, which is ambiguous when clocks go back.
+
+        Args:
+            task: Last task of the current page
+
+        Returns:
+            Cursor to pass as after for the next page
+        """
+        from src.utils.pagination import encode_cursor
+
+        created_at = task.created_at_us
+        if created_at is None:
+            created_at = to_epoch_us(task.created_at)
+        return encode_cursor(created_at, task.id)
+
+    @staticmethod
+    def row_cursor(row: Tuple[Any, ...]) -> str:
+        """
+        Cursor that continues a listing after the given raw row
+
+        Args:
+            row: Last (id, description, status, created_at, updated_at) row
+                of the current page
+
+        Returns:
+            Cursor to pass as after for the next page
+        """
+        from src.utils.pagination import encode_cursor
+
+        return encode_cursor(row[3], row[0])
 
-    def update_task(self, task_id: int, new_description: str) -> Task:
+    def update_task(
+        self, task_id: int, new_description: str, expected_version: Optional[int] = None
+    ) -> Task:
         """
         Update task description
 
         Args:
             task_id: Task ID to update
             new_description: New task description
+            expected_version: Only update while the task has this version
 
         Returns:
             Updated task
+
+        Raises:
+            TaskNotFoundError: If no such task exists
+            TaskConflictError: If the task has another version than expected
         """
         if not new_description or not new_description.strip():
             raise ValueError("Description cannot be empty")
 
-        task = self.repository.find_by_id(task_id)
+        task = self.repository.modify_task(
+            task_id,
+            now_us(),
+            description=new_description.strip(),
+            expected_version=expected_version,
+        )
         if not task:
-            raise ValueError(f"Task with id {task_id} not found")
-
-        task.update_description(new_description.strip())
-        self.repository.update_task(task)
+            raise TaskNotFoundError(f"Task with id {task_id} not found")
         return task
 
     def delete_task(self, task_id: int) -> bool:
         """
         Delete task by id
 
+        Existence is decided by the DELETE itself, not by a lookup that
+        the identity map could answer for a task another process removed.
+
         Args:
             task_id: Task ID to delete
 
         Returns:
-            True if task was deleted, False otherwise
-        """
-        task = self.repository.find_by_id(task_id)
-
-        if not task:
-            raise ValueError(f"Task with id {task_id} not found")
+            True once the task was deleted
 
-        return self.repository.delete_task(task_id)
+        Raises:
+            TaskNotFoundError: If no such task exists
+        """
+        if not self.repository.delete_task(task_id):
+            raise TaskNotFoundError(f"Task with id {task_id} not found")
+        return True
 
-    def mark_task_todo(self, task_id: int) -> Task:
+    def mark_task_todo(
+        self, task_id: int, expected_version: Optional[int] = None
+    ) -> Task:
         """
         Mark task as todo
 
         Args:
             task_id: Task ID to mark as todo
+            expected_version: Only update while the task has this version
 
         Returns:
             Marked task
         """
-        task = self.repository.find_by_id(task_id)
-        if not task:
-            raise ValueError(f"Task with ID {task_id} not found")
-
-        task.update_status("todo")
-        self.repository.update_task(task)
-        return task
+        return self._mark_task(task_id, "todo", expected_version)
 
-    def mark_task_in_progress(self, task_id: int) -> Task:
+    def mark_task_in_progress(
+        self, task_id: int, expected_version: Optional[int] = None
+    ) -> Task:
         """
         Mark task as in progress
 
         Args:
             task_id: Task ID to mark as in progress
+            expected_version: Only update while the task has this version
 
         Returns:
             Marked task
         """
-        task = self.repository.find_by_id(task_id)
-        if not task:
-            raise ValueError(f"Task with ID {task_id} not found")
-
-        task.update_status("in-progress")
-        self.repository.update_task(task)
-        return task
+        return self._mark_task(task_id, "in-progress", expected_version)
 
-    def mark_task_done(self, task_id: int) -> Task:
+    def mark_task_done(
+        self, task_id: int, expected_version: Optional[int] = None
+    ) -> Task:
         """
         Mark task as done
 
         Args:
             task_id: Task ID to mark as done
+            expected_version: Only update while the task has this version
+
+        Returns:
+            Marked task
+        """
+        return self._mark_task(task_id, "done", expected_version)
+
+    def _mark_task(
+        self, task_id: int, status: str, expected_version: Optional[int]
+    ) -> Task:
+        """
+        Set the status of one task with a single conditional UPDATE
+
+        Args:
+            task_id: Task ID to change
+            status: New task status
+            expected_version: Only update while the task has this version
 
         Returns:
             Marked task
+
+        Raises:
+            TaskNotFoundError: If no such task exists
+            TaskConflictError: If the task has another version than expected
+        """
+        task = self.repository.modify_task(
+            task_id,
+            now_us(),
+            status=status,
+            expected_version=expected_version,
+        )
+        if not task:
+            raise TaskNotFoundError(f"Task with ID {task_id} not found")
+        return task
+
+    def patch_task(
+        self,
+        task_id: int,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Task:
+        """
+        Change the description and/or status of a task in one statement
+
+        Args:
+            task_id: Task ID to change
+            description: New description, or None to keep it
+            status: New status, or None to keep it
+            expected_version: Only update while the task has this version
+
+        Returns:
+            Changed task
+
+        Raises:
+            TaskNotFoundError: If no such task exists
+            TaskConflictError: If the task has another version than expected
         """
-        task = self.repository.find_by_id(task_id)
+        if description is None and status is None:
+            raise ValueError("Nothing to change: give a description or a status")
+        if description is not None:
+            if not description.strip():
+                raise ValueError("Description cannot be empty")
+            description = description.strip()
+        if status is not None and status not in ["todo", "in-progress", "done"]:
+            raise ValueError("Invalid status: Use 'todo', 'in-progress' or 'done'")
+
+        task = self.repository.modify_task(
+            task_id,
+            now_us(),
+            description=description,
+            status=status,
+            expected_version=expected_version,
+        )
         if not task:
-            raise ValueError(f"Task with ID {task_id} not found")
-        task.update_status("done")
-        self.repository.update_task(task)
+            raise TaskNotFoundError(f"Task with id {task_id} not found")
         return task
+
+    def mark_tasks_status(
+        self, task_ids: List[int], id_ranges: List[Tuple[int, int]], status: str
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Set the status of many tasks in one transaction
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+            status: New task status
+
+        Returns:
+            Number of tasks updated and the sorted, inclusive (first, last)
+            ranges of requested IDs that were not found
+        """
+        if status not in ["todo", "in-progress", "done"]:
+            raise ValueError("Invalid status: Use 'todo', 'in-progress' or 'done'")
+        self._check_id_bounds(task_ids, id_ranges)
+
+        updated = self.repository.update_status_many(
+            task_ids, id_ranges, status, now_us()
+        )
+        return len(set(updated)), self._missing_ranges(task_ids, id_ranges, updated)
+
+    def delete_tasks(
+        self, task_ids: List[int], id_ranges: List[Tuple[int, int]]
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Delete many tasks in one transaction
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+
+        Returns:
+            Number of tasks deleted and the sorted, inclusive (first, last)
+            ranges of requested IDs that were not found
+        """
+        self._check_id_bounds(task_ids, id_ranges)
+        deleted = self.repository.delete_many(task_ids, id_ranges)
+        return len(deleted), self._missing_ranges(task_ids, id_ranges, deleted)
+
+    @staticmethod
+    def _check_id_bounds(
+        task_ids: List[int], id_ranges: List[Tuple[int, int]]
+    ) -> None:
+        """
+        Reject IDs SQLite cannot store before they reach a query
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+        """
+        if max([*task_ids, *(last for _, last in id_ranges)], default=0) > MAX_TASK_ID:
+            raise ValueError(f"Task ID must be at most {MAX_TASK_ID}")
+
+    @staticmethod
+    def _missing_ranges(
+        task_ids: List[int], id_ranges: List[Tuple[int, int]], found: List[int]
+    ) -> List[Tuple[int, int]]:
+        """
+        Work out which requested IDs did not match a task
+
+        The requested IDs are merged into disjoint ranges and the gaps
+        between the sorted found IDs are read off them, so the cost grows
+        with the number of tasks found rather than the width of the ranges.
+
+        Args:
+            task_ids: Individual task IDs requested
+            id_ranges: Inclusive ID ranges requested
+            found: IDs that matched
+
+        Returns:
+            Sorted, inclusive (first, last) ranges of requested IDs that were
+            not found
+        """
+        requested: List[List[int]] = []
+        for first, last in sorted([*((i, i) for i in task_ids), *id_ranges]):
+            if requested and first <= requested[-1][1] + 1:
+                requested[-1][1] = max(requested[-1][1], last)
+            else:
+                requested.append([first, last])
+
+        found_ids = sorted(set(found))
+        missing = []
+        position = 0
+        for first, last in requested:
+            position = bisect_left(found_ids, first, position)
+            while position < len(found_ids) and found_ids[position] <= last:
+                if found_ids[position] > first:
+                    missing.append((first, found_ids[position] - 1))
+                first = found_ids[position] + 1
+                position += 1
+            if first <= last:
+                missing.append((first, last))
+        return missing
+
+    def archive_tasks(
+        self, older_than: str, batch_size: int = 1000, compact: bool = False
+    ) -> int:
+        """
+        Move done tasks not updated for a while out of the hot table
+
+        Archived tasks no longer appear in listings, lookups, search or
+        stats, but can still be listed with include_archived.
+
+        Args:
+            older_than: Duration such as "30d"; done tasks last updated
+                longer ago than this are archived
+            batch_size: Number of tasks moved per transaction
+            compact: First rebuild the database with incremental
+                auto-vacuum, for databases created without it
+
+        Returns:
+            Number of archived tasks
+        """
+        cutoff = now_us() - parse_duration(older_than)
+        if batch_size < 1:
+            raise ValueError("Batch size must be a positive number")
+        if compact:
+            self.repository.compact()
+        return len(self.repository.archive_done(cutoff, batch_size))
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of tasks per status, read from the maintained counters
+
+        Returns:
+            Counts for todo, in-progress and done, plus the total
+        """
+        stored = self.repository.count_by_status()
+        counts = {
+            status: stored.get(status, 0) for status in ["todo", "in-progress", "done"]
+        }
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def count_archived(self) -> int:
+        """
+        Number of tasks moved to the archive
+
+        Returns:
+            Number of archived tasks
+        """
+        return self.repository.count_archived()
+
+    def verify_counts(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Compare the maintained counters with a GROUP BY over all tasks
+
+        Returns:
+            (counter value, actual count) for each status that disagrees;
+            empty when the counters are consistent
+        """
+        stored = self.repository.count_by_status()
+        actual = self.repository.recount_by_status()
+        mismatches = {}
+        for status in ["todo", "in-progress", "done"]:
+            expected = actual.get(status, 0)
+            if stored.get(status, 0) != expected:
+                mismatches[status] = (stored.get(status, 0), expected)
+        return mismatches
+
+    def repair_counts(self) -> None:
+        """
+        Rebuild the maintained counters from the tasks table
+        """
+        self.repository.rebuild_counts()
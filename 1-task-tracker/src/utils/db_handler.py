@@ -1,60 +1,877 @@
+import heapq
+import random
 import sqlite3
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import nullcontext
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from src.models.task import Task
+from src.utils.group_commit import GroupCommitQueue, WriteOp
+from src.utils.timestamps import from_epoch_us, now_us, to_epoch_us
+
+if TYPE_CHECKING:
+    from src.utils.profiler import Profiler
+
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+MAX_QUERY_PARAMS = 900
+
+# Largest value of an INTEGER PRIMARY KEY (signed 64-bit)
+MAX_TASK_ID = 2**63 - 1
+
+# Relative database paths are resolved against this directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+# PRAGMA user_version of the current schema:
+# 0 - ISO 8601 text timestamps (or an empty database)
+# 1 - timestamps as integer microseconds since the epoch
+# 2 - tasks_archive table for archived done tasks
+# 3 - version column, incremented by every update
+SCHEMA_VERSION = 3
+
+TASKS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        description TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'todo',
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1,
+        CHECK (status IN ('todo', 'in-progress', 'done'))
+    )
+"""
+
+# Indexes each inserted task for search; save_tasks indexes in bulk instead
+FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, description)
+        VALUES (new.id, new.description);
+    END
+"""
+
+# Counts each inserted task; save_tasks adds whole batches instead
+COUNTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS task_counts_insert AFTER INSERT ON tasks
+    BEGIN
+        UPDATE task_counts SET count = count + 1 WHERE status = new.status;
+    END
+"""
+
+# Listing order of task rows: created_at, then id
+LISTING_KEY = itemgetter(3, 0)
+
+# Primary result codes meaning another connection holds a conflicting lock
+BUSY_CODES = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+class DatabaseBusyError(ValueError):
+    """The write lock could not be taken within the busy timeout and retries"""
+
+
+class TaskConflictError(ValueError):
+    """A task changed since the version the caller based its update on"""
+
+    def __init__(self, task_id: int, expected: int, current: int):
+        super().__init__(
+            f"Task with ID {task_id} was changed by another writer "
+            f"(version {current}, expected {expected})"
+        )
+        self.task_id = task_id
+        self.expected = expected
+        self.current = current
 
 
 class DBHandler:
-    def __init__(self, db_path: str = "tasks.db"):
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        data_dir = os.path.join(base_dir, "data")
-        os.makedirs(data_dir, exist_ok=True)
-        self.db_path = os.path.join(data_dir, db_path)
-        self._initialize_database()
+    """
+    SQLite access layer.
+
+    Keeps one long-lived, tuned connection per thread instead of opening a
+    new connection for every call. Connections are created on first use
+    and released by close(). The schema is created lazily when the first
+    connection is opened, so constructing a handler never touches disk.
+
+    Timestamps are stored as integer microseconds since the epoch. Methods
+    returning dictionaries convert them back to ISO 8601 strings; row
+    tuples (iter_tasks, search_tasks) carry the integers and are converted
+    by Task.from_row or the output formatter.
+
+    Every write goes through _execute_write. By default each write commits
+    on its own; with group_commit=True writes are handed to a
+    GroupCommitQueue and committed together, which multiplies write
+    throughput when many threads write at once.
+
+    Connections run in autocommit mode and write transactions are opened
+    explicitly with BEGIN IMMEDIATE, so a writer takes the write lock up
+    front instead of failing when it upgrades a read transaction that
+    another process has invalidated. Waiting for the lock is bounded by the
+    busy timeout plus a few retries with jittered backoff.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "tasks.db",
+        cache_size_kb: int = 8192,
+        mmap_size: int = 64 * 1024 * 1024,
+        group_commit: bool = False,
+        commit_batch_size: int = 128,
+        commit_delay_ms: float = 2.0,
+        profiler: Optional["Profiler"] = None,
+        busy_timeout_ms: int = 5000,
+        write_retries: int = 4,
+        retry_backoff_ms: float = 25.0,
+    ):
+        """
+        Args:
+            db_path: Database file name inside the data directory (or a path
+                below it), or an absolute path
+            cache_size_kb: SQLite page cache size per connection
+            mmap_size: Bytes of the database file to memory-map
+            group_commit: Commit writes in groups on a background thread
+            commit_batch_size: Maximum number of writes per group commit
+            commit_delay_ms: How long a group commit waits for more writes
+            profiler: Time every statement and trace what SQLite runs
+            busy_timeout_ms: How long SQLite waits for a lock held by
+                another connection before giving up
+            write_retries: How many more times a write retries taking the
+                write lock after the busy timeout ran out
+            retry_backoff_ms: Upper bound of the first retry delay, doubled
+                for every further retry
+        """
+        self.db_path = os.path.join(DATA_DIR, db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.group_commit = group_commit
+        self.commit_batch_size = commit_batch_size
+        self.commit_delay_ms = commit_delay_ms
+        self._write_queue: Optional[GroupCommitQueue] = None
+        self.profiler = profiler
+        self.busy_timeout_ms = busy_timeout_ms
+        self.write_retries = write_retries
+        self.retry_backoff_ms = retry_backoff_ms
+        self._write_stats = {"transactions": 0, "busy_retries": 0, "lock_wait_ms": 0.0}
+        # Separate from _lock, which is held while the schema is created
+        self._stats_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open and tune a new connection
+
+        Returns:
+            Configured SQLite connection
+        """
+        options: Dict[str, Any] = {
+            "check_same_thread": False,
+            "isolation_level": None,
+            "timeout": self.busy_timeout_ms / 1000,
+        }
+        if self.profiler is None:
+            conn = sqlite3.connect(self.db_path, **options)
+        else:
+            from src.utils.profiler import ProfiledConnection
+
+            conn = sqlite3.connect(self.db_path, factory=ProfiledConnection, **options)
+            conn.profiler = self.profiler
+            conn.set_trace_callback(self.profiler.trace)
+        # Only takes effect on a new database, and must precede the switch
+        # to WAL, which writes the database header. Both read the header
+        # and can find it locked while other processes open the database.
+        self._execute_when_free(conn, "PRAGMA auto_vacuum = INCREMENTAL")
+        self._execute_when_free(conn, "PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get the connection owned by the current thread, opening it if needed
+
+        Returns:
+            SQLite connection for the current thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            timer = self.profiler.phase("db init") if self.profiler else nullcontext()
+            # Connections are opened under the lock so no thread switches
+            # journal mode while the first one is creating the schema
+            with timer, self._lock:
+                conn = self._connect()
+                self._local.conn = conn
+                self._connections.append(conn)
+                if not self._initialized:
+                    self._initialize_database(conn)
+                    self._initialized = True
+        return conn
 
-    def _initialize_database(self):
+    def close(self) -> None:
         """
-        Initialize the database
+        Close every connection opened by this handler, after committing
+        any queued group-commit writes
+        """
+        with self._lock:
+            write_queue, self._write_queue = self._write_queue, None
+            connections, self._connections = self._connections, []
+        if write_queue is not None:
+            write_queue.close()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _initialize_database(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the schema, migrating an older database to SCHEMA_VERSION
+
+        A database already at SCHEMA_VERSION is left alone, so opening it
+        costs one PRAGMA instead of every CREATE ... IF NOT EXISTS.
+
+        Args:
+            conn: Connection to create the schema with
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with conn:
+            # Create or migrate in one transaction, so a concurrent process
+            # never sees a half-migrated table
+            self._begin_immediate(conn)
+            column_type = conn.execute(
+                """
+                    SELECT type FROM pragma_table_info('tasks')
+                    WHERE name = 'created_at'
+                    """
+            ).fetchone()
+            if column_type is not None and column_type[0].upper() == "TEXT":
+                self._migrate_timestamps(conn)
+            elif column_type is not None and not conn.execute(
+                "SELECT 1 FROM pragma_table_info('tasks') WHERE name = 'version'"
+            ).fetchone():
+                # Adding a column with a default rewrites no rows
+                conn.execute(
+                    """
+                        ALTER TABLE tasks
+                        ADD COLUMN version INTEGER NOT NULL DEFAULT 1
+                        """
+                )
+            conn.execute(TASKS_TABLE.format(name="tasks"))
+            self._initialize_indexes(conn)
+            self._initialize_search_index(conn)
+            self._initialize_status_counts(conn)
+            self._initialize_archive(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def _initialize_indexes(conn: sqlite3.Connection) -> None:
+        """
+        Create the indexes behind listing order and date-range filters
+
+        Args:
+            conn: Connection to create the indexes with
+        """
+        conn.execute(
+            """
+                CREATE INDEX IF NOT EXISTS idx_tasks_created_at
+                ON tasks (created_at)
+                """
+        )
+        conn.execute(
+            """
+                CREATE INDEX IF NOT EXISTS idx_tasks_status_created_at
+                ON tasks (status, created_at)
+                """
+        )
+        conn.execute(
+            """
+                CREATE INDEX IF NOT EXISTS idx_tasks_updated_at
+                ON tasks (updated_at)
+                """
+        )
+
+    @staticmethod
+    def _initialize_archive(conn: sqlite3.Connection) -> None:
+        """
+        Create the archive table that archive_done_tasks moves done tasks to
+
+        Archived tasks keep their ID and timestamps; AUTOINCREMENT on tasks
+        guarantees their IDs are never handed out again.
+
+        Args:
+            conn: Connection to create the table with
         """
-        conn = sqlite3.connect(self.db_path)
         conn.execute(
             """
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                CREATE TABLE IF NOT EXISTS tasks_archive (
+                    id INTEGER PRIMARY KEY,
                     description TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'todo',
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    CHECK (status IN ('todo', 'in-progress', 'done'))
+                    status TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    archived_at INTEGER NOT NULL
                 )
                 """
         )
-        conn.commit()
-        conn.close()
+        conn.execute(
+            """
+                CREATE INDEX IF NOT EXISTS idx_tasks_archive_created_at
+                ON tasks_archive (created_at)
+                """
+        )
+        conn.execute(
+            """
+                CREATE INDEX IF NOT EXISTS idx_tasks_archive_updated_at
+                ON tasks_archive (updated_at)
+                """
+        )
+
+    @staticmethod
+    def _migrate_timestamps(conn: sqlite3.Connection) -> None:
+        """
+        Rebuild a version 0 tasks table with integer timestamps
+
+        SQLite cannot change a column's type in place, so the rows are
+        copied into a new table with converted timestamps, which then
+        replaces the old one. IDs and the AUTOINCREMENT high-water mark are
+        kept, so the search index and counters stay valid; the triggers
+        and indexes dropped with the old table are re-created by the
+        caller.
 
-    def save_task(self, task: "Task") -> None:
+        Args:
+            conn: Connection inside the caller's transaction
+        """
+        sequence = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+        ).fetchone()
+        for trigger in (
+            "tasks_fts_insert",
+            "tasks_fts_delete",
+            "tasks_fts_update",
+            "task_counts_insert",
+            "task_counts_delete",
+            "task_counts_update",
+        ):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        conn.create_function("epoch_us", 1, to_epoch_us, deterministic=True)
+        try:
+            conn.execute(TASKS_TABLE.format(name="tasks_migrated"))
+            conn.execute(
+                """
+                    INSERT INTO tasks_migrated
+                        (id, description, status, created_at, updated_at)
+                    SELECT id, description, status,
+                           epoch_us(created_at), epoch_us(updated_at)
+                    FROM tasks
+                    """
+            )
+        finally:
+            conn.create_function("epoch_us", 1, None)
+        conn.execute("DROP TABLE tasks")
+        conn.execute("ALTER TABLE tasks_migrated RENAME TO tasks")
+        if sequence is not None:
+            conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tasks'",
+                sequence,
+            )
+
+    @staticmethod
+    def _initialize_search_index(conn: sqlite3.Connection) -> None:
+        """
+        Create the FTS5 index over task descriptions and its sync triggers
+
+        tasks_fts is an external-content table: it stores only the index
+        and reads descriptions from tasks. Triggers keep it in step with
+        every insert, delete and description change. When the index is
+        added to an existing database it is rebuilt from the current rows.
+
+        Args:
+            conn: Connection to create the index with
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ).fetchone()
+        conn.execute(
+            """
+                CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                    description,
+                    content = 'tasks',
+                    content_rowid = 'id',
+                    prefix = '2 3'
+                )
+                """
+        )
+        conn.execute(FTS_INSERT_TRIGGER)
+        conn.execute(
+            """
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks
+                BEGIN
+                    INSERT INTO tasks_fts (tasks_fts, rowid, description)
+                    VALUES ('delete', old.id, old.description);
+                END
+                """
+        )
+        conn.execute(
+            """
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+                AFTER UPDATE OF description ON tasks
+                BEGIN
+                    INSERT INTO tasks_fts (tasks_fts, rowid, description)
+                    VALUES ('delete', old.id, old.description);
+                    INSERT INTO tasks_fts (rowid, description)
+                    VALUES (new.id, new.description);
+                END
+                """
+        )
+        if not exists:
+            conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+    @staticmethod
+    def _initialize_status_counts(conn: sqlite3.Connection) -> None:
+        """
+        Create the per-status counters table and the triggers that keep it
+        current
+
+        task_counts holds one row per status, adjusted by triggers on every
+        insert, delete and status change, so totals are read in O(1). When
+        the table is first added it is seeded from the existing rows.
+
+        Args:
+            conn: Connection to create the table with
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_counts'"
+        ).fetchone()
+        conn.execute(
+            """
+                CREATE TABLE IF NOT EXISTS task_counts (
+                    status TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+                """
+        )
+        conn.execute(COUNTS_INSERT_TRIGGER)
+        conn.execute(
+            """
+                CREATE TRIGGER IF NOT EXISTS task_counts_delete AFTER DELETE ON tasks
+                BEGIN
+                    UPDATE task_counts SET count = count - 1 WHERE status = old.status;
+                END
+                """
+        )
+        conn.execute(
+            """
+                CREATE TRIGGER IF NOT EXISTS task_counts_update
+                AFTER UPDATE OF status ON tasks
+                WHEN old.status <> new.status
+                BEGIN
+                    UPDATE task_counts SET count = count - 1 WHERE status = old.status;
+                    UPDATE task_counts SET count = count + 1 WHERE status = new.status;
+                END
+                """
+        )
+        if not exists:
+            conn.execute(
+                """
+                    INSERT INTO task_counts (status, count)
+                    VALUES ('todo', 0), ('in-progress', 0), ('done', 0)
+                    """
+            )
+            DBHandler._recount_statuses(conn)
+
+    @staticmethod
+    def _recount_statuses(conn: sqlite3.Connection) -> None:
+        """
+        Reset every counter from a full GROUP BY over tasks
+
+        Args:
+            conn: Connection inside the caller's transaction
+        """
+        conn.execute(
+            """
+                UPDATE task_counts
+                SET count = (
+                    SELECT COUNT(*) FROM tasks WHERE tasks.status = task_counts.status
+                )
+                """
+        )
+
+    def _execute_write(self, op: WriteOp) -> Any:
+        """
+        Run a write operation in a transaction and wait for its commit
+
+        Args:
+            op: Statements to run on a connection
+
+        Returns:
+            The result of op
+        """
+        if self.group_commit:
+            return self._submit_write(op).result()
+        conn = self._get_connection()
+        self._begin_immediate(conn)
+        try:
+            result = op(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def _begin_immediate(self, conn: sqlite3.Connection) -> None:
+        """
+        Open a write transaction, waiting for the write lock
+
+        Only BEGIN is retried: once the lock is held the operation itself
+        runs exactly once.
+
+        Args:
+            conn: Connection in autocommit mode
+
+        Raises:
+            DatabaseBusyError: If the lock could not be taken
+        """
+        started = time.perf_counter()
+        retries = 0
+        try:
+            retries = self._execute_when_free(conn, "BEGIN IMMEDIATE")
+        except DatabaseBusyError:
+            retries = self.write_retries
+            raise
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self._write_stats["transactions"] += 1
+                self._write_stats["busy_retries"] += retries
+                self._write_stats["lock_wait_ms"] += waited
+
+    def _execute_when_free(self, conn: sqlite3.Connection, sql: str) -> int:
+        """
+        Run a statement that needs a lock another connection may hold
+
+        SQLite's busy handler already waits up to busy_timeout_ms. If the
+        lock is still taken after that, or SQLite reports a conflict without
+        waiting, the statement is retried up to write_retries times after a
+        random delay below an exponentially growing bound, so processes
+        that collided do not all wake up together.
+
+        Args:
+            conn: Connection to run the statement on
+            sql: Statement without side effects when it fails
+
+        Returns:
+            Number of retries needed
+
+        Raises:
+            DatabaseBusyError: If the lock could not be taken
+        """
+        retries = 0
+        while True:
+            try:
+                conn.execute(sql)
+                return retries
+            except sqlite3.OperationalError as e:
+                if e.sqlite_errorcode & 0xFF not in BUSY_CODES:
+                    raise
+                if retries >= self.write_retries:
+                    raise DatabaseBusyError(
+                        "Database is busy: another process is writing, try again"
+                    ) from e
+                bound = self.retry_backoff_ms * 2**retries / 1000
+                retries += 1
+                time.sleep(random.uniform(0, bound))
+
+    def write_stats(self) -> Dict[str, Any]:
+        """
+        Report how long writes waited for the write lock
+
+        Returns:
+            Number of write transactions begun, busy retries and the total
+            time spent waiting for the lock in milliseconds
+        """
+        with self._stats_lock:
+            return dict(self._write_stats)
+
+    def _submit_write(self, op: WriteOp) -> Future:
+        """
+        Start a write operation without waiting for its commit
+
+        Without group commit the operation runs and commits immediately and
+        the returned future is already resolved.
+
+        Args:
+            op: Statements to run on a connection
+
+        Returns:
+            Future resolved with the result of op once it is committed
+        """
+        if not self.group_commit:
+            future: Future = Future()
+            try:
+                future.set_result(self._execute_write(op))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        write_queue = self._write_queue
+        if write_queue is None or not write_queue.running:
+            self._get_connection()  # make sure the schema exists
+            with self._lock:
+                # A writer that stopped on an error is replaced, so a
+                # database that was briefly locked does not fail every
+                # later write
+                if self._write_queue is None or not self._write_queue.running:
+                    self._write_queue = GroupCommitQueue(
+                        self._connect,
+                        self.commit_batch_size,
+                        self.commit_delay_ms,
+                        begin=self._begin_immediate,
+                    )
+                write_queue = self._write_queue
+        return write_queue.submit(op)
+
+    def group_commit_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Report how writes were grouped since the queue was started
+
+        Returns:
+            Commit, write and largest group counts, or None if no group
+            commit queue is running
+        """
+        write_queue = self._write_queue
+        return write_queue.stats() if write_queue is not None else None
+
+    @staticmethod
+    def _insert_op(task: "Task") -> WriteOp:
+        """
+        Build the write operation inserting one task
+
+        Args:
+            task: Task to insert
+
+        Returns:
+            Operation returning the ID assigned by SQLite
+        """
+        row = (
+            task.description,
+            task.status,
+            to_epoch_us(task.created_at),
+            to_epoch_us(task.updated_at),
+        )
+
+        def insert(conn: sqlite3.Connection) -> int:
+            return conn.execute(
+                """
+                    INSERT INTO tasks (description, status, created_at, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                row,
+            ).lastrowid
+
+        return insert
+
+    @staticmethod
+    def _update_op(task: "Task") -> WriteOp:
+        """
+        Build the write operation updating one task
+
+        If the task carries a version, the update only applies while the
+        stored row still has that version.
+
+        Args:
+            task: Task to update
+
+        Returns:
+            Operation returning the new version, or None if the task does
+            not exist
+        """
+        row = (
+            task.description,
+            task.status,
+            to_epoch_us(task.updated_at),
+            task.id,
+            task.version,
+        )
+
+        def update(conn: sqlite3.Connection) -> Optional[int]:
+            updated = conn.execute(
+                """
+                    UPDATE tasks
+                    SET description = ?1, status = ?2, updated_at = ?3,
+                        version = version + 1
+                    WHERE id = ?4 AND (?5 IS NULL OR version = ?5)
+                    RETURNING version
+                    """,
+                row,
+            ).fetchone()
+            if updated is None:
+                DBHandler._check_version(conn, task.id, task.version)
+                return None
+            return updated[0]
+
+        return update
+
+    @staticmethod
+    def _check_version(
+        conn: sqlite3.Connection, task_id: int, expected_version: Optional[int]
+    ) -> None:
+        """
+        Explain why a versioned update matched no row
+
+        Args:
+            conn: Connection inside the update's transaction
+            task_id: Task ID the update was for
+            expected_version: Version the update required, or None
+
+        Raises:
+            TaskConflictError: If the task exists with another version
+        """
+        if expected_version is None:
+            return
+        current = conn.execute(
+            "SELECT version FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if current is not None:
+            raise TaskConflictError(task_id, expected_version, current[0])
+
+    def submit_save_task(self, task: "Task") -> Future:
+        """
+        Save a task without waiting for the commit
+
+        Args:
+            task: Task to save
+
+        Returns:
+            Future resolved with the ID assigned by SQLite once durable
+        """
+        return self._submit_write(self._insert_op(task))
+
+    def submit_update_task(self, task: "Task") -> Future:
+        """
+        Update a task without waiting for the commit
+
+        Args:
+            task: Task to update
+
+        Returns:
+            Future resolved with the new version (None if the task does not
+            exist) once the update is durable; it fails with
+            TaskConflictError if the task's version is outdated
+        """
+        return self._submit_write(self._update_op(task))
+
+    def save_task(self, task: "Task") -> int:
         """
         Save a task to the database
 
         Args:
             task: Task to save
+
+        Returns:
+            ID assigned to the task by SQLite
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-                INSERT INTO tasks (description, status, created_at, updated_at)
-                VALUES (?, ?, ?, ?)
-                """,
+        return self._execute_write(self._insert_op(task))
+
+    def save_tasks(self, tasks: Iterable["Task"], batch_size: int = 10000) -> int:
+        """
+        Save many tasks in a single transaction
+
+        The tasks are consumed lazily and inserted with executemany in
+        batches, so arbitrarily large iterables use bounded memory. If
+        anything fails the whole import is rolled back.
+
+        The per-row search index and status counter triggers are dropped
+        for the duration of the transaction. Each batch is instead added
+        to tasks_fts with one INSERT ... SELECT over the IDs it was given
+        and to task_counts with one UPDATE per status, which makes imports
+        several times faster. Nobody else can insert while the write lock
+        is held, and a rollback restores the triggers with everything else.
+
+        Args:
+            tasks: Tasks to save
+            batch_size: Number of rows sent per executemany call
+
+        Returns:
+            Number of tasks saved
+        """
+        rows = (
             (
                 task.description,
                 task.status,
-                task.created_at,
-                task.updated_at,
-            ),
+                to_epoch_us(task.created_at),
+                to_epoch_us(task.updated_at),
+            )
+            for task in tasks
         )
-        conn.commit()
-        conn.close()
+
+        def last_id(conn: sqlite3.Connection) -> int:
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+            ).fetchone()
+            return row[0] if row else 0
+
+        def insert_all(conn: sqlite3.Connection) -> int:
+            count = 0
+            indexed = last_id(conn)
+            conn.execute("DROP TRIGGER IF EXISTS tasks_fts_insert")
+            conn.execute("DROP TRIGGER IF EXISTS task_counts_insert")
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    conn.execute(FTS_INSERT_TRIGGER)
+                    conn.execute(COUNTS_INSERT_TRIGGER)
+                    return count
+                conn.executemany(
+                    """
+                        INSERT INTO tasks (description, status, created_at, updated_at)
+                        VALUES (?, ?, ?, ?)
+                        """,
+                    batch,
+                )
+                conn.execute(
+                    """
+                        INSERT INTO tasks_fts (rowid, description)
+                        SELECT id, description FROM tasks WHERE id > ?
+                        """,
+                    (indexed,),
+                )
+                conn.executemany(
+                    "UPDATE task_counts SET count = count + ? WHERE status = ?",
+                    [
+                        (added, status)
+                        for status, added in Counter(row[1] for row in batch).items()
+                    ],
+                )
+                indexed = last_id(conn)
+                count += len(batch)
+
+        return self._execute_write(insert_all)
+
+    def get_next_id(self) -> int:
+        """
+        Get the ID AUTOINCREMENT will hand out next
+
+        Advisory only: another writer may claim it first. Inserts should
+        rely on the ID returned by save_task instead.
+
+        Returns:
+            Next task ID
+        """
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+        ).fetchone()
+        return (row[0] if row else 0) + 1
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
         """
@@ -63,39 +880,305 @@ class DBHandler:
         Returns:
             List of all tasks
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute(
+        conn = self._get_connection()
+        cursor = conn.execute(
             """
-                SELECT id, description, status, created_at, updated_at
+                SELECT id, description, status, created_at, updated_at, version
                 FROM tasks
-                ORDER BY created_at DESC
+                ORDER BY created_at DESC, id DESC
                 """
         )
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return [self._task_dict(row) for row in cursor.fetchall()]
 
-    def update_task(self, task: "Task") -> None:
+    @staticmethod
+    def _task_dict(row: Tuple[Any, ...]) -> Dict[str, Any]:
         """
-        Update a task in the database
+        Turn a task row into a dictionary with ISO 8601 timestamps
 
         Args:
-            task: Task to update
+            row: (id, description, status, created_at, updated_at, version)
+
+        Returns:
+            Task data
+        """
+        return {
+            "id": row[0],
+            "description": row[1],
+            "status": row[2],
+            "created_at": from_epoch_us(row[3]),
+            "updated_at": from_epoch_us(row[4]),
+            "version": row[5],
+        }
+
+    def iter_tasks(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        batch_size: int = 1000,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        updated_since: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream tasks newest first without materialising the result set
+
+        Rows are fetched batch_size at a time and yielded as plain tuples
+        in (id, description, status, created_at, updated_at) order, with
+        timestamps in microseconds since the epoch. Pagination is keyset
+        based: after is the (created_at, id) of the last row of the
+        previous page, so every page is an index range scan regardless of
+        how deep it is. The date filters are range scans on the created_at
+        and updated_at indexes.
+
+        With include_archived the archive table is read the same way and
+        the two ordered streams are merged, so archived tasks cost nothing
+        unless asked for.
+
+        Args:
+            status: Optional task status to filter by
+            limit: Maximum number of rows to return
+            after: Optional (created_at, id) to resume after
+            batch_size: Number of rows fetched per round trip
+            since: Only tasks created at or after this time
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+            include_archived: Also list archived tasks
+
+        Returns:
+            Iterator yielding one row tuple per task
+        """
+        window = (since, until, updated_since)
+        rows = self._iter_table("tasks", status, limit, after, batch_size, *window)
+        if not include_archived or status not in (None, "done"):
+            return rows
+        archived = self._iter_table(
+            "tasks_archive", status, limit, after, batch_size, *window
+        )
+        merged = heapq.merge(rows, archived, key=LISTING_KEY, reverse=True)
+        return islice(merged, limit)
+
+    def _iter_table(
+        self,
+        table: str,
+        status: Optional[str],
+        limit: Optional[int],
+        after: Optional[Tuple[int, int]],
+        batch_size: int,
+        since: Optional[int],
+        until: Optional[int],
+        updated_since: Optional[int],
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream the rows of tasks or tasks_archive for iter_tasks
+
+        Args:
+            table: tasks or tasks_archive
+            status: Optional task status to filter by
+            limit: Maximum number of rows to return
+            after: Optional (created_at, id) to resume after
+            batch_size: Number of rows fetched per round trip
+            since: Only tasks created at or after this time
+            until: Only tasks created before this time
+            updated_since: Only tasks updated at or after this time
+
+        Yields:
+            One row tuple per task, newest first
+        """
+        conditions = []
+        params: List[Any] = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        if updated_since is not None:
+            conditions.append("updated_at >= ?")
+            params.append(updated_since)
+        if after is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+
+        query = f"SELECT id, description, status, created_at, updated_at FROM {table}"
+        if updated_since is not None and since is None and until is None:
+            # Without statistics the planner prefers walking the created_at
+            # index in listing order, which reads the whole table to find a
+            # few recent updates; the updated_at range is the small side.
+            query += f" INDEXED BY idx_{table}_updated_at"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        conn = self._get_connection()
+        cursor = conn.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def search_tasks(
+        self, match_query: str, status: Optional[str] = None, limit: int = 20
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Full-text search over task descriptions, best matches first
+
+        Args:
+            match_query: FTS5 MATCH expression
+            status: Optional task status to filter by
+            limit: Maximum number of rows to return
+
+        Returns:
+            Row tuples in (id, description, status, created_at, updated_at) order
+        """
+        query = """
+            SELECT t.id, t.description, t.status, t.created_at, t.updated_at
+            FROM tasks_fts
+            JOIN tasks AS t ON t.id = tasks_fts.rowid
+            WHERE tasks_fts MATCH ?
+            """
+        params: List[Any] = [match_query]
+        if status is not None:
+            query += " AND t.status = ?"
+            params.append(status)
+        query += " ORDER BY tasks_fts.rank LIMIT ?"
+        params.append(limit)
+
+        conn = self._get_connection()
+        return conn.execute(query, params).fetchall()
+
+    def get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a single task by its primary key
+
+        Args:
+            task_id: Task ID to look up
+
+        Returns:
+            Task data or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        conn = self._get_connection()
+        cursor = conn.execute(
             """
-                UPDATE tasks
-                SET description = ?, status = ?, updated_at = ?
+                SELECT id, description, status, created_at, updated_at, version
+                FROM tasks
                 WHERE id = ?
                 """,
-            (task.description, task.status, task.updated_at, task.id),
+            (task_id,),
         )
-        conn.commit()
-        conn.close()
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self._task_dict(row)
+
+    def get_tasks_by_ids(self, task_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get several tasks by primary key
+
+        Args:
+            task_ids: Task IDs to look up
+
+        Returns:
+            Data of the tasks that exist, in no particular order
+        """
+        conn = self._get_connection()
+        ids = list(dict.fromkeys(task_ids))
+        tasks = []
+        for start in range(0, len(ids), MAX_QUERY_PARAMS):
+            chunk = ids[start : start + MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"""
+                    SELECT id, description, status, created_at, updated_at, version
+                    FROM tasks
+                    WHERE id IN ({placeholders})
+                    """,
+                chunk,
+            )
+            tasks.extend(self._task_dict(row) for row in cursor.fetchall())
+        return tasks
+
+    def update_task(self, task: "Task") -> Optional[int]:
+        """
+        Update a task in the database
+
+        Args:
+            task: Task to update
+
+        Returns:
+            The new version, or None if the task does not exist
+
+        Raises:
+            TaskConflictError: If the task's version is outdated
+        """
+        return self._execute_write(self._update_op(task))
+
+    def modify_task(
+        self,
+        task_id: int,
+        updated_at: int,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Tuple[Any, ...]]:
+        """
+        Change some fields of a task in a single UPDATE ... RETURNING
+
+        Only the given fields are written, so a status change leaves the
+        search index alone and cannot overwrite a description another
+        writer has just changed.
+
+        Args:
+            task_id: Task ID to change
+            updated_at: New update time in microseconds since the epoch
+            description: New description, or None to keep it
+            status: New status, or None to keep it
+            expected_version: Only apply the change while the task has this
+                version
+
+        Returns:
+            The changed row (id, description, status, created_at,
+            updated_at, version), or None if the task does not exist
+
+        Raises:
+            TaskConflictError: If the task has another version than expected
+        """
+        assignments = ["updated_at = ?", "version = version + 1"]
+        params: List[Any] = [updated_at]
+        for column, value in (("description", description), ("status", status)):
+            if value is not None:
+                assignments.append(f"{column} = ?")
+                params.append(value)
+        where = "id = ?"
+        params.append(task_id)
+        if expected_version is not None:
+            where += " AND version = ?"
+            params.append(expected_version)
+        sql = f"""
+            UPDATE tasks
+            SET {", ".join(assignments)}
+            WHERE {where}
+            RETURNING id, description, status, created_at, updated_at, version
+        """
+
+        def modify(conn: sqlite3.Connection) -> Optional[Tuple[Any, ...]]:
+            row = conn.execute(sql, params).fetchone()
+            if row is None:
+                self._check_version(conn, task_id, expected_version)
+            return row
+
+        return self._execute_write(modify)
 
     def delete_task(self, task_id: int) -> bool:
         """
@@ -107,10 +1190,209 @@ class DBHandler:
         Returns:
             True if task was deleted, False otherwise
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        conn.commit()
-        result = cursor.rowcount > 0
-        conn.close()
-        return result
+
+        def delete(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            return cursor.rowcount > 0
+
+        return self._execute_write(delete)
+
+    @staticmethod
+    def _id_filters(
+        task_ids: Iterable[int], id_ranges: Iterable[Tuple[int, int]]
+    ) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Split an ID selection into WHERE clauses of bounded size
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+
+        Yields:
+            (where clause, parameters) pairs covering the whole selection
+        """
+        ids = list(dict.fromkeys(task_ids))
+        for start in range(0, len(ids), MAX_QUERY_PARAMS):
+            chunk = ids[start : start + MAX_QUERY_PARAMS]
+            yield f"id IN ({', '.join('?' * len(chunk))})", chunk
+        for first, last in id_ranges:
+            yield "id BETWEEN ? AND ?", [first, last]
+
+    def update_status_many(
+        self,
+        task_ids: Iterable[int],
+        id_ranges: Iterable[Tuple[int, int]],
+        status: str,
+        updated_at: int,
+    ) -> List[int]:
+        """
+        Set the status of many tasks in a single transaction
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+            status: New task status
+            updated_at: New update time in microseconds since the epoch
+
+        Returns:
+            IDs of the tasks that were updated
+        """
+        filters = list(self._id_filters(task_ids, id_ranges))
+
+        def update(conn: sqlite3.Connection) -> List[int]:
+            updated = []
+            for where, params in filters:
+                cursor = conn.execute(
+                    f"""
+                        UPDATE tasks
+                        SET status = ?, updated_at = ?, version = version + 1
+                        WHERE {where}
+                        RETURNING id
+                        """,
+                    [status, updated_at, *params],
+                )
+                updated.extend(row[0] for row in cursor.fetchall())
+            return updated
+
+        return self._execute_write(update)
+
+    def delete_many(
+        self, task_ids: Iterable[int], id_ranges: Iterable[Tuple[int, int]]
+    ) -> List[int]:
+        """
+        Delete many tasks in a single transaction
+
+        Args:
+            task_ids: Individual task IDs
+            id_ranges: Inclusive (first, last) ID ranges
+
+        Returns:
+            IDs of the tasks that were deleted
+        """
+        filters = list(self._id_filters(task_ids, id_ranges))
+
+        def delete(conn: sqlite3.Connection) -> List[int]:
+            deleted = []
+            for where, params in filters:
+                cursor = conn.execute(
+                    f"DELETE FROM tasks WHERE {where} RETURNING id", params
+                )
+                deleted.extend(row[0] for row in cursor.fetchall())
+            return deleted
+
+        return self._execute_write(delete)
+
+    def archive_done_tasks(self, cutoff: int, batch_size: int = 1000) -> List[int]:
+        """
+        Move done tasks last updated before cutoff into tasks_archive
+
+        Rows are moved in ID order, batch_size per transaction, so other
+        writers are never blocked for long; afterwards the freed pages are
+        returned to the file system by an incremental vacuum.
+
+        Args:
+            cutoff: Archive tasks updated before this time (epoch microseconds)
+            batch_size: Number of tasks moved per transaction
+
+        Returns:
+            IDs of the archived tasks
+        """
+        archived_at = now_us()
+        # Walk the rowid range from the last batch on; the status index
+        # would make every batch sort all done tasks again
+        selection = """
+            SELECT id FROM tasks NOT INDEXED
+            WHERE status = 'done' AND updated_at < ? AND id > ?
+            ORDER BY id LIMIT ?
+        """
+        archived: List[int] = []
+        last_id = 0
+
+        def move(conn: sqlite3.Connection) -> List[int]:
+            window = (cutoff, last_id, batch_size)
+            conn.execute(
+                f"""
+                    INSERT INTO tasks_archive
+                        (id, description, status, created_at, updated_at, archived_at)
+                    SELECT id, description, status, created_at, updated_at, ?
+                    FROM tasks WHERE id IN ({selection})
+                    """,
+                (archived_at, *window),
+            )
+            cursor = conn.execute(
+                f"DELETE FROM tasks WHERE id IN ({selection}) RETURNING id", window
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+        while True:
+            moved = self._execute_write(move)
+            archived.extend(moved)
+            if len(moved) < batch_size:
+                break
+            last_id = max(moved)
+
+        if archived:
+            self._execute_write(
+                lambda conn: conn.execute("PRAGMA incremental_vacuum").fetchall()
+            )
+        return archived
+
+    def count_archived(self) -> int:
+        """
+        Count the tasks in the archive table
+
+        Returns:
+            Number of archived tasks
+        """
+        conn = self._get_connection()
+        return conn.execute("SELECT COUNT(*) FROM tasks_archive").fetchone()[0]
+
+    def compact(self) -> None:
+        """
+        Switch the database to incremental auto-vacuum and rebuild it
+
+        Databases created before auto-vacuum was enabled keep freed pages
+        on their freelist; this one-off VACUUM gives them back and lets
+        later archive runs shrink the file incrementally. It rewrites the
+        whole file, so it needs free disk space of about the database size.
+
+        Raises:
+            DatabaseBusyError: If another connection keeps the database locked
+            ValueError: If SQLite cannot rebuild the file (e.g. disk full)
+        """
+        conn = self._get_connection()
+        try:
+            self._execute_when_free(conn, "PRAGMA auto_vacuum = INCREMENTAL")
+            self._execute_when_free(conn, "VACUUM")
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Cannot compact the database: {e}") from e
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """
+        Read the trigger-maintained per-status counters
+
+        Returns:
+            Number of tasks by status
+        """
+        conn = self._get_connection()
+        rows = conn.execute("SELECT status, count FROM task_counts").fetchall()
+        return dict(rows)
+
+    def count_tasks_by_status(self) -> Dict[str, int]:
+        """
+        Count tasks by status with a full GROUP BY, bypassing the counters
+
+        Returns:
+            Number of tasks by status (statuses without tasks are omitted)
+        """
+        conn = self._get_connection()
+        rows = conn.execute(
+            "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+        ).fetchall()
+        return dict(rows)
+
+    def rebuild_status_counts(self) -> None:
+        """
+        Recompute the per-status counters from the tasks table
+        """
+        self._execute_write(self._recount_statuses)
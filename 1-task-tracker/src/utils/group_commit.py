@@ -0,0 +1,236 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# A write operation runs its statements on the connection it is given and
+# must not begin, commit or roll back a transaction itself
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+
+class GroupCommitQueue:
+    """
+    Background writer that commits queued write operations in groups
+
+    Operations are applied by one thread on its own connection. Whatever is
+    queued while a commit is in progress forms the next group, which is
+    topped up for at most max_delay_ms or until max_batch operations are
+    collected, then committed in a single transaction. Every operation runs
+    inside its own savepoint, so a failing operation is rolled back alone
+    and only its future gets the exception.
+
+    The writer connection uses synchronous=FULL, so the WAL is fsynced by
+    every group commit and a resolved future means the write is durable,
+    while the cost of that fsync is shared by the whole group.
+
+    If the writer cannot open its connection, or stops on an unexpected
+    error, every queued operation fails with that error and later
+    submissions raise it; see running.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        max_batch: int = 128,
+        max_delay_ms: float = 2.0,
+        begin: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ):
+        """
+        Args:
+            connect: Opens a new tuned connection to the database
+            max_batch: Maximum number of operations per commit
+            max_delay_ms: How long a group waits for more operations
+            begin: Opens the write transaction of a group; plain
+                BEGIN IMMEDIATE by default
+        """
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay_ms) / 1000
+        self._connect = connect
+        self._begin = begin or (lambda conn: conn.execute("BEGIN IMMEDIATE"))
+        self._queue: "queue.Queue[Optional[Tuple[WriteOp, Future]]]" = queue.Queue()
+        # Guards _stopped so nothing is queued after the writer stops reading
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(
+            target=self._run, name="task-group-commit", daemon=True
+        )
+        self.commits = 0
+        self.writes = 0
+        self.largest_batch = 0
+        self._thread.start()
+
+    def submit(self, op: WriteOp) -> Future:
+        """
+        Queue a write operation
+
+        Args:
+            op: Operation to apply
+
+        Returns:
+            Future resolved with the operation's result once it is committed
+
+        Raises:
+            RuntimeError: If the queue was closed
+            Exception: The error that stopped the writer thread
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if self._stopped:
+                raise RuntimeError("Group commit queue is closed")
+            self._queue.put((op, future))
+        return future
+
+    @property
+    def running(self) -> bool:
+        """Whether the queue still accepts operations"""
+        return not self._stopped
+
+    def close(self) -> None:
+        """
+        Commit everything already queued and stop the writer thread
+        """
+        with self._lock:
+            if not self._stopped:
+                self._stopped = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report how writes were grouped
+
+        Returns:
+            Number of commits, writes and the largest group
+        """
+        return {
+            "commits": self.commits,
+            "writes": self.writes,
+            "largest_batch": self.largest_batch,
+        }
+
+    def _run(self) -> None:
+        """Writer thread: collect groups and commit them until closed"""
+        conn = None
+        batch: List[Tuple[WriteOp, Future]] = []
+        try:
+            conn = self._connect()
+            conn.isolation_level = None
+            conn.execute("PRAGMA synchronous = FULL")
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch, stopping = self._collect(item)
+                self._commit(conn, batch)
+        except Exception as e:
+            self._fail(e, batch)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _fail(self, error: Exception, batch: List[Tuple[WriteOp, Future]]) -> None:
+        """
+        Stop accepting operations and fail every one not yet resolved
+
+        Args:
+            error: Error that stopped the writer thread
+            batch: Group that was being committed, if any
+        """
+        with self._lock:
+            self._error = error
+            self._stopped = True
+        pending = [future for _, future in batch]
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item[1])
+        for future in pending:
+            if not future.done() and (
+                future.running() or future.set_running_or_notify_cancel()
+            ):
+                future.set_exception(error)
+
+    def _collect(
+        self, first: Tuple[WriteOp, Future]
+    ) -> Tuple[List[Tuple[WriteOp, Future]], bool]:
+        """
+        Gather a group starting with an already dequeued operation
+
+        Args:
+            first: First operation of the group
+
+        Returns:
+            (operations of the group, whether close() was requested)
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(
+        self, conn: sqlite3.Connection, batch: List[Tuple[WriteOp, Future]]
+    ) -> None:
+        """
+        Apply a group of operations in one transaction and resolve their
+        futures after the commit
+
+        Args:
+            conn: Writer connection in autocommit mode
+            batch: Operations and their futures
+        """
+        outcomes = []
+        try:
+            self._begin(conn)
+            for op, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT group_write")
+                try:
+                    result = op(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO group_write")
+                    conn.execute("RELEASE group_write")
+                    outcomes.append((future, e, True))
+                else:
+                    conn.execute("RELEASE group_write")
+                    outcomes.append((future, result, False))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.commits += 1
+        self.writes += len(outcomes)
+        self.largest_batch = max(self.largest_batch, len(outcomes))
+        for future, value, failed in outcomes:
+            if failed:
+                future.set_exception(value)
+            else:
+                future.set_result(value)
@@ -0,0 +1,46 @@
+import base64
+import json
+from typing import Any, Tuple
+
+# Both cursor values are bound as SQLite INTEGER parameters (signed 64-bit)
+SQLITE_INTEGER = range(-(2**63), 2**63)
+
+
+def encode_cursor(created_at: Any, task_id: int) -> str:
+    """
+    Build an opaque keyset cursor pointing just past a task
+
+    Args:
+        created_at: Creation timestamp of the last task on the page
+        task_id: ID of the last task on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([created_at, task_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (created_at, task_id) of the task the page should start after
+
+    Raises:
+        ValueError: If the cursor is malformed or a value does not fit in
+            a 64-bit integer
+    """
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(task_id, int) or task_id not in SQLITE_INTEGER:
+        raise ValueError("Invalid cursor")
+    if isinstance(created_at, int) and created_at not in SQLITE_INTEGER:
+        raise ValueError("Invalid cursor")
+    return created_at, task_id
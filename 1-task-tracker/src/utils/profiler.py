@@ -0,0 +1,329 @@
+"""
+Per-phase timing and SQL statement tracing for `--profile`
+
+Only imported when profiling is enabled, so normal runs pay nothing.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+# Phases in report order; anything else recorded is listed after them
+PHASES = (
+    "import",
+    "container",
+    "db init",
+    "query",
+    "hydration",
+    "formatting",
+    "output",
+)
+# Profiling modes accepted by --profile=<mode> and TASK_TRACKER_PROFILE
+PROFILE_MODES = ("timing", "cprofile", "tracemalloc", "all")
+
+
+class Profiler:
+    """
+    Collects wall time per phase and per SQL statement
+
+    Phases nest: time spent in an inner phase is subtracted from the phase
+    around it, so every moment is counted once and the phases add up to
+    the total. Statements are timed from execute through the last fetch
+    by ProfiledConnection and counted by the SQLite trace callback, which
+    also sees statements run by triggers. The phase stack is kept per
+    thread, so background writers do not disturb the main thread's phases.
+    """
+
+    def __init__(self, mode: str = "timing", started: Optional[float] = None):
+        """
+        Args:
+            mode: One of PROFILE_MODES
+            started: perf_counter() value when the process started its own
+                imports; the time up to now is recorded as "import"
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                "Invalid profile mode: Use 'timing', 'cprofile', 'tracemalloc' or 'all'"
+            )
+        self.mode = mode
+        self.started = time.perf_counter() if started is None else started
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.statements: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0])
+        self.traced = 0
+        self._local = threading.local()
+        if started is not None:
+            self.totals["import"] = time.perf_counter() - started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block as the given phase
+
+        Args:
+            name: Phase name
+        """
+        stack = self._stack()
+        stack.append([name, time.perf_counter(), 0.0])
+        try:
+            yield
+        finally:
+            _, start, inner = stack.pop()
+            elapsed = time.perf_counter() - start
+            self.totals[name] += elapsed - inner
+            if stack:
+                stack[-1][2] += elapsed
+
+    def current_phase(self) -> Optional[str]:
+        """
+        Name of the innermost running phase of this thread
+
+        Returns:
+            Phase name, or None outside any phase
+        """
+        stack = self._stack()
+        return stack[-1][0] if stack else None
+
+    def _stack(self) -> List[List[Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record_statement(self, sql: str, seconds: float, rows: int = 0) -> None:
+        """
+        Add execution or fetch time to a statement
+
+        Args:
+            sql: Statement text
+            seconds: Time spent
+            rows: Rows fetched
+        """
+        entry = self.statements[" ".join(sql.split())]
+        entry[1] += seconds
+        entry[2] += rows
+
+    def count_statement(self, sql: str) -> None:
+        """
+        Count one execution of a statement
+
+        Args:
+            sql: Statement text
+        """
+        self.statements[" ".join(sql.split())][0] += 1
+
+    def trace(self, statement: str) -> None:
+        """
+        sqlite3 trace callback: counts every statement SQLite runs,
+        including those run by triggers
+
+        Args:
+            statement: Statement as reported by SQLite
+        """
+        self.traced += 1
+
+    def timed_map(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        batch: int = 500,
+    ) -> Iterator[Any]:
+        """
+        Map func over items, timing the calls as the given phase
+
+        Items are pulled and converted a batch at a time so the timer is not
+        started for every single item.
+
+        Args:
+            name: Phase name
+            func: Conversion to apply
+            items: Items to convert
+            batch: Items converted per timed block
+
+        Yields:
+            Converted items
+        """
+        iterator = iter(items)
+        while True:
+            chunk = list(islice(iterator, batch))
+            if not chunk:
+                return
+            with self.phase(name):
+                converted = list(map(func, chunk))
+            yield from converted
+
+    def report(self) -> str:
+        """
+        Format the phase breakdown and the slowest statements
+
+        Returns:
+            Multi-line report
+        """
+        total = time.perf_counter() - self.started
+        totals = dict(self.totals)
+        names = [name for name in PHASES if name in totals]
+        names += [name for name in totals if name not in PHASES]
+        lines = [f"Profile: {total * 1000:.1f} ms total"]
+        for name in names:
+            seconds = totals[name]
+            lines.append(
+                f"  {name:<12} {seconds * 1000:10.2f} ms  {self._share(seconds, total)}"
+            )
+        other = total - sum(totals.values())
+        lines.append(
+            f"  {'other':<12} {other * 1000:10.2f} ms  {self._share(other, total)}"
+        )
+
+        executed = sum(entry[0] for entry in self.statements.values())
+        lines.append(
+            f"SQL: {executed} statements executed, "
+            f"{self.traced} traced by SQLite (including triggers)"
+        )
+        slowest = sorted(self.statements.items(), key=lambda item: -item[1][1])[:10]
+        for sql, (count, seconds, rows) in slowest:
+            text = sql if len(sql) <= 70 else sql[:67] + "..."
+            lines.append(
+                f"  {seconds * 1000:10.2f} ms  x{count:<5} {rows:>8} rows  {text}"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _share(seconds: float, total: float) -> str:
+        return f"{seconds / total * 100:5.1f}%" if total > 0 else ""
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports the time spent executing and fetching"""
+
+    def execute(self, sql: str, parameters: Any = ()) -> "ProfiledCursor":
+        self._sql = sql
+        self.connection.profiler.count_statement(sql)
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any) -> "ProfiledCursor":
+        self._sql = sql
+        self.connection.profiler.count_statement(sql)
+        return self._timed(super().executemany, sql, parameters)
+
+    def fetchone(self) -> Any:
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        return self._timed(super().fetchmany, size)
+
+    def fetchall(self) -> List[Any]:
+        return self._timed(super().fetchall)
+
+    def _timed(self, method: Callable[..., Any], *args: Any) -> Any:
+        profiler = self.connection.profiler
+        # Schema setup statements stay part of the "db init" phase
+        if profiler.current_phase() == "db init":
+            timer: Any = nullcontext()
+        else:
+            timer = profiler.phase("query")
+        start = time.perf_counter()
+        with timer:
+            result = method(*args)
+        rows = len(result) if isinstance(result, list) else 0
+        profiler.record_statement(
+            getattr(self, "_sql", ""), time.perf_counter() - start, rows
+        )
+        return result
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors time every statement for a Profiler"""
+
+    profiler: Profiler
+
+    def cursor(self, factory: Any = ProfiledCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, parameters)
+
+
+class TimedStream:
+    """Text stream wrapper that times writes as the "output" phase"""
+
+    def __init__(self, stream: TextIO, profiler: Profiler):
+        self._stream = stream
+        self._profiler = profiler
+
+    def write(self, text: str) -> int:
+        with self._profiler.phase("output"):
+            return self._stream.write(text)
+
+    def flush(self) -> None:
+        with self._profiler.phase("output"):
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def profile_session(
+    profiler: Profiler, report: Optional[TextIO] = None
+) -> Iterator[None]:
+    """
+    Profile a block and print the report to stderr when it ends
+
+    Times writes to stdout as the output phase, and depending on the mode
+    also runs cProfile (top functions by cumulative time) and tracemalloc
+    (peak memory and top allocation sites).
+
+    Args:
+        profiler: Profiler collecting the timings
+        report: Where to print the report, stderr by default
+    """
+    report = report or sys.stderr
+    use_cprofile = profiler.mode in ("cprofile", "all")
+    use_tracemalloc = profiler.mode in ("tracemalloc", "all")
+
+    if use_tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start()
+    if use_cprofile:
+        import cProfile
+
+        cpu_profile = cProfile.Profile()
+        cpu_profile.enable()
+
+    stdout = sys.stdout
+    sys.stdout = TimedStream(stdout, profiler)
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+        stdout.flush()
+        if use_cprofile:
+            cpu_profile.disable()
+        print(profiler.report(), file=report)
+
+        if use_cprofile:
+            import pstats
+
+            print("cProfile (top 20 by cumulative time):", file=report)
+            stats = pstats.Stats(cpu_profile, stream=report)
+            stats.sort_stats("cumulative").print_stats(20)
+        if use_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            print(
+                f"tracemalloc: current {current / 1024:.1f} KiB, "
+                f"peak {peak / 1024:.1f} KiB; top allocation sites:",
+                file=report,
+            )
+            for stat in snapshot.statistics("lineno")[:10]:
+                print(f"  {stat}", file=report)
@@ -0,0 +1,79 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator
+
+
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+CSV_EXTENSIONS = (".csv",)
+
+
+def iter_task_records(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream task records from a JSON Lines or CSV file
+
+    The format is chosen from the file extension. JSON Lines files hold
+    one object per line (or a bare string used as the description); CSV
+    files need a header row with at least a "description" column.
+
+    Args:
+        file_path: Path to the file to read
+
+    Yields:
+        One record dictionary per task
+
+    Raises:
+        ValueError: If the format is unsupported or a line is malformed
+    """
+    if not os.path.isfile(file_path):
+        raise ValueError(f"File not found: {file_path}")
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in JSONL_EXTENSIONS:
+        yield from _iter_jsonl(file_path)
+    elif extension in CSV_EXTENSIONS:
+        yield from _iter_csv(file_path)
+    else:
+        raise ValueError("Unsupported file format: Use .jsonl, .ndjson or .csv")
+
+
+def _iter_jsonl(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a JSON Lines file
+
+    Args:
+        file_path: Path to the file to read
+
+    Yields:
+        One record dictionary per non-empty line
+    """
+    with open(file_path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                raise ValueError(f"Line {line_number}: Invalid JSON") from None
+            if isinstance(record, str):
+                record = {"description": record}
+            elif not isinstance(record, dict):
+                raise ValueError(f"Line {line_number}: Expected an object")
+            yield record
+
+
+def _iter_csv(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a CSV file with a header row
+
+    Args:
+        file_path: Path to the file to read
+
+    Yields:
+        One record dictionary per row
+    """
+    with open(file_path, encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        if not reader.fieldnames or "description" not in reader.fieldnames:
+            raise ValueError("CSV file must have a 'description' column")
+        yield from reader
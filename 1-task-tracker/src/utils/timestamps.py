@@ -0,0 +1,134 @@
+import re
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+# Microseconds per unit of a duration such as "90m" or "7d"
+DURATION_UNITS = {
+    "s": 1_000_000,
+    "m": 60_000_000,
+    "h": 3_600_000_000,
+    "d": 86_400_000_000,
+    "w": 604_800_000_000,
+}
+_DURATION = re.compile(r"(\d+)([smhdw])")
+# Longest duration; now minus it still fits SQLite's signed 64-bit INTEGER
+MAX_DURATION_US = 2**63 - 1
+
+
+def to_epoch_us(value: str) -> int:
+    """
+    Convert an ISO 8601 timestamp to integer microseconds since the epoch
+
+    Timestamps without a UTC offset are taken as local time, which is how
+    Task creates them.
+
+    Args:
+        value: ISO 8601 date or datetime
+
+    Returns:
+        Microseconds since 1970-01-01T00:00:00Z
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 timestamp
+    """
+    return round(datetime.fromisoformat(value).timestamp() * 1_000_000)
+
+
+@lru_cache(maxsize=4096)
+def _minute_prefix(minute: int) -> str:
+    """Local "YYYY-MM-DDTHH:MM:" of a minute since the epoch"""
+    return datetime.fromtimestamp(minute * 60).isoformat()[:17]
+
+
+def from_epoch_us(value: int) -> str:
+    """
+    Convert microseconds since the epoch to a local ISO 8601 timestamp
+
+    UTC offsets change only on whole minutes, so the date, hour and
+    minute are cached per minute and only the seconds are formatted for
+    each call; listings of many rows close in time convert cheaply.
+
+    Args:
+        value: Microseconds since 1970-01-01T00:00:00Z
+
+    Returns:
+        Local time as YYYY-MM-DDTHH:MM:SS.ffffff
+    """
+    minute, rest = divmod(value, 60_000_000)
+    return f"{_minute_prefix(minute)}{rest / 1_000_000:09.6f}"
+
+
+def now_us() -> int:
+    """
+    Current time in microseconds since the epoch
+
+    Returns:
+        Microseconds since 1970-01-01T00:00:00Z
+    """
+    return time.time_ns() // 1000
+
+
+def parse_duration(value: str) -> int:
+    """
+    Parse a duration such as "30m", "12h", "7d" or "2w"
+
+    Args:
+        value: Number followed by s, m, h, d or w
+
+    Returns:
+        Length of the duration in microseconds
+
+    Raises:
+        ValueError: If the value is not a duration or is too long to store
+    """
+    match = _DURATION.fullmatch(value.strip().lower())
+    if match is None:
+        raise ValueError(
+            f"Invalid duration: {value} (use a number followed by s, m, h, d or w)"
+        )
+    duration = int(match.group(1)) * DURATION_UNITS[match.group(2)]
+    if duration > MAX_DURATION_US:
+        raise ValueError(f"Invalid duration: {value} (too long)")
+    return duration
+
+
+def parse_time(value: str, now: Optional[int] = None) -> int:
+    """
+    Parse a point in time given on the command line
+
+    Accepts an ISO 8601 date or datetime (local time unless it has an
+    offset), "now", "today", "yesterday", or a duration meaning that long
+    ago ("2h", "7d").
+
+    Args:
+        value: Time to parse
+        now: Current time in microseconds, for relative values
+
+    Returns:
+        Microseconds since the epoch
+
+    Raises:
+        ValueError: If the value is not understood
+    """
+    text = value.strip().lower()
+    now = now_us() if now is None else now
+    if text == "now":
+        return now
+    if text in ("today", "yesterday"):
+        midnight = datetime.fromtimestamp(now / 1_000_000).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        if text == "yesterday":
+            midnight -= timedelta(days=1)
+        return to_epoch_us(midnight.isoformat())
+    if _DURATION.fullmatch(text):
+        return now - parse_duration(text)
+    try:
+        return to_epoch_us(value.strip())
+    except ValueError:
+        raise ValueError(
+            f"Invalid time: {value} (use an ISO date, 'today', 'yesterday' or a "
+            "duration like 2h or 7d)"
+        ) from None
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from src.repositories.task_repository_db import TaskRepositoryDB
+from src.services.async_task_service import AsyncTaskService
+from src.services.task_service import TaskService
+from src.utils.db_handler import DBHandler
+
+
+class TestAsyncTaskService(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncTaskService"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_handler = DBHandler(os.path.join(self.test_dir, "test_tasks.db"))
+        self.service = AsyncTaskService(
+            TaskService(TaskRepositoryDB(self.db_handler)), readers=3
+        )
+
+    def tearDown(self):
+        self.service.close()
+        self.db_handler.close()
+        shutil.rmtree(self.test_dir)
+
+    async def test_add_and_list_tasks(self):
+        """Test that operations can be awaited from the event loop"""
+        task = await self.service.add_task("Async task")
+        await self.service.mark_task_done(task.id)
+
+        done = await self.service.list_tasks_by_status("done")
+        found = await self.service.get_task(task.id)
+
+        self.assertEqual([t.description for t in done], ["Async task"])
+        self.assertEqual(found.status, "done")
+        self.assertIsNone(await self.service.get_task(999))
+
+    async def test_concurrent_writes_are_serialized(self):
+        """Test that hundreds of concurrent adds all succeed with unique IDs"""
+        tasks = await asyncio.gather(
+            *(self.service.add_task(f"Task {i}") for i in range(200))
+        )
+
+        self.assertEqual(len({task.id for task in tasks}), 200)
+        self.assertEqual((await self.service.counts())["total"], 200)
+
+    async def test_writes_run_on_a_single_thread(self):
+        """Test that every write runs on the same writer thread"""
+        threads = set()
+
+        def record(description):
+            threads.add(threading.get_ident())
+            return description
+
+        await asyncio.gather(*(self.service._write(record, i) for i in range(20)))
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_errors_propagate(self):
+        """Test that service errors are raised to the awaiting coroutine"""
+        with self.assertRaises(ValueError) as context:
+            await self.service.mark_task_done(999)
+
+        self.assertEqual(str(context.exception), "Task with ID 999 not found")
+
+    async def test_exit_does_not_block_the_event_loop(self):
+        """Test that leaving the context waits for writes off the event loop"""
+        pending = asyncio.ensure_future(self.service._write(time.sleep, 0.2))
+        await asyncio.sleep(0)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        await self.service.__aexit__(None, None, None)
+        ticker.cancel()
+        await pending
+
+        self.assertGreater(ticks, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from src.cli.app import TaskCLI
+from src.container.di_container import DIContainer
+
+
+class TestTaskCLIShell(unittest.TestCase):
+    """Test cases for the TaskCLI shell session"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.container = DIContainer(db_path=os.path.join(self.test_dir, "tasks.db"))
+        self.cli = TaskCLI(self.container)
+
+    def tearDown(self):
+        self.container.reset()
+        shutil.rmtree(self.test_dir)
+
+    def _run_shell(self, script: str) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.cli.run_shell(io.StringIO(script), interactive=False)
+        return output.getvalue()
+
+    def test_shell_runs_commands_in_one_session(self):
+        """Test that each line is dispatched like a command line"""
+        output = self._run_shell('add "Buy milk"\nadd eggs\ndone 1\nlist done\n')
+
+        self.assertIn("Task ID:1 added successfully", output)
+        self.assertIn("Task ID:2 added successfully", output)
+        self.assertIn("Task ID:1 marked as done", output)
+        self.assertIn("Description: Buy milk", output)
+        self.assertNotIn("Description: eggs", output)
+
+    def test_shell_update_keeps_every_word(self):
+        """Test that update stores the whole new description"""
+        output = self._run_shell("add draft\nupdate 1 Buy oat milk\nlist\n")
+
+        self.assertIn("Task ID:1 updated successfully", output)
+        self.assertIn("Description: Buy oat milk", output)
+
+    def test_shell_skips_comments_and_stops_at_exit(self):
+        """Test blank lines, comments and the exit keyword"""
+        output = self._run_shell("# setup\n\nadd one\nexit\nadd two\n")
+
+        self.assertIn("Task ID:1 added successfully", output)
+        self.assertNotIn("Task ID:2", output)
+
+    def test_shell_reports_bad_quoting(self):
+        """Test that a malformed line does not end the session"""
+        output = self._run_shell('add "unterminated\nadd ok\n')
+
+        self.assertIn("Error: No closing quotation", output)
+        self.assertIn("Task ID:1 added successfully", output)
+
+    def test_shell_reuses_one_connection(self):
+        """Test that the whole session shares a single DB handler"""
+        handler = self.container.db_handler
+
+        self._run_shell("add one\nadd two\nlist\n")
+
+        self.assertIs(self.container.db_handler, handler)
+        self.assertEqual(len(handler._connections), 1)
+
+
+class TestTaskCLILazyLoading(unittest.TestCase):
+    """Test cases for lazy command loading"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.container = DIContainer(db_path=os.path.join(self.test_dir, "tasks.db"))
+        self.cli = TaskCLI(self.container)
+
+    def tearDown(self):
+        self.container.reset()
+        shutil.rmtree(self.test_dir)
+
+    def test_only_the_requested_command_is_built(self):
+        """Test that running a command builds nothing else"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.cli.run(["task-cli", "add", "Task"])
+
+        self.assertEqual(list(self.cli.commands), ["add"])
+
+    def test_usage_does_not_touch_the_database(self):
+        """Test that usage output creates no handler and no database file"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.cli.run(["task-cli"])
+
+        self.assertIsNone(self.container._db_handler)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "tasks.db")))
+
+    def test_usage_does_not_import_the_database_stack(self):
+        """Test that a bare launch imports no command or DB modules"""
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys, io, contextlib\n"
+            "from src.cli.app import TaskCLI\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    TaskCLI().run(['task-cli'])\n"
+            "print(sorted(m for m in sys.modules if m.startswith('src.')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=project_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertNotIn("src.utils.db_handler", result.stdout)
+        self.assertNotIn("src.cli.commands", result.stdout)
+
+
+class TestTaskCLIProfile(unittest.TestCase):
+    """Test cases for the --profile option"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.container = DIContainer(db_path=os.path.join(self.test_dir, "tasks.db"))
+        self.cli = TaskCLI(self.container)
+
+    def tearDown(self):
+        self.container.reset()
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, args):
+        output, report = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(report):
+            self.cli.run(["task-cli", *args])
+        return output.getvalue(), report.getvalue()
+
+    def test_profile_reports_phases_to_stderr(self):
+        """Test that --profile leaves stdout alone and reports on stderr"""
+        output, report = self._run(["--profile", "add", "Task"])
+
+        self.assertEqual(output, "Task ID:1 added successfully\n")
+        for phase in ("container", "db init", "query", "output"):
+            self.assertIn(f"  {phase} ", report)
+        self.assertIn("INSERT INTO tasks", report)
+
+    def test_profile_from_environment(self):
+        """Test that TASK_TRACKER_PROFILE enables profiling"""
+        with mock.patch.dict(os.environ, {"TASK_TRACKER_PROFILE": "1"}):
+            _, report = self._run(["list"])
+
+        self.assertIn("Profile:", report)
+        self.assertIn("statements executed", report)
+
+    def test_invalid_profile_mode(self):
+        """Test that an unknown profile mode is rejected"""
+        output, report = self._run(["--profile=bogus", "list"])
+
+        self.assertIn("Error: Invalid profile mode", output)
+        self.assertEqual(report, "")
+        self.assertIsNone(self.container._db_handler)
+
+
+class TestTaskCLIProjects(unittest.TestCase):
+    """Test cases for project databases and --all-projects"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        patcher = mock.patch("src.utils.db_handler.DATA_DIR", self.test_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, args):
+        container = DIContainer()
+        output, report = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(report):
+            TaskCLI(container).run(["task-cli", *args])
+        container.reset()
+        return output.getvalue(), report.getvalue()
+
+    def test_project_has_its_own_database(self):
+        """Test that --project reads and writes a separate database"""
+        self._run(["--project", "work", "add", "Ship release"])
+        self._run(["add", "Buy milk"])
+
+        work, _ = self._run(["--project=work", "list"])
+        default, _ = self._run(["list"])
+
+        self.assertIn("Description: Ship release", work)
+        self.assertNotIn("Buy milk", work)
+        self.assertNotIn("Ship release", default)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.test_dir, "projects", "work.db"))
+        )
+
+    def test_db_option_selects_a_file(self):
+        """Test that --db uses the given database file"""
+        db_path = os.path.join(self.test_dir, "other.db")
+        self._run(["--db", db_path, "add", "Elsewhere"])
+
+        output, _ = self._run([f"--db={db_path}", "list", "--format", "csv"])
+
+        self.assertIn("Elsewhere", output)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "tasks.db")))
+
+    def test_all_projects_merges_newest_first(self):
+        """Test that --all-projects lists every project in time order"""
+        for project, description in [
+            ("default", "First"),
+            ("work", "Second"),
+            ("home", "Third"),
+            ("work", "Fourth"),
+        ]:
+            self._run(["--project", project, "add", description])
+
+        output, _ = self._run(["list", "--all-projects", "--format", "csv"])
+        page, report = self._run(["list", "--all-projects", "--limit", "1"])
+
+        header = "project,id,description,status,created_at,updated_at"
+        self.assertEqual(output.splitlines()[0], header)
+        self.assertEqual(
+            [line.split(",")[:3] for line in output.splitlines()[1:]],
+            [
+                ["work", "2", '"Fourth"'],
+                ["home", "1", '"Third"'],
+                ["work", "1", '"Second"'],
+                ["default", "1", '"First"'],
+            ],
+        )
+        self.assertTrue(page.startswith("Project: work\nID: 2\nDescription: Fourth"))
+        self.assertIn("Next page: --after ", page)
+        self.assertEqual(report, "")
+
+    def test_all_projects_reuses_its_handlers(self):
+        """Test that repeated listings in one session do not open more handlers"""
+        self._run(["--project", "work", "add", "Ship release"])
+        container = DIContainer()
+        cli = TaskCLI(container)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(5):
+                cli.run(["task-cli", "list", "--all-projects"])
+            self.assertEqual(len(container._project_handlers), 1)
+
+            # A new project is picked up and the old handlers are closed
+            cli.run(["task-cli", "add", "Buy milk"])
+            cli.run(["task-cli", "list", "--all-projects"])
+        self.assertEqual(len(container._project_handlers), 2)
+        container.reset()
+        self.assertEqual(container._project_handlers, [])
+
+    def test_invalid_project_name(self):
+        """Test that project names cannot point outside the projects directory"""
+        output, _ = self._run(["--project", "../etc", "list"])
+
+        self.assertIn("Error: Invalid project name", output)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "tasks.db")))
+
+
+if __name__ == "__main__":
+    unittest.main()
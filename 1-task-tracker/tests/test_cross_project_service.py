@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.repositories.task_repository_db import TaskRepositoryDB
+from src.services.cross_project_service import CrossProjectService
+from src.services.task_service import TaskService
+from src.utils.db_handler import DBHandler
+
+
+class TestCrossProjectService(unittest.TestCase):
+    """Test cases for CrossProjectService"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.handlers = []
+        self.services = {}
+        for name in ("home", "work", "empty"):
+            handler = DBHandler(os.path.join(self.test_dir, f"{name}.db"))
+            self.handlers.append(handler)
+            self.services[name] = TaskService(TaskRepositoryDB(handler))
+        # Interleave the projects in time so the merge has to alternate
+        for i in range(7):
+            self.services["home" if i % 3 else "work"].add_task(f"Task {i}")
+        self.projects = CrossProjectService(self.services, chunk_size=2)
+
+    def tearDown(self):
+        self.projects.close()
+        for handler in self.handlers:
+            handler.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_rows_are_merged_newest_first(self):
+        """Test that every project's rows come back in one listing order"""
+        rows = list(self.projects.iter_task_rows())
+
+        self.assertEqual(
+            [(row[1], row[5]) for row in rows],
+            [
+                (f"Task {i}", "home" if i % 3 else "work")
+                for i in reversed(range(7))
+            ],
+        )
+        keys = [(row[3], row[0]) for row in rows]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_limit_and_cursor_page_through_all_projects(self):
+        """Test that pages continue across projects"""
+        first = list(self.projects.iter_task_rows(limit=4))
+        cursor = TaskService.row_cursor(first[-1])
+        rest = list(self.projects.iter_task_rows(after=cursor))
+
+        self.assertEqual(len(first), 4)
+        self.assertEqual(
+            [row[1] for row in first + rest], [f"Task {i}" for i in reversed(range(7))]
+        )
+
+    def test_status_filter_applies_to_every_project(self):
+        """Test that filters are passed to each project"""
+        self.services["work"].mark_task_done(1)
+        self.services["home"].mark_task_done(2)
+
+        rows = list(self.projects.iter_task_rows("done"))
+
+        self.assertEqual(sorted(row[5] for row in rows), ["home", "work"])
+
+    def test_listings_reuse_reader_connections(self):
+        """Test that repeated listings do not open a connection each time"""
+        for _ in range(10):
+            list(self.projects.iter_task_rows())
+            list(self.projects.iter_task_rows(limit=1))
+
+        # At most one per reader thread, plus the one that added the tasks
+        for handler in self.handlers:
+            self.assertLessEqual(len(handler._connections), self.projects.workers + 1)
+
+    def test_invalid_status_raises_before_reading(self):
+        """Test that arguments are validated when the listing is requested"""
+        with self.assertRaises(ValueError):
+            self.projects.iter_task_rows("later")
+
+
+if __name__ == "__main__":
+    unittest.main()
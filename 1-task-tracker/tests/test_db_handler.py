@@ -1,8 +1,16 @@
 import unittest
+import sqlite3
 import tempfile
+import threading
 import os
-from src.utils.db_handler import DBHandler
+from src.utils.db_handler import (
+    SCHEMA_VERSION,
+    DatabaseBusyError,
+    DBHandler,
+    TaskConflictError,
+)
 from src.models.task import Task
+from src.utils.timestamps import to_epoch_us
 
 
 class TestDBHandler(unittest.TestCase):
@@ -16,19 +24,23 @@ class TestDBHandler(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test database"""
+        self.db_handler.close()
         if os.path.exists(self.db_path):
             os.remove(self.db_path)
         os.rmdir(self.temp_dir)
 
     def test_database_initialization(self):
         """Test that database is initialized correctly"""
-        # Database should be created and table should exist
-        self.assertTrue(os.path.exists(self.db_path))
-        
+        # Initialization is deferred until the first query
+        self.assertFalse(os.path.exists(self.db_path))
+
         # Test that we can query the table
         tasks = self.db_handler.get_all_tasks()
         self.assertEqual(len(tasks), 0)
 
+        # Database should be created and table should exist
+        self.assertTrue(os.path.exists(self.db_path))
+
     def test_save_task(self):
         """Test saving a task"""
         task = Task(1, "Test task", "todo")
@@ -42,6 +54,69 @@ class TestDBHandler(unittest.TestCase):
         self.assertIsNotNone(tasks[0]["created_at"])
         self.assertIsNotNone(tasks[0]["updated_at"])
 
+    def test_save_task_returns_assigned_id(self):
+        """Test that save_task returns the ID SQLite assigned"""
+        first_id = self.db_handler.save_task(Task(None, "Task 1"))
+        self.db_handler.delete_task(first_id)
+
+        second_id = self.db_handler.save_task(Task(None, "Task 2"))
+
+        self.assertEqual(first_id, 1)
+        self.assertEqual(second_id, 2)
+        self.assertEqual(self.db_handler.get_next_id(), 3)
+
+    def test_save_task_with_concurrent_writer(self):
+        """Test that interleaved writers each get the ID of their own row"""
+        other_handler = DBHandler(self.db_path)
+        try:
+            id_a = self.db_handler.save_task(Task(None, "From A"))
+            id_b = other_handler.save_task(Task(None, "From B"))
+            id_c = self.db_handler.save_task(Task(None, "From C"))
+        finally:
+            other_handler.close()
+
+        self.assertEqual(len({id_a, id_b, id_c}), 3)
+        self.assertEqual(self.db_handler.get_task_by_id(id_b)["description"], "From B")
+        self.assertEqual(self.db_handler.get_task_by_id(id_c)["description"], "From C")
+
+    def test_save_tasks(self):
+        """Test saving many tasks in batches"""
+        tasks = (Task(None, f"Task {i}") for i in range(25))
+
+        count = self.db_handler.save_tasks(tasks, batch_size=10)
+
+        self.assertEqual(count, 25)
+        self.assertEqual(len(self.db_handler.get_all_tasks()), 25)
+
+    def test_save_tasks_indexes_and_counts_in_bulk(self):
+        """Test that bulk-saved tasks are searchable, counted and triggers return"""
+        self.db_handler.save_task(Task(None, "Single task"))
+        tasks = (
+            Task(None, f"Imported {i}", "done" if i % 3 == 0 else "todo")
+            for i in range(25)
+        )
+
+        self.db_handler.save_tasks(tasks, batch_size=10)
+        self.db_handler.save_task(Task(None, "Imported after"))
+
+        found = self.db_handler.search_tasks('"imported"', limit=100)
+        self.assertEqual(len(found), 26)
+        counts = {"todo": 18, "in-progress": 0, "done": 9}
+        self.assertEqual(self.db_handler.get_status_counts(), counts)
+        self.assertEqual(self.db_handler.count_tasks_by_status(), {"todo": 18, "done": 9})
+
+    def test_save_tasks_rolls_back_on_error(self):
+        """Test that a failing bulk insert leaves no partial rows"""
+        tasks = [Task(None, "Task 1"), Task(None, "Task 2", "invalid")]
+
+        with self.assertRaises(Exception):
+            self.db_handler.save_tasks(tasks, batch_size=1)
+
+        self.assertEqual(len(self.db_handler.get_all_tasks()), 0)
+        self.db_handler.save_task(Task(None, "Task 3"))
+        self.assertEqual(len(self.db_handler.search_tasks('"task"')), 1)
+        self.assertEqual(self.db_handler.get_status_counts()["todo"], 1)
+
     def test_get_all_tasks(self):
         """Test retrieving all tasks"""
         task1 = Task(1, "Task 1", "todo")
@@ -93,6 +168,437 @@ class TestDBHandler(unittest.TestCase):
         result = self.db_handler.delete_task(999)
         self.assertFalse(result)
 
+    def test_get_task_by_id(self):
+        """Test retrieving a single task by primary key"""
+        self.db_handler.save_task(Task(1, "Task 1", "todo"))
+        self.db_handler.save_task(Task(2, "Task 2", "done"))
+
+        task = self.db_handler.get_task_by_id(2)
+
+        self.assertEqual(task["id"], 2)
+        self.assertEqual(task["description"], "Task 2")
+        self.assertEqual(task["status"], "done")
+        self.assertIsNone(self.db_handler.get_task_by_id(999))
+
+    def test_get_tasks_by_ids(self):
+        """Test retrieving several tasks by primary key"""
+        for i in range(1, 4):
+            self.db_handler.save_task(Task(i, f"Task {i}", "todo"))
+
+        tasks = self.db_handler.get_tasks_by_ids([3, 1, 999, 1])
+
+        self.assertEqual(sorted(task["id"] for task in tasks), [1, 3])
+
+    def test_get_by_id_uses_primary_key(self):
+        """Test that the point lookup does not scan the table"""
+        conn = self.db_handler._get_connection()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE id = ?", (1,)
+        ).fetchall()
+
+        self.assertTrue(any("INTEGER PRIMARY KEY" in row[-1] for row in plan))
+
+    def test_iter_tasks_by_status(self):
+        """Test streaming tasks filtered by status, newest first"""
+        self.db_handler.save_task(Task(1, "Task 1", "todo"))
+        self.db_handler.save_task(Task(2, "Task 2", "done"))
+        self.db_handler.save_task(Task(3, "Task 3", "todo"))
+
+        rows = self.db_handler.iter_tasks(status="todo")
+
+        self.assertEqual([row[1] for row in rows], ["Task 3", "Task 1"])
+
+    def test_get_by_status_uses_index(self):
+        """Test that status filtering is served by the composite index"""
+        conn = self.db_handler._get_connection()
+        plan = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM tasks WHERE status = ?
+            ORDER BY created_at DESC, id DESC
+            """,
+            ("todo",),
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+
+        self.assertIn("idx_tasks_status_created_at", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+    def test_iter_tasks_keyset_uses_index(self):
+        """Test that resuming after a cursor is an index range scan"""
+        conn = self.db_handler._get_connection()
+        plan = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM tasks WHERE status = ? AND (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC LIMIT 10
+            """,
+            ("todo", "2026-01-01", 1),
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+
+        self.assertIn("idx_tasks_status_created_at (status=? AND created_at<?)", details)
+
+    def test_search_index_follows_writes(self):
+        """Test that the FTS index tracks inserts, updates and deletes"""
+        task_id = self.db_handler.save_task(Task(None, "Buy groceries"))
+        self.db_handler.save_task(Task(None, "Walk the dog"))
+
+        self.assertEqual(len(self.db_handler.search_tasks('"groceries"')), 1)
+
+        task = Task(task_id, "Buy flowers")
+        self.db_handler.update_task(task)
+        self.assertEqual(self.db_handler.search_tasks('"groceries"'), [])
+        self.assertEqual(self.db_handler.search_tasks('"flowers"')[0][0], task_id)
+
+        self.db_handler.delete_task(task_id)
+        self.assertEqual(self.db_handler.search_tasks('"flowers"'), [])
+
+    def test_search_index_backfills_existing_rows(self):
+        """Test that adding the index to an existing database indexes old rows"""
+        self.db_handler.save_task(Task(None, "Legacy task"))
+        conn = self.db_handler._get_connection()
+        with conn:
+            conn.execute("DROP TABLE tasks_fts")
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER tasks_fts_{trigger}")
+            conn.execute("PRAGMA user_version = 0")
+        self.db_handler.close()
+
+        reopened = DBHandler(self.db_path)
+        try:
+            self.assertEqual(len(reopened.search_tasks('"legacy"')), 1)
+        finally:
+            reopened.close()
+
+    def test_current_schema_is_not_recreated(self):
+        """Test that opening an up-to-date database runs no DDL"""
+        self.db_handler.save_task(Task(None, "Task"))
+        self.db_handler.close()
+
+        reopened = DBHandler(self.db_path)
+        statements = []
+        connect = reopened._connect
+
+        def traced_connect():
+            conn = connect()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        reopened._connect = traced_connect
+        try:
+            self.assertEqual(len(reopened.get_all_tasks()), 1)
+        finally:
+            reopened.close()
+        self.assertFalse(any("CREATE" in statement for statement in statements))
+
+    def test_connection_is_reused(self):
+        """Test that the same connection serves consecutive calls"""
+        conn = self.db_handler._get_connection()
+
+        self.db_handler.save_task(Task(1, "Test task", "todo"))
+        self.db_handler.get_all_tasks()
+
+        self.assertIs(self.db_handler._get_connection(), conn)
+
+    def test_connection_pragmas(self):
+        """Test that connections are tuned on open"""
+        conn = self.db_handler._get_connection()
+
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertEqual(cache_size, -self.db_handler.cache_size_kb)
+
+    def test_close_reopens_on_next_use(self):
+        """Test that the handler can be used again after close"""
+        self.db_handler.save_task(Task(1, "Test task", "todo"))
+        self.db_handler.close()
+
+        tasks = self.db_handler.get_all_tasks()
+        self.assertEqual(len(tasks), 1)
+
+    def test_status_counts_seeded_for_existing_rows(self):
+        """Test that adding the counters to an existing database counts old rows"""
+        self.db_handler.save_task(Task(None, "Task 1", "todo"))
+        self.db_handler.save_task(Task(None, "Task 2", "done"))
+        conn = self.db_handler._get_connection()
+        with conn:
+            conn.execute("DROP TABLE task_counts")
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER task_counts_{trigger}")
+            conn.execute("PRAGMA user_version = 0")
+        self.db_handler.close()
+
+        reopened = DBHandler(self.db_path)
+        try:
+            self.assertEqual(
+                reopened.get_status_counts(), {"todo": 1, "in-progress": 0, "done": 1}
+            )
+        finally:
+            reopened.close()
+
+    def test_timestamps_stored_as_integers(self):
+        """Test that timestamps are integers in the table and ISO at the edges"""
+        task = Task(None, "Task", "todo", "2026-01-01T10:00:00", "2026-01-02T10:00:00")
+        task_id = self.db_handler.save_task(task)
+
+        conn = self.db_handler._get_connection()
+        types = conn.execute(
+            "SELECT typeof(created_at), typeof(updated_at) FROM tasks"
+        ).fetchone()
+        self.assertEqual(types, ("integer", "integer"))
+        self.assertEqual(
+            self.db_handler.get_task_by_id(task_id)["created_at"],
+            "2026-01-01T10:00:00.000000",
+        )
+
+    def test_migrates_text_timestamps(self):
+        """Test that a database with ISO text timestamps is rebuilt in place"""
+        legacy = sqlite3.connect(self.db_path)
+        with legacy:
+            legacy.execute(
+                """
+                CREATE TABLE tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    description TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'todo',
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    CHECK (status IN ('todo', 'in-progress', 'done'))
+                )
+                """
+            )
+            legacy.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?, ?)",
+                [
+                    (1, "Old task", "done", "2026-01-01T08:00:00.5", "2026-01-03"),
+                    (5, "Newer task", "todo", "2026-01-02T08:00", "2026-01-02T08:00"),
+                    (9, "Deleted task", "todo", "2026-01-02T09:00", "2026-01-02T09:00"),
+                ],
+            )
+            legacy.execute("DELETE FROM tasks WHERE id = 9")
+        legacy.close()
+
+        tasks = self.db_handler.get_all_tasks()
+
+        self.assertEqual([task["id"] for task in tasks], [5, 1])
+        self.assertEqual(tasks[1]["created_at"], "2026-01-01T08:00:00.500000")
+        self.assertEqual(tasks[1]["updated_at"], "2026-01-03T00:00:00.000000")
+        conn = self.db_handler._get_connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        self.assertEqual(version, SCHEMA_VERSION)
+        self.assertEqual(self.db_handler.search_tasks('"old"')[0][0], 1)
+        self.assertEqual(
+            self.db_handler.get_status_counts(), {"todo": 1, "in-progress": 0, "done": 1}
+        )
+        # IDs of deleted tasks are not reused
+        self.assertEqual(self.db_handler.save_task(Task(None, "Next")), 10)
+
+    def test_adds_version_column(self):
+        """Test that a version 2 database gains the version column in place"""
+        legacy = sqlite3.connect(self.db_path)
+        with legacy:
+            legacy.execute(
+                """
+                CREATE TABLE tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    description TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'todo',
+                    created_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    CHECK (status IN ('todo', 'in-progress', 'done'))
+                )
+                """
+            )
+            legacy.execute("INSERT INTO tasks VALUES (1, 'Old task', 'todo', 0, 0)")
+            legacy.execute("PRAGMA user_version = 2")
+        legacy.close()
+
+        self.assertEqual(self.db_handler.get_task_by_id(1)["version"], 1)
+        updated_at = to_epoch_us("2026-01-01T00:00:00")
+        row = self.db_handler.modify_task(1, updated_at, status="done")
+        self.assertEqual(row[2:], ("done", 0, updated_at, 2))
+
+    def test_update_task_checks_version(self):
+        """Test that a full update from an outdated task is refused"""
+        task_id = self.db_handler.save_task(Task(None, "Task"))
+        stale = Task(task_id, "Stale copy", version=1)
+        self.db_handler.modify_task(task_id, 1_767_225_600_000_000, description="New")
+
+        with self.assertRaises(TaskConflictError):
+            self.db_handler.update_task(stale)
+
+        self.assertEqual(self.db_handler.get_task_by_id(task_id)["description"], "New")
+        stale.version = 2
+        self.assertEqual(self.db_handler.update_task(stale), 3)
+        self.assertIsNone(self.db_handler.update_task(Task(99, "Missing")))
+
+    def test_modify_status_leaves_search_index(self):
+        """Test that a status-only change does not rewrite the FTS entry"""
+        task_id = self.db_handler.save_task(Task(None, "Buy milk"))
+        statements = []
+        conn = self.db_handler._get_connection()
+        conn.set_trace_callback(statements.append)
+        try:
+            self.db_handler.modify_task(task_id, 1_767_225_600_000_000, status="done")
+        finally:
+            conn.set_trace_callback(None)
+
+        self.assertFalse(any("tasks_fts" in statement for statement in statements))
+        self.assertEqual(self.db_handler.search_tasks('"milk"')[0][0], task_id)
+
+    def test_iter_tasks_date_filters(self):
+        """Test the created and updated time windows of iter_tasks"""
+        for day, updated in (("01", "05"), ("02", "02"), ("03", "03")):
+            created_at, updated_at = f"2026-01-{day}", f"2026-01-{updated}"
+            self.db_handler.save_task(Task(None, "Task", "todo", created_at, updated_at))
+
+        def ids(**window):
+            return [row[0] for row in self.db_handler.iter_tasks(**window)]
+
+        self.assertEqual(ids(since=to_epoch_us("2026-01-02")), [3, 2])
+        self.assertEqual(ids(until=to_epoch_us("2026-01-02")), [1])
+        self.assertEqual(ids(updated_since=to_epoch_us("2026-01-03")), [3, 1])
+        window = {
+            "since": to_epoch_us("2026-01-02"),
+            "updated_since": to_epoch_us("2026-01-03"),
+        }
+        self.assertEqual(ids(**window), [3])
+
+    def test_date_range_uses_index(self):
+        """Test that created and updated windows are index range scans"""
+        conn = self.db_handler._get_connection()
+        created = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM tasks WHERE created_at >= ? AND created_at < ?
+            ORDER BY created_at DESC, id DESC
+            """,
+            (1, 2),
+        ).fetchall()
+        updated = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM tasks INDEXED BY idx_tasks_updated_at WHERE updated_at >= ?
+            ORDER BY created_at DESC, id DESC
+            """,
+            (1,),
+        ).fetchall()
+
+        self.assertIn(
+            "idx_tasks_created_at (created_at>? AND created_at<?)",
+            " ".join(row[-1] for row in created),
+        )
+        self.assertIn(
+            "idx_tasks_updated_at (updated_at>?)", " ".join(row[-1] for row in updated)
+        )
+
+    def test_archive_frees_pages(self):
+        """Test that archiving moves rows and vacuums the freed pages"""
+        old = "2026-01-01T00:00:00"
+        self.db_handler.save_tasks(
+            Task(None, f"Task {i} " + "x" * 200, "done", old) for i in range(500)
+        )
+        conn = self.db_handler._get_connection()
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+        archived = self.db_handler.archive_done_tasks(to_epoch_us("2026-01-02"), 128)
+
+        self.assertEqual(sorted(archived), list(range(1, 501)))
+        self.assertEqual(self.db_handler.count_archived(), 500)
+        self.assertEqual(self.db_handler.get_all_tasks(), [])
+        self.assertEqual(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+
+    def test_compact_enables_incremental_vacuum(self):
+        """Test that compact converts a database created without auto-vacuum"""
+        legacy = sqlite3.connect(self.db_path)
+        legacy.execute("PRAGMA journal_mode = WAL")
+        legacy.execute("CREATE TABLE placeholder (x)")
+        legacy.close()
+
+        conn = self.db_handler._get_connection()
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 0)
+        self.db_handler.compact()
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+    def _hold_write_lock(self) -> sqlite3.Connection:
+        """Take the write lock from another connection, as another process would"""
+        self.db_handler.get_all_tasks()
+        other = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        other.execute("BEGIN IMMEDIATE")
+        return other
+
+    def test_write_waits_for_lock(self):
+        """Test that a write waits for another writer instead of failing"""
+        other = self._hold_write_lock()
+        release = threading.Timer(0.2, other.execute, ("ROLLBACK",))
+        release.start()
+        try:
+            task_id = self.db_handler.save_task(Task(None, "Waited"))
+        finally:
+            release.join()
+            other.close()
+
+        self.assertEqual(self.db_handler.get_task_by_id(task_id)["description"], "Waited")
+        stats = self.db_handler.write_stats()
+        self.assertGreaterEqual(stats["lock_wait_ms"], 150)
+
+    def test_write_gives_up_after_retries(self):
+        """Test that a write raises DatabaseBusyError after bounded retries"""
+        self.db_handler.close()
+        self.db_handler = DBHandler(
+            self.db_path, busy_timeout_ms=10, write_retries=2, retry_backoff_ms=1
+        )
+        other = self._hold_write_lock()
+        try:
+            with self.assertRaises(DatabaseBusyError):
+                self.db_handler.save_task(Task(None, "Blocked"))
+        finally:
+            other.close()
+
+        self.assertEqual(self.db_handler.write_stats()["busy_retries"], 2)
+        self.assertFalse(self.db_handler._get_connection().in_transaction)
+        self.db_handler.save_task(Task(None, "Unblocked"))
+        self.assertEqual(len(self.db_handler.get_all_tasks()), 1)
+
+    def test_compact_reports_locked_database(self):
+        """Test that a VACUUM blocked by another writer raises a clean error"""
+        self.db_handler.close()
+        self.db_handler = DBHandler(
+            self.db_path, busy_timeout_ms=10, write_retries=1, retry_backoff_ms=1
+        )
+        other = self._hold_write_lock()
+        try:
+            with self.assertRaises(DatabaseBusyError):
+                self.db_handler.compact()
+        finally:
+            other.close()
+
+        self.db_handler.compact()
+
+    def test_failed_write_rolls_back(self):
+        """Test that a write operation raising an error leaves no changes"""
+        def failing(conn):
+            conn.execute(
+                "INSERT INTO tasks (description, status, created_at, updated_at) "
+                "VALUES ('Lost', 'todo', 0, 0)"
+            )
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            self.db_handler._execute_write(failing)
+
+        conn = self.db_handler._get_connection()
+        self.assertIsNone(conn.isolation_level)
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(self.db_handler.get_all_tasks(), [])
+
 
 if __name__ == "__main__":
     unittest.main()
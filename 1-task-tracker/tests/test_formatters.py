@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import unittest
+from src.cli.formatters import TaskFormatter
+from src.models.task import Task
+from src.utils.timestamps import to_epoch_us
+
+
+class TestTaskFormatter(unittest.TestCase):
+    """Test cases for TaskFormatter"""
+
+    def setUp(self):
+        self.tasks = [Task(i, f"Task {i}", "todo") for i in range(1, 6)]
+
+    def test_write_task_list_matches_format_task_list(self):
+        """Test that streaming output matches the buffered formatter"""
+        stream = io.StringIO()
+
+        count = TaskFormatter.write_task_list(iter(self.tasks), stream, chunk_size=2)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(
+            stream.getvalue(), TaskFormatter.format_task_list(self.tasks) + "\n"
+        )
+
+    def test_write_task_list_empty(self):
+        """Test streaming output when there are no tasks"""
+        stream = io.StringIO()
+
+        count = TaskFormatter.write_task_list(iter([]), stream)
+
+        self.assertEqual(count, 0)
+        self.assertEqual(stream.getvalue(), "No tasks found\n")
+
+    def test_write_task_list_is_lazy(self):
+        """Test that tasks are written before the iterable is exhausted"""
+        stream = io.StringIO()
+        seen_before_end = []
+
+        def tasks():
+            yield from self.tasks[:2]
+            seen_before_end.append(stream.getvalue())
+            yield from self.tasks[2:]
+
+        TaskFormatter.write_task_list(tasks(), stream, chunk_size=2)
+
+        self.assertIn("ID: 2", seen_before_end[0])
+
+    def test_format_missing_ids_shows_ranges(self):
+        """Test that missing ID runs are shown as ranges"""
+        message = TaskFormatter.format_missing_ids([(3, 3), (7, 9), (12, 12)])
+
+        self.assertEqual(message, "Error: Tasks not found: 3, 7-9, 12")
+        self.assertEqual(
+            TaskFormatter.format_missing_ids([(5, 5)]), "Error: Task not found: 5"
+        )
+
+    def test_format_bulk_message(self):
+        """Test the summary line of batch operations"""
+        self.assertEqual(
+            TaskFormatter.format_bulk_message("done", 3), "3 tasks marked as done"
+        )
+        self.assertEqual(
+            TaskFormatter.format_bulk_message("delete", 1), "1 task deleted successfully"
+        )
+
+    def test_format_stats(self):
+        """Test the per-status summary"""
+        message = TaskFormatter.format_stats(
+            {"todo": 2, "in-progress": 1, "done": 4, "total": 7}
+        )
+
+        self.assertEqual(message, "Todo: 2\nIn progress: 1\nDone: 4\nTotal: 7")
+        message = TaskFormatter.format_stats(
+            {"todo": 0, "in-progress": 0, "done": 0, "total": 0}, archived=3
+        )
+        self.assertTrue(message.endswith("Total: 0\nArchived: 3"))
+
+    def test_write_rows_jsonl(self):
+        """Test that jsonl output is one valid JSON object per row"""
+        stream = io.StringIO()
+        rows = [
+            (
+                1,
+                'Say "hi"\n',
+                "todo",
+                to_epoch_us("2026-01-01T00:00:00"),
+                to_epoch_us("2026-01-02T00:00:00.250000"),
+            )
+        ]
+
+        count = TaskFormatter.write_rows(rows, "jsonl", stream)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            json.loads(stream.getvalue()),
+            {
+                "id": 1,
+                "description": 'Say "hi"\n',
+                "status": "todo",
+                "created_at": "2026-01-01T00:00:00.000000",
+                "updated_at": "2026-01-02T00:00:00.250000",
+            },
+        )
+
+    def test_write_rows_csv_and_tsv(self):
+        """Test that csv and tsv output has a header and quotes when needed"""
+        created = "2026-03-01T08:30:00.000001"
+        updated = "2026-03-02T17:45:59.999999"
+        stamps = (to_epoch_us(created), to_epoch_us(updated))
+        rows = [
+            (2, "Milk, eggs", "done", *stamps),
+            (3, 'Tab\tand "quote"', "todo", *stamps),
+        ]
+
+        csv_stream = io.StringIO()
+        TaskFormatter.write_rows(rows, "csv", csv_stream)
+        tsv_stream = io.StringIO()
+        TaskFormatter.write_rows(rows, "tsv", tsv_stream, chunk_size=1)
+
+        csv_stream.seek(0)
+        self.assertEqual(
+            list(csv.reader(csv_stream)),
+            [
+                ["id", "description", "status", "created_at", "updated_at"],
+                ["2", "Milk, eggs", "done", created, updated],
+                ["3", 'Tab\tand "quote"', "todo", created, updated],
+            ],
+        )
+        self.assertEqual(
+            tsv_stream.getvalue().splitlines()[1:],
+            [
+                f"2\tMilk, eggs\tdone\t{created}\t{updated}",
+                f'3\tTab\\tand "quote"\ttodo\t{created}\t{updated}',
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
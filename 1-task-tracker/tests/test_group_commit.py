@@ -0,0 +1,159 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.models.task import Task
+from src.utils.db_handler import DatabaseBusyError, DBHandler
+from src.utils.group_commit import GroupCommitQueue
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Test cases for DBHandler in group commit mode"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "test_tasks.db")
+        self.db_handler = DBHandler(
+            self.db_path, group_commit=True, commit_batch_size=16, commit_delay_ms=5
+        )
+
+    def tearDown(self):
+        self.db_handler.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_submitted_writes_are_grouped(self):
+        """Test that queued writes share commits and resolve with their IDs"""
+        futures = [
+            self.db_handler.submit_save_task(Task(None, f"Task {i}")) for i in range(40)
+        ]
+        ids = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(ids, list(range(1, 41)))
+        stats = self.db_handler.group_commit_stats()
+        self.assertEqual(stats["writes"], 40)
+        self.assertLess(stats["commits"], 40)
+        self.assertLessEqual(stats["largest_batch"], 16)
+
+    def test_resolved_write_is_visible_to_other_connections(self):
+        """Test that a future resolves only after its write is committed"""
+        task_id = self.db_handler.submit_save_task(Task(None, "Durable")).result(5)
+
+        other = sqlite3.connect(self.db_path)
+        try:
+            row = other.execute(
+                "SELECT description FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+        finally:
+            other.close()
+        self.assertEqual(row, ("Durable",))
+
+    def test_failing_write_does_not_abort_its_group(self):
+        """Test that only the failing write's future gets the error"""
+        good = self.db_handler.submit_save_task(Task(None, "Good"))
+        bad = self.db_handler.submit_save_task(Task(None, "Bad", "invalid"))
+        other = self.db_handler.submit_save_task(Task(None, "Other"))
+
+        self.assertIsInstance(bad.exception(timeout=5), sqlite3.IntegrityError)
+        self.assertIsNotNone(good.result(timeout=5))
+        self.assertIsNotNone(other.result(timeout=5))
+        self.assertEqual(len(self.db_handler.get_all_tasks()), 2)
+
+    def test_concurrent_synchronous_writers(self):
+        """Test that blocking writes from many threads all land"""
+
+        def writer(n):
+            for i in range(10):
+                self.db_handler.save_task(Task(None, f"Thread {n} task {i}"))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.db_handler.get_all_tasks()), 80)
+        self.assertEqual(self.db_handler.get_status_counts()["todo"], 80)
+
+    def test_close_commits_pending_writes(self):
+        """Test that close waits for queued writes"""
+        futures = [
+            self.db_handler.submit_save_task(Task(None, f"Task {i}")) for i in range(5)
+        ]
+        self.db_handler.close()
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(len(self.db_handler.get_all_tasks()), 5)
+
+    def test_archive_in_batches(self):
+        """Test that archive batches and the vacuum run through the queue"""
+        old = "2026-01-01T00:00:00"
+        tasks = [Task(None, f"Task {i}", "done", old) for i in range(10)]
+        self.db_handler.save_tasks(tasks)
+
+        archived = self.db_handler.archive_done_tasks(2**62, batch_size=4)
+
+        self.assertEqual(len(archived), 10)
+        self.assertEqual(self.db_handler.count_archived(), 10)
+
+    def test_submit_without_group_commit(self):
+        """Test that submitting on a plain handler commits immediately"""
+        plain = DBHandler(os.path.join(self.test_dir, "plain.db"))
+        try:
+            future = plain.submit_save_task(Task(None, "Task"))
+
+            self.assertTrue(future.done())
+            self.assertEqual(future.result(), 1)
+            self.assertIsNone(plain.group_commit_stats())
+        finally:
+            plain.close()
+
+    def test_writer_that_cannot_connect_fails_its_writes(self):
+        """Test that a failed writer connection resolves every write"""
+        connecting = threading.Event()
+
+        def connect():
+            connecting.wait(5)
+            raise DatabaseBusyError("Database is locked")
+
+        write_queue = GroupCommitQueue(connect)
+        future = write_queue.submit(lambda conn: None)
+        connecting.set()
+
+        self.assertIsInstance(future.exception(timeout=5), DatabaseBusyError)
+        write_queue.close()
+        self.assertFalse(write_queue.running)
+        with self.assertRaises(DatabaseBusyError):
+            write_queue.submit(lambda conn: None)
+
+    def test_submit_after_close_raises(self):
+        """Test that nothing can be queued once the writer has stopped"""
+        write_queue = GroupCommitQueue(lambda: sqlite3.connect(self.db_path))
+        write_queue.close()
+
+        with self.assertRaises(RuntimeError):
+            write_queue.submit(lambda conn: None)
+
+    def test_failed_writer_is_replaced(self):
+        """Test that a writer that could not connect does not fail later writes"""
+        self.db_handler.get_all_tasks()  # open this thread's connection first
+        connect = self.db_handler._connect
+        attempts = []
+
+        def connect_once_busy():
+            attempts.append(None)
+            if len(attempts) == 1:
+                raise DatabaseBusyError("Database is locked")
+            return connect()
+
+        self.db_handler._connect = connect_once_busy
+        with self.assertRaises(DatabaseBusyError):
+            self.db_handler.save_task(Task(None, "Lost"))
+
+        self.assertEqual(self.db_handler.save_task(Task(None, "Saved")), 1)
+        self.assertEqual(len(attempts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
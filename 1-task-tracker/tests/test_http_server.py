@@ -0,0 +1,199 @@
+import http.client
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from src.container.di_container import DIContainer
+
+
+class TestTaskHTTPServer(unittest.TestCase):
+    """Test cases for the HTTP JSON API"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.container = DIContainer(db_path=os.path.join(self.test_dir, "tasks.db"))
+        self.server = self.container.create_http_server(port=0, workers=2)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.conn = http.client.HTTPConnection(host, port, timeout=5)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.container.reset()
+        shutil.rmtree(self.test_dir)
+
+    def _request(self, method, path, body=None):
+        payload = None if body is None else json.dumps(body)
+        self.conn.request(method, path, body=payload)
+        response = self.conn.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else None
+
+    def test_task_lifecycle_over_one_connection(self):
+        """Test every single-task operation over one kept-alive connection"""
+        status, task = self._request("POST", "/tasks", {"description": "Buy milk"})
+        self.assertEqual(status, 201)
+        self.assertEqual(task["description"], "Buy milk")
+
+        status, task = self._request(
+            "PATCH",
+            f"/tasks/{task['id']}",
+            {"description": "Buy oat milk", "status": "done"},
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(task["description"], "Buy oat milk")
+        self.assertEqual(task["status"], "done")
+
+        self.assertEqual(self._request("GET", f"/tasks/{task['id']}")[1], task)
+        self.assertEqual(self._request("DELETE", f"/tasks/{task['id']}"), (204, None))
+        self.assertEqual(self._request("GET", f"/tasks/{task['id']}")[0], 404)
+
+    def test_hot_tasks_are_served_from_memory(self):
+        """Test that repeated lookups of a task hit the identity map"""
+        _, task = self._request("POST", "/tasks", {"description": "Buy milk"})
+        for _ in range(3):
+            self.assertEqual(self._request("GET", f"/tasks/{task['id']}")[0], 200)
+
+        self.assertEqual(self.container.repository.cache_stats()["hits"], 3)
+        serve = self.container.create_command("serve")
+        self.assertEqual(serve.http_server, self.container.create_http_server)
+
+    def test_patch_with_stale_version_conflicts(self):
+        """Test optimistic concurrency with the version returned by the API"""
+        _, task = self._request("POST", "/tasks", {"description": "Buy milk"})
+        self.assertEqual(task["version"], 1)
+        path = f"/tasks/{task['id']}"
+
+        status, changed = self._request("PATCH", path, {"status": "done", "version": 1})
+        self.assertEqual((status, changed["version"]), (200, 2))
+
+        status, error = self._request(
+            "PATCH", path, {"description": "Buy bread", "version": 1}
+        )
+        self.assertEqual(status, 409)
+        self.assertEqual(error["version"], 2)
+        self.assertEqual(self._request("GET", path)[1]["description"], "Buy milk")
+
+    def test_list_pages_and_stats(self):
+        """Test paging through tasks with the returned cursor"""
+        for i in range(3):
+            self._request("POST", "/tasks", {"description": f"Task {i}"})
+
+        status, page = self._request("GET", "/tasks?limit=2")
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            [t["description"] for t in page["tasks"]], ["Task 2", "Task 1"]
+        )
+
+        _, page = self._request("GET", f"/tasks?limit=2&after={page['next']}")
+        self.assertEqual([t["description"] for t in page["tasks"]], ["Task 0"])
+        self.assertIsNone(page["next"])
+
+        _, counts = self._request("GET", "/stats")
+        self.assertEqual(counts["todo"], 3)
+
+    def test_batch_status_change(self):
+        """Test changing the status of an ID range"""
+        for i in range(3):
+            self._request("POST", "/tasks", {"description": f"Task {i}"})
+
+        status, result = self._request(
+            "POST", "/tasks/status", {"ranges": [[1, 2]], "ids": [9], "status": "done"}
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(result, {"count": 2, "missing": [[9, 9]]})
+
+    def test_batch_rejects_malformed_ids(self):
+        """Test that batch IDs must be a list of integers in the ID range"""
+        for body in (
+            {"ids": [-(10**30)]},
+            {"ids": [2**63]},
+            {"ids": [0]},
+            {"ids": "12"},
+            {"ids": [1.9]},
+            {"ids": [True]},
+            {"ranges": [[1, 2**63]]},
+            {"ranges": [[1, 2, 3]]},
+            {"ranges": "1-2"},
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(self._request("POST", "/tasks/delete", body)[0], 400)
+
+    def test_errors(self):
+        """Test that bad requests get a JSON error and the right status"""
+        self.assertEqual(
+            self._request("POST", "/tasks", {"description": "  "}),
+            (400, {"error": "Description cannot be empty"}),
+        )
+        self.assertEqual(self._request("PATCH", "/tasks/9", {"status": "done"})[0], 404)
+        self.assertEqual(self._request("GET", "/tasks?limit=x")[0], 400)
+        self.assertEqual(self._request("GET", "/tasks?since=someday")[0], 400)
+        self.assertEqual(self._request("GET", "/tasks?since=99999999999d")[0], 400)
+        self.assertEqual(self._request("GET", "/unknown")[0], 404)
+
+    def test_out_of_range_numbers_are_rejected(self):
+        """Test that IDs and limits beyond 64 bits never reach SQLite"""
+        huge = "99999999999999999999999"
+        for method in ("GET", "PATCH", "DELETE"):
+            with self.subTest(method=method):
+                status, _ = self._request(method, f"/tasks/{huge}", {"status": "done"})
+                self.assertEqual(status, 404)
+        self.assertEqual(self._request("GET", "/tasks/0")[0], 404)
+        self.assertEqual(self._request("GET", f"/tasks?limit={huge}")[0], 400)
+
+    def test_idle_connections_do_not_hold_workers(self):
+        """Test that idle keep-alive clients leave workers free for others"""
+        host, port = self.server.server_address[:2]
+        idle = [http.client.HTTPConnection(host, port, timeout=5) for _ in range(2)]
+        try:
+            for conn in idle:
+                conn.request("GET", "/stats")
+                conn.getresponse().read()
+
+            started = time.monotonic()
+            self.assertEqual(self._request("GET", "/stats")[0], 200)
+            self.assertLess(time.monotonic() - started, 2)
+
+            # The idle connections still work afterwards
+            for conn in idle:
+                conn.request("GET", "/stats")
+                self.assertEqual(conn.getresponse().status, 200)
+        finally:
+            for conn in idle:
+                conn.close()
+
+    def test_pipelined_requests_are_all_answered(self):
+        """Test that a request already in the read buffer is not left waiting"""
+        request = b"GET /stats HTTP/1.1\r\nHost: test\r\n\r\n"
+        with socket.create_connection(self.server.server_address[:2], 5) as sock:
+            sock.sendall(request * 2)
+            data = b""
+            while data.count(b"HTTP/1.1 200") < 2:
+                chunk = sock.recv(4096)
+                self.assertTrue(chunk)
+                data += chunk
+
+    def test_negative_content_length_is_rejected(self):
+        """Test that a negative Content-Length is answered instead of blocking"""
+        self.conn.putrequest("POST", "/tasks")
+        self.conn.putheader("Content-Length", "-1")
+        self.conn.endheaders()
+        response = self.conn.getresponse()
+
+        self.assertEqual(response.status, 400)
+        self.assertEqual(
+            json.loads(response.read()), {"error": "Invalid Content-Length"}
+        )
+        self.assertEqual(response.getheader("Connection"), "close")
+
+
+if __name__ == "__main__":
+    unittest.main()
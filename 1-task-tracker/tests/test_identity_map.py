@@ -0,0 +1,56 @@
+import unittest
+from src.models.task import Task
+from src.repositories.identity_map import TaskIdentityMap
+
+
+class TestTaskIdentityMap(unittest.TestCase):
+    """Test cases for TaskIdentityMap"""
+
+    def test_get_returns_same_instance(self):
+        """Test that a stored task is returned as the same object"""
+        identity_map = TaskIdentityMap(2)
+        task = Task(1, "Task 1")
+
+        identity_map.put(task)
+
+        self.assertIs(identity_map.get(1), task)
+        self.assertIsNone(identity_map.get(2))
+        self.assertEqual(identity_map.stats()["hits"], 1)
+        self.assertEqual(identity_map.stats()["misses"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        """Test LRU eviction once capacity is reached"""
+        identity_map = TaskIdentityMap(2)
+        identity_map.put(Task(1, "Task 1"))
+        identity_map.put(Task(2, "Task 2"))
+        identity_map.get(1)
+
+        identity_map.put(Task(3, "Task 3"))
+
+        self.assertIsNone(identity_map.get(2))
+        self.assertIsNotNone(identity_map.get(1))
+        self.assertEqual(identity_map.stats()["evictions"], 1)
+
+    def test_disabled_map_stores_nothing(self):
+        """Test that capacity 0 disables the map"""
+        identity_map = TaskIdentityMap(0)
+
+        identity_map.put(Task(1, "Task 1"))
+
+        self.assertIsNone(identity_map.get(1))
+        self.assertEqual(identity_map.stats()["size"], 0)
+
+    def test_resize_evicts_overflow(self):
+        """Test that shrinking the map evicts the oldest entries"""
+        identity_map = TaskIdentityMap(3)
+        for i in range(1, 4):
+            identity_map.put(Task(i, f"Task {i}"))
+
+        identity_map.resize(1)
+
+        self.assertEqual(identity_map.stats()["size"], 1)
+        self.assertIsNotNone(identity_map.get(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
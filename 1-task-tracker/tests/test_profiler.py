@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from src.models.task import Task
+from src.repositories.task_repository_db import TaskRepositoryDB
+from src.utils.db_handler import DBHandler
+from src.utils.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for Profiler"""
+
+    def test_nested_phases_count_self_time(self):
+        """Test that inner phase time is not counted twice"""
+        profiler = Profiler()
+        with profiler.phase("outer"):
+            time.sleep(0.01)
+            with profiler.phase("inner"):
+                time.sleep(0.02)
+
+        self.assertGreaterEqual(profiler.totals["inner"], 0.02)
+        self.assertGreaterEqual(profiler.totals["outer"], 0.01)
+        self.assertLess(profiler.totals["outer"], 0.02)
+
+    def test_timed_map(self):
+        """Test that timed_map converts every item under its phase"""
+        profiler = Profiler()
+        result = list(profiler.timed_map("hydration", str, range(1200), batch=500))
+
+        self.assertEqual(result, [str(i) for i in range(1200)])
+        self.assertIn("hydration", profiler.totals)
+
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected"""
+        with self.assertRaises(ValueError):
+            Profiler("bogus")
+
+
+class TestProfiledDatabase(unittest.TestCase):
+    """Test cases for statement timing through DBHandler"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.profiler = Profiler()
+        self.db_handler = DBHandler(
+            os.path.join(self.test_dir, "test_tasks.db"), profiler=self.profiler
+        )
+
+    def tearDown(self):
+        self.db_handler.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_statements_are_timed_and_traced(self):
+        """Test that statements are recorded and trigger statements traced"""
+        for i in range(3):
+            self.db_handler.save_task(Task(None, f"Task {i}"))
+        traced_before = self.profiler.traced
+        self.db_handler.save_task(Task(None, "Task 3"))
+
+        inserts = [
+            entry
+            for sql, entry in self.profiler.statements.items()
+            if sql.startswith("INSERT INTO tasks ")
+        ]
+        self.assertEqual(inserts[0][0], 4)
+        # The insert plus its FTS and counter triggers
+        self.assertGreater(self.profiler.traced - traced_before, 1)
+        self.assertIn("db init", self.profiler.totals)
+        self.assertIn("query", self.profiler.totals)
+
+    def test_repository_times_hydration(self):
+        """Test that listing through the repository records hydration"""
+        repository = TaskRepositoryDB(self.db_handler, profiler=self.profiler)
+        self.db_handler.save_task(Task(None, "Task"))
+
+        tasks = list(repository.iter_all())
+
+        self.assertEqual([task.description for task in tasks], ["Task"])
+        self.assertIn("hydration", self.profiler.totals)
+        self.assertIn("hydration", self.profiler.report())
+        selects = [
+            entry
+            for sql, entry in self.profiler.statements.items()
+            if sql.startswith("SELECT id, description")
+        ]
+        self.assertEqual(selects[0][2], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
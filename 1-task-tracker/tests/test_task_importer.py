@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+import shutil
+import os
+from src.utils.task_importer import iter_task_records
+
+
+class TestTaskImporter(unittest.TestCase):
+    """Test cases for the bulk import file readers"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self.test_dir, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_jsonl_records(self):
+        """Test reading objects and bare strings from JSON Lines"""
+        path = self._write(
+            "tasks.jsonl",
+            '{"description": "Task 1", "status": "done"}\n\n"Task 2"\n',
+        )
+
+        records = list(iter_task_records(path))
+
+        self.assertEqual(
+            records,
+            [{"description": "Task 1", "status": "done"}, {"description": "Task 2"}],
+        )
+
+    def test_jsonl_invalid_line(self):
+        """Test that malformed JSON reports its line number"""
+        path = self._write("tasks.jsonl", '"Task 1"\n{not json}\n')
+
+        with self.assertRaises(ValueError) as context:
+            list(iter_task_records(path))
+
+        self.assertEqual(str(context.exception), "Line 2: Invalid JSON")
+
+    def test_csv_records(self):
+        """Test reading rows from CSV with a header"""
+        path = self._write("tasks.csv", "description,status\nTask 1,todo\nTask 2,done\n")
+
+        records = list(iter_task_records(path))
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1]["description"], "Task 2")
+        self.assertEqual(records[1]["status"], "done")
+
+    def test_csv_without_description_column(self):
+        """Test that CSV files must have a description column"""
+        path = self._write("tasks.csv", "title\nTask 1\n")
+
+        with self.assertRaises(ValueError):
+            list(iter_task_records(path))
+
+    def test_unsupported_extension(self):
+        """Test that unknown file types are rejected"""
+        path = self._write("tasks.txt", "Task 1\n")
+
+        with self.assertRaises(ValueError):
+            list(iter_task_records(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.models.task import Task
+from src.utils.timestamps import to_epoch_us
 
 
 class TestTaskModel(unittest.TestCase):
@@ -24,6 +25,26 @@ class TestTaskModel(unittest.TestCase):
         self.assertEqual(self.task.description, "Updated Task")
         self.assertNotEqual(self.task.updated_at, self.task.created_at)
 
+    def test_task_creation_with_timestamps(self):
+        task = Task(2, "Loaded Task", "done", "2026-01-01T00:00:00", "2026-01-02T00:00:00")
+        self.assertEqual(task.created_at, "2026-01-01T00:00:00")
+        self.assertEqual(task.updated_at, "2026-01-02T00:00:00")
+
+    def test_from_row(self):
+        created_at = "2026-01-01T00:00:00.000000"
+        updated_at = "2026-01-02T09:30:00.000042"
+        stamps = (to_epoch_us(created_at), to_epoch_us(updated_at))
+        row = (7, "Row Task", "in-progress", *stamps)
+        task = Task.from_row(row)
+        self.assertEqual(
+            task.to_dict(),
+            dict(zip(Task.__slots__, (*row[:3], created_at, updated_at))),
+        )
+        self.assertIsNone(task.version)
+
+    def test_task_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.task, "__dict__"))
+
     def test_update_status(self):
         self.task.update_status("in-progress")
         self.assertEqual(self.task.status, "in-progress")
@@ -18,6 +18,7 @@ class TestTaskRepositoryDB(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test database"""
+        self.db_handler.close()
         if os.path.exists(self.db_path):
             os.remove(self.db_path)
         os.rmdir(self.temp_dir)
@@ -68,6 +69,16 @@ class TestTaskRepositoryDB(unittest.TestCase):
         found_task = self.repository.find_by_id(999)
         self.assertIsNone(found_task)
 
+    def test_find_by_ids(self):
+        """Test finding several tasks by ID"""
+        for i in range(1, 4):
+            self.repository.save_task(Task(i, f"Task {i}", "todo"))
+
+        found_tasks = self.repository.find_by_ids([3, 999, 1])
+
+        self.assertEqual([task.id for task in found_tasks], [3, 1])
+        self.assertEqual(found_tasks[0].description, "Task 3")
+
     def test_find_all(self):
         """Test finding all tasks"""
         task1 = Task(1, "Task 1", "todo")
@@ -108,6 +119,19 @@ class TestTaskRepositoryDB(unittest.TestCase):
         self.assertIn(3, todo_ids)
         self.assertIn(2, done_ids)
 
+    def test_iter_all_and_by_status(self):
+        """Test streaming tasks, newest first"""
+        self.repository.save_task(Task(1, "Task 1", "todo"))
+        self.repository.save_task(Task(2, "Task 2", "done"))
+        self.repository.save_task(Task(3, "Task 3", "todo"))
+
+        all_tasks = list(self.repository.iter_all())
+        todo_tasks = list(self.repository.iter_by_status("todo"))
+
+        self.assertEqual([task.id for task in all_tasks], [3, 2, 1])
+        self.assertEqual([task.id for task in todo_tasks], [3, 1])
+        self.assertEqual(todo_tasks[0].created_at, self.repository.find_by_id(3).created_at)
+
     def test_update_task(self):
         """Test updating a task"""
         task = Task(1, "Original task", "todo")
@@ -143,6 +167,42 @@ class TestTaskRepositoryDB(unittest.TestCase):
         result = self.repository.delete_task(999)
         self.assertFalse(result)
 
+    def test_identity_map_serves_repeated_lookups(self):
+        """Test that cached lookups return the same object without a query"""
+        repository = TaskRepositoryDB(self.db_handler, cache_size=10)
+        task = Task(None, "Cached task")
+        repository.save_task(task)
+
+        first = repository.find_by_id(task.id)
+        second = repository.find_by_id(task.id)
+
+        self.assertIs(first, task)
+        self.assertIs(second, task)
+        self.assertEqual(repository.cache_stats()["hits"], 2)
+
+    def test_identity_map_write_through(self):
+        """Test that writes keep the identity map coherent"""
+        repository = TaskRepositoryDB(self.db_handler, cache_size=10)
+        task_ids = [repository.save_task(Task(None, f"Task {i}")) for i in range(3)]
+        repository.identity_map.clear()
+        for task_id in task_ids:
+            repository.find_by_id(task_id)
+
+        repository.delete_task(task_ids[0])
+        repository.update_status_many([task_ids[1]], [], "done", 1_771_458_300_000_000)
+
+        self.assertIsNone(repository.find_by_id(task_ids[0]))
+        self.assertEqual(repository.find_by_id(task_ids[1]).status, "done")
+        self.assertEqual(repository.cache_stats()["misses"], 5)
+
+    def test_identity_map_disabled_by_default(self):
+        """Test that the default repository always reads from the database"""
+        task = Task(None, "Uncached task")
+        self.repository.save_task(task)
+
+        self.assertIsNot(self.repository.find_by_id(task.id), task)
+        self.assertEqual(self.repository.cache_stats()["size"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,14 +3,24 @@ import sys
 import os
 import tempfile
 import shutil
+import time
+from datetime import datetime, timezone
+from unittest import mock
 
 # Add the parent directory to the path so we can import src
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.models.task import Task
-from src.services.task_service import TaskService
+from src.services.task_service import TaskNotFoundError, TaskService
 from src.repositories.task_repository_db import TaskRepositoryDB
-from src.utils.db_handler import DBHandler
+from src.utils.db_handler import DBHandler, TaskConflictError
+from src.utils import timestamps
+from src.utils.pagination import encode_cursor
+
+
+def utc_us(*fields):
+    """Microseconds since the epoch of a UTC date and time"""
+    return round(datetime(*fields, tzinfo=timezone.utc).timestamp() * 1_000_000)
 
 
 class TestTaskService(unittest.TestCase):
@@ -24,6 +34,7 @@ class TestTaskService(unittest.TestCase):
 
     def tearDown(self):
         # Clean up temporary directory
+        self.db_handler.close()
         shutil.rmtree(self.test_dir)
 
     def test_add_task_success(self):
@@ -35,6 +46,16 @@ class TestTaskService(unittest.TestCase):
         self.assertEqual(task.status, "todo")
         self.assertEqual(task.id, 1)
 
+    def test_add_task_returns_assigned_id(self):
+        """Test that add_task reports the ID actually stored"""
+        first = self.service.add_task("Task 1")
+        self.service.delete_task(first.id)
+
+        second = self.service.add_task("Task 2")
+
+        self.assertEqual(second.id, 2)
+        self.assertEqual(self.repository.find_by_id(second.id).description, "Task 2")
+
     def test_add_task_empty_description(self):
         """Test adding a task with empty description"""
         with self.assertRaises(ValueError) as context:
@@ -55,6 +76,59 @@ class TestTaskService(unittest.TestCase):
 
         self.assertEqual(task.description, "Test Task")
 
+    def test_add_tasks_success(self):
+        """Test adding many tasks at once"""
+        records = [
+            {"description": " Task 1 "},
+            {"description": "Task 2", "status": "done"},
+        ]
+
+        count = self.service.add_tasks(iter(records))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(self.service.list_tasks_by_status("done")), 1)
+        self.assertEqual(self.service.list_tasks_by_status("todo")[0].description, "Task 1")
+
+    def test_add_tasks_invalid_record(self):
+        """Test that an invalid record aborts the whole import"""
+        records = [{"description": "Task 1"}, {"description": "  "}]
+
+        with self.assertRaises(ValueError) as context:
+            self.service.add_tasks(records)
+
+        self.assertEqual(
+            str(context.exception), "Record 2: Description cannot be empty"
+        )
+        self.assertEqual(len(self.service.list_all_tasks()), 0)
+
+    def test_add_tasks_rejects_wrong_field_types(self):
+        """Test that bad record fields are reported with the record number"""
+        cases = [
+            ({"description": 5}, "Record 2: Description must be a string"),
+            (
+                {"description": "Task", "created_at": 17},
+                "Record 2: created_at must be an ISO 8601 string",
+            ),
+            (
+                {"description": "Task", "updated_at": "yesterday-ish"},
+                "Record 2: Invalid updated_at: yesterday-ish",
+            ),
+        ]
+        for record, message in cases:
+            with self.subTest(record=record):
+                with self.assertRaises(ValueError) as context:
+                    self.service.add_tasks([{"description": "Task 1"}, record])
+
+                self.assertEqual(str(context.exception), message)
+        self.assertEqual(len(self.service.list_all_tasks()), 0)
+
+    def test_get_task(self):
+        """Test getting one task by ID"""
+        task = self.service.add_task("Task 1")
+
+        self.assertEqual(self.service.get_task(task.id).description, "Task 1")
+        self.assertIsNone(self.service.get_task(999))
+
     def test_list_all_tasks_empty(self):
         """Test listing all tasks when none exist"""
         tasks = self.service.list_all_tasks()
@@ -103,6 +177,112 @@ class TestTaskService(unittest.TestCase):
             "Invalid status: Use 'all', 'todo', 'in-progress' or 'done'",
         )
 
+    def test_iter_tasks_by_status(self):
+        """Test streaming tasks by status"""
+        task1 = self.service.add_task("Task 1")
+        self.service.add_task("Task 2")
+        self.service.mark_task_done(task1.id)
+
+        self.assertEqual(len(list(self.service.iter_tasks_by_status())), 2)
+        self.assertEqual(
+            [task.id for task in self.service.iter_tasks_by_status("done")], [task1.id]
+        )
+        with self.assertRaises(ValueError):
+            self.service.iter_tasks_by_status("invalid")
+
+    def test_list_tasks_pagination(self):
+        """Test paging through tasks with a keyset cursor"""
+        for i in range(5):
+            self.service.add_task(f"Task {i}")
+
+        first_page = self.service.list_tasks_by_status("all", limit=2)
+        cursor = self.service.page_cursor(first_page[-1])
+        second_page = self.service.list_tasks_by_status("all", limit=2, after=cursor)
+        cursor = self.service.page_cursor(second_page[-1])
+        last_page = self.service.list_tasks_by_status("all", limit=2, after=cursor)
+
+        self.assertEqual([task.id for task in first_page], [5, 4])
+        self.assertEqual([task.id for task in second_page], [3, 2])
+        self.assertEqual([task.id for task in last_page], [1])
+
+    def test_list_tasks_pagination_by_status(self):
+        """Test paging through tasks with one status"""
+        for i in range(4):
+            task = self.service.add_task(f"Task {i}")
+            if task.id % 2 == 0:
+                self.service.mark_task_done(task.id)
+
+        first_page = self.service.list_tasks_by_status("done", limit=1)
+        cursor = self.service.page_cursor(first_page[0])
+        second_page = self.service.list_tasks_by_status("done", limit=1, after=cursor)
+
+        self.assertEqual(first_page[0].id, 4)
+        self.assertEqual(second_page[0].id, 2)
+
+    def _in_new_york(self):
+        """Run the rest of the test in a time zone that observes DST"""
+        patcher = mock.patch.dict(os.environ, {"TZ": "America/New_York"})
+        patcher.start()
+        time.tzset()
+        timestamps._minute_prefix.cache_clear()
+
+        def restore():
+            patcher.stop()
+            time.tzset()
+            timestamps._minute_prefix.cache_clear()
+
+        self.addCleanup(restore)
+
+    def test_pages_through_the_repeated_dst_hour(self):
+        """Test that cursors do not skip tasks when clocks go back"""
+        self._in_new_york()
+        # 01:45 EDT, then 01:15 and 01:40 EST on the same night
+        created = [utc_us(2026, 11, 1, 5, 45), utc_us(2026, 11, 1, 6, 15)]
+        created.append(utc_us(2026, 11, 1, 6, 40))
+        conn = self.db_handler._get_connection()
+        for created_at in created:
+            task = self.service.add_task("Task")
+            conn.execute(
+                "UPDATE tasks SET created_at = ? WHERE id = ?", (created_at, task.id)
+            )
+
+        ids = []
+        cursor = None
+        for _ in range(3):
+            page = self.service.list_tasks_by_status("all", limit=1, after=cursor)
+            ids.extend(task.id for task in page)
+            cursor = self.service.page_cursor(page[-1])
+
+        self.assertEqual(ids, [3, 2, 1])
+
+    def test_writes_in_the_repeated_dst_hour_keep_their_time(self):
+        """Test that update times are stored exactly, even at 01:30 EST"""
+        self._in_new_york()
+        now = utc_us(2026, 11, 1, 6, 30)
+        task = self.service.add_task("Task")
+
+        with mock.patch("src.services.task_service.now_us", return_value=now):
+            self.service.mark_task_done(task.id)
+            self.service.mark_tasks_status([task.id], [], "todo")
+        stored = self.db_handler._get_connection().execute(
+            "SELECT updated_at FROM tasks WHERE id = ?", (task.id,)
+        )
+
+        self.assertEqual(stored.fetchone()[0], now)
+
+    def test_list_tasks_invalid_cursor(self):
+        """Test that malformed cursors are rejected"""
+        with self.assertRaises(ValueError) as context:
+            self.service.list_tasks_by_status("all", after="not-a-cursor")
+
+        self.assertEqual(str(context.exception), "Invalid cursor")
+        for created_at, task_id in ((10**30, 1), (1, 10**23), (1, -(2**63) - 1)):
+            with self.subTest(created_at=created_at, task_id=task_id):
+                cursor = encode_cursor(created_at, task_id)
+                with self.assertRaises(ValueError) as context:
+                    list(self.service.iter_task_rows("all", after=cursor))
+                self.assertEqual(str(context.exception), "Invalid cursor")
+
     def test_update_task_success(self):
         """Test updating a task successfully"""
         task = self.service.add_task("Original Task")
@@ -123,7 +303,7 @@ class TestTaskService(unittest.TestCase):
 
     def test_update_task_not_found(self):
         """Test updating a task that doesn't exist"""
-        with self.assertRaises(ValueError) as context:
+        with self.assertRaises(TaskNotFoundError) as context:
             self.service.update_task(999, "Updated Task")
 
         self.assertEqual(str(context.exception), "Task with id 999 not found")
@@ -141,11 +321,26 @@ class TestTaskService(unittest.TestCase):
 
     def test_delete_task_not_found(self):
         """Test deleting a task that doesn't exist"""
-        with self.assertRaises(ValueError) as context:
+        with self.assertRaises(TaskNotFoundError) as context:
             self.service.delete_task(999)
 
         self.assertEqual(str(context.exception), "Task with id 999 not found")
 
+    def test_delete_task_deleted_elsewhere(self):
+        """Test that a cached task deleted by another process is not found"""
+        service = TaskService(TaskRepositoryDB(self.db_handler, cache_size=10))
+        task = service.add_task("Test Task")
+        other_handler = DBHandler(self.test_file)
+        try:
+            other_handler.delete_task(task.id)
+        finally:
+            other_handler.close()
+
+        with self.assertRaises(TaskNotFoundError) as context:
+            service.delete_task(task.id)
+
+        self.assertEqual(str(context.exception), f"Task with id {task.id} not found")
+
     def test_mark_task_in_progress_success(self):
         """Test marking a task as in-progress successfully"""
         task = self.service.add_task("Test Task")
@@ -157,7 +352,7 @@ class TestTaskService(unittest.TestCase):
 
     def test_mark_task_in_progress_not_found(self):
         """Test marking a non-existent task as in-progress"""
-        with self.assertRaises(ValueError) as context:
+        with self.assertRaises(TaskNotFoundError) as context:
             self.service.mark_task_in_progress(999)
 
         self.assertEqual(str(context.exception), "Task with ID 999 not found")
@@ -173,7 +368,7 @@ class TestTaskService(unittest.TestCase):
 
     def test_mark_task_done_not_found(self):
         """Test marking a non-existent task as done"""
-        with self.assertRaises(ValueError) as context:
+        with self.assertRaises(TaskNotFoundError) as context:
             self.service.mark_task_done(999)
 
         self.assertEqual(str(context.exception), "Task with ID 999 not found")
@@ -189,11 +384,252 @@ class TestTaskService(unittest.TestCase):
 
     def test_mark_task_todo_not_found(self):
         """Test marking a non-existent task as todo"""
-        with self.assertRaises(ValueError) as context:
+        with self.assertRaises(TaskNotFoundError) as context:
             self.service.mark_task_todo(999)
 
         self.assertEqual(str(context.exception), "Task with ID 999 not found")
 
+    def test_mark_task_is_one_conditional_update(self):
+        """Test that marking a task writes without reading it first"""
+        task = self.service.add_task("Test Task")
+        self.repository.identity_map.clear()
+        statements = []
+        conn = self.db_handler._get_connection()
+        conn.set_trace_callback(statements.append)
+        try:
+            marked = self.service.mark_task_done(task.id)
+        finally:
+            conn.set_trace_callback(None)
+
+        self.assertEqual((marked.status, marked.version), ("done", 2))
+        # Triggers fired by the UPDATE are traced under its text
+        self.assertEqual(
+            {statement.split()[0] for statement in statements},
+            {"BEGIN", "UPDATE", "COMMIT"},
+        )
+
+    def test_stale_version_conflicts(self):
+        """Test that an update based on an old version is refused"""
+        task = self.service.add_task("Test Task")
+        self.service.mark_task_in_progress(task.id, expected_version=1)
+
+        with self.assertRaises(TaskConflictError) as context:
+            self.service.update_task(task.id, "Lost update", expected_version=1)
+
+        self.assertEqual(context.exception.current, 2)
+        self.assertIn("was changed by another writer", str(context.exception))
+        stored = self.repository.find_by_id(task.id)
+        self.assertEqual(stored.description, "Test Task")
+        self.assertEqual(stored.version, 2)
+
+    def test_patch_task_changes_both_fields(self):
+        """Test changing description and status in one update"""
+        task = self.service.add_task("Test Task")
+
+        patched = self.service.patch_task(task.id, " New ", "done", expected_version=1)
+
+        self.assertEqual(
+            (patched.description, patched.status, patched.version), ("New", "done", 2)
+        )
+        with self.assertRaises(TaskNotFoundError) as context:
+            self.service.patch_task(999, status="done")
+        self.assertEqual(str(context.exception), "Task with id 999 not found")
+
+    def test_mark_tasks_status_ids_and_ranges(self):
+        """Test changing the status of a batch of IDs and ranges"""
+        for i in range(6):
+            self.service.add_task(f"Task {i}")
+
+        count, missing = self.service.mark_tasks_status([1, 9], [(3, 5), (8, 8)], "done")
+
+        self.assertEqual(count, 4)
+        self.assertEqual(missing, [(8, 9)])
+        done_ids = sorted(task.id for task in self.service.list_tasks_by_status("done"))
+        self.assertEqual(done_ids, [1, 3, 4, 5])
+
+    def test_mark_tasks_status_invalid_status(self):
+        """Test that batch status changes validate the status"""
+        with self.assertRaises(ValueError):
+            self.service.mark_tasks_status([1], [], "invalid")
+
+    def test_delete_tasks_overlapping_selection(self):
+        """Test that IDs covered twice are not reported as missing"""
+        for i in range(4):
+            self.service.add_task(f"Task {i}")
+
+        count, missing = self.service.delete_tasks([2], [(1, 3), (6, 6)])
+
+        self.assertEqual(count, 3)
+        self.assertEqual(missing, [(6, 6)])
+        self.assertEqual([task.id for task in self.service.list_all_tasks()], [4])
+
+    def test_missing_ids_of_wide_ranges_stay_ranges(self):
+        """Test that a huge range is answered without listing every ID"""
+        for i in range(3):
+            self.service.add_task(f"Task {i}")
+
+        count, missing = self.service.mark_tasks_status(
+            [7], [(2, 2_000_000_000), (1, 1)], "done"
+        )
+
+        self.assertEqual(count, 3)
+        self.assertEqual(missing, [(4, 2_000_000_000)])
+        with self.assertRaises(ValueError):
+            self.service.delete_tasks([], [(1, 2**63)])
+
+    def test_search_tasks(self):
+        """Test full-text search with prefixes and a status filter"""
+        self.service.add_task("Buy groceries for dinner")
+        self.service.add_task("Groom the dog")
+        grocery_app = self.service.add_task("Fix grocery list app")
+        self.service.mark_task_done(grocery_app.id)
+
+        prefix_ids = {task.id for task in self.service.search_tasks("gro*")}
+        done_tasks = self.service.search_tasks("gro*", status="done")
+        exact_tasks = self.service.search_tasks("dog")
+
+        self.assertEqual(prefix_ids, {1, 2, 3})
+        self.assertEqual([task.id for task in done_tasks], [grocery_app.id])
+        self.assertEqual([task.description for task in exact_tasks], ["Groom the dog"])
+
+    def test_search_tasks_requires_all_words(self):
+        """Test that every word must match and quotes are treated literally"""
+        self.service.add_task("Buy groceries for dinner")
+        self.service.add_task('Review "quoted" text')
+
+        self.assertEqual(self.service.search_tasks("groceries lunch"), [])
+        self.assertEqual(len(self.service.search_tasks('"quoted" OR')), 0)
+        self.assertEqual(len(self.service.search_tasks('"quoted"')), 1)
+
+    def test_search_tasks_empty_query(self):
+        """Test that an empty query is rejected"""
+        with self.assertRaises(ValueError) as context:
+            self.service.search_tasks("  * ")
+
+        self.assertEqual(str(context.exception), "Search query cannot be empty")
+
+    def test_counts_follow_writes(self):
+        """Test that the counters track adds, status changes and deletes"""
+        first = self.service.add_task("Task 1")
+        second = self.service.add_task("Task 2")
+        self.service.add_task("Task 3")
+        self.service.mark_task_done(first.id)
+        self.service.mark_task_in_progress(second.id)
+        self.service.mark_task_in_progress(second.id)
+        self.service.delete_task(first.id)
+        self.service.add_tasks([{"description": "Task 4", "status": "done"}])
+
+        self.assertEqual(
+            self.service.counts(),
+            {"todo": 1, "in-progress": 1, "done": 1, "total": 3},
+        )
+        self.assertEqual(self.service.verify_counts(), {})
+
+    def test_counts_after_batch_operations(self):
+        """Test that the counters track batch status changes and deletes"""
+        for i in range(6):
+            self.service.add_task(f"Task {i}")
+
+        self.service.mark_tasks_status([], [(1, 4)], "done")
+        self.service.delete_tasks([1, 5], [])
+
+        self.assertEqual(
+            self.service.counts(),
+            {"todo": 1, "in-progress": 0, "done": 3, "total": 4},
+        )
+        self.assertEqual(self.service.verify_counts(), {})
+
+    def test_verify_and_repair_counts(self):
+        """Test that drifted counters are reported and can be rebuilt"""
+        self.service.add_task("Task 1")
+        conn = self.db_handler._get_connection()
+        with conn:
+            conn.execute("UPDATE task_counts SET count = 5 WHERE status = 'todo'")
+
+        self.assertEqual(self.service.verify_counts(), {"todo": (5, 1)})
+
+        self.service.repair_counts()
+        self.assertEqual(self.service.verify_counts(), {})
+        self.assertEqual(self.service.counts()["total"], 1)
+
+
+    def test_iter_task_rows(self):
+        """Test streaming raw rows with the same filters and cursor as tasks"""
+        for i in range(3):
+            self.service.add_task(f"Task {i}")
+        self.service.mark_task_done(2)
+
+        rows = list(self.service.iter_task_rows("todo", limit=1))
+        self.assertEqual([row[:3] for row in rows], [(3, "Task 2", "todo")])
+
+        after = self.service.row_cursor(rows[0])
+        rows = list(self.service.iter_task_rows("todo", after=after))
+        self.assertEqual([row[0] for row in rows], [1])
+
+        with self.assertRaises(ValueError):
+            self.service.iter_task_rows("invalid")
+
+    def test_list_date_filters(self):
+        """Test the since, until and updated_since listing filters"""
+        for day in ("01", "02", "03"):
+            self.repository.save_task(
+                Task(None, f"Day {day}", "todo", f"2026-01-{day}T12:00:00")
+            )
+        self.service.mark_task_done(1)
+
+        def ids(**window):
+            return [task.id for task in self.service.iter_tasks_by_status(**window)]
+
+        self.assertEqual(ids(since="2026-01-02"), [3, 2])
+        self.assertEqual(ids(since="2026-01-02", until="2026-01-03"), [2])
+        self.assertEqual(ids(updated_since="today"), [1])
+        self.assertEqual(ids(status="todo", updated_since="1h"), [])
+        rows = self.service.iter_task_rows("done", updated_since="today")
+        self.assertEqual([row[0] for row in rows], [1])
+        with self.assertRaises(ValueError):
+            ids(since="someday")
+
+    def test_archive_tasks(self):
+        """Test that old done tasks leave the hot table but can still be listed"""
+        for day, status in (("01", "done"), ("02", "todo"), ("03", "done")):
+            timestamp = f"2026-01-{day}T12:00:00"
+            self.repository.save_task(Task(None, f"Day {day}", status, timestamp))
+        recent = self.service.add_task("Recent")
+        self.service.mark_task_done(recent.id)
+
+        archived = self.service.archive_tasks("1d", batch_size=1)
+
+        self.assertEqual(archived, 2)
+        self.assertEqual(
+            [task.id for task in self.service.iter_tasks_by_status()], [4, 2]
+        )
+        tasks = self.service.iter_tasks_by_status(include_archived=True)
+        self.assertEqual([task.id for task in tasks], [4, 3, 2, 1])
+        rows = self.service.iter_task_rows("done", limit=2, include_archived=True)
+        self.assertEqual([row[0] for row in rows], [4, 3])
+        self.assertEqual(self.service.counts()["done"], 1)
+        self.assertEqual(self.service.count_archived(), 2)
+        self.assertIsNone(self.repository.find_by_id(1))
+        # Archived IDs are never reused
+        self.assertEqual(self.service.add_task("Next").id, 5)
+
+    def test_archive_tasks_invalid_duration(self):
+        """Test that archive rejects malformed durations"""
+        with self.assertRaises(ValueError):
+            self.service.archive_tasks("soon")
+
+    def test_cursor_with_text_timestamp(self):
+        """Test that cursors holding ISO timestamps keep working"""
+        for i in range(3):
+            self.service.add_task(f"Task {i}")
+        second = self.repository.find_by_id(2)
+
+        after = encode_cursor(second.created_at, second.id)
+        tasks = self.service.list_tasks_by_status("all", after=after)
+        self.assertEqual([task.id for task in tasks], [1])
+        with self.assertRaises(ValueError):
+            self.service.list_tasks_by_status("all", after=encode_cursor("x", 1))
+
 
 if __name__ == "__main__":
     unittest.main()
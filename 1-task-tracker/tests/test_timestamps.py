@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime
+from src.utils.timestamps import (
+    from_epoch_us,
+    parse_duration,
+    parse_time,
+    to_epoch_us,
+)
+
+
+class TestTimestamps(unittest.TestCase):
+    """Test cases for the epoch timestamp helpers"""
+
+    def test_round_trip_keeps_microseconds(self):
+        """Test that ISO -> epoch -> ISO is lossless"""
+        for value in (
+            "2026-01-01T00:00:00.000000",
+            "2026-02-18T23:45:00.000001",
+            "1999-12-31T23:59:59.999999",
+        ):
+            self.assertEqual(from_epoch_us(to_epoch_us(value)), value)
+
+    def test_from_epoch_us_matches_datetime(self):
+        """Test that the cached minute prefix gives the same text as datetime"""
+        for value in (0, 59_999_999, 1_768_225_599_123_456, 1_768_225_620_000_000):
+            expected = datetime.fromtimestamp(value / 1_000_000).isoformat(
+                timespec="microseconds"
+            )
+            self.assertEqual(from_epoch_us(value), expected)
+
+    def test_parse_duration(self):
+        """Test durations in every unit and invalid input"""
+        self.assertEqual(parse_duration("90s"), 90_000_000)
+        self.assertEqual(parse_duration("2h"), 7_200_000_000)
+        self.assertEqual(parse_duration("1W"), 7 * 86_400_000_000)
+        for value in ("", "h", "1.5d", "3 days"):
+            with self.assertRaises(ValueError):
+                parse_duration(value)
+
+    def test_parse_duration_too_long(self):
+        """Test that durations beyond the 64-bit range are rejected"""
+        with self.assertRaises(ValueError) as context:
+            parse_time("99999999999d", now=0)
+        self.assertEqual(
+            str(context.exception), "Invalid duration: 99999999999d (too long)"
+        )
+        self.assertEqual(parse_duration("15250w"), 15250 * 604_800_000_000)
+
+    def test_parse_time(self):
+        """Test absolute, named and relative times"""
+        now = to_epoch_us("2026-03-10T15:30:00")
+
+        self.assertEqual(parse_time("2026-03-01", now), to_epoch_us("2026-03-01"))
+        self.assertEqual(parse_time("now", now), now)
+        self.assertEqual(parse_time("today", now), to_epoch_us("2026-03-10"))
+        self.assertEqual(parse_time("Yesterday", now), to_epoch_us("2026-03-09"))
+        self.assertEqual(parse_time("30m", now), to_epoch_us("2026-03-10T15:00:00"))
+        with self.assertRaises(ValueError):
+            parse_time("last week", now)
+
+
+if __name__ == "__main__":
+    unittest.main()
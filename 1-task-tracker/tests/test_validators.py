@@ -0,0 +1,178 @@
+import unittest
+from unittest import mock
+from src.cli.validators import ArgumentValidator
+
+
+class TestArgumentValidator(unittest.TestCase):
+    """Test cases for ArgumentValidator"""
+
+    def test_validate_task_ids(self):
+        """Test parsing individual IDs and ranges"""
+        selection = ArgumentValidator.validate_task_ids(
+            ["task-cli", "done", "1", "2", "10-500"]
+        )
+
+        self.assertEqual(selection, ([1, 2], [(10, 500)]))
+
+    def test_validate_task_ids_invalid(self):
+        """Test rejecting malformed IDs and reversed ranges"""
+        self.assertIsNone(ArgumentValidator.validate_task_ids(["task-cli", "done"]))
+        self.assertIsNone(
+            ArgumentValidator.validate_task_ids(["task-cli", "done", "--"])
+        )
+        self.assertIsNone(ArgumentValidator.validate_task_ids(["task-cli", "done", "x"]))
+        self.assertIsNone(
+            ArgumentValidator.validate_task_ids(["task-cli", "done", "5-3"])
+        )
+        self.assertIsNone(
+            ArgumentValidator.validate_task_ids(
+                ["task-cli", "done", "1-9223372036854775808"]
+            )
+        )
+
+    def test_validate_task_ids_not_positive(self):
+        """Test that zero and negative IDs are reported as not positive"""
+        for args in (["-5"], ["--", "-5"], ["0"], ["0-3"]):
+            with self.subTest(args=args), mock.patch("builtins.print") as output:
+                self.assertIsNone(
+                    ArgumentValidator.validate_task_ids(["task-cli", "delete", *args])
+                )
+                output.assert_called_once_with(
+                    "Error: Task ID must be a positive number"
+                )
+        self.assertIsNone(ArgumentValidator.validate_task_id(["task-cli", "get", "0"]))
+
+    def test_split_options(self):
+        """Test separating options from positional arguments"""
+        positional, options = ArgumentValidator.split_options(
+            ["todo", "--limit", "10", "--after=abc", "--verbose"],
+            ["limit", "after"],
+            ["verbose"],
+        )
+
+        self.assertEqual(positional, ["todo"])
+        self.assertEqual(options, {"limit": "10", "after": "abc", "verbose": True})
+
+    def test_split_options_unknown_option(self):
+        """Test that unknown options are rejected"""
+        self.assertIsNone(ArgumentValidator.split_options(["--nope"], ["limit"]))
+
+    def test_split_options_missing_value(self):
+        """Test that value options require a value"""
+        self.assertIsNone(ArgumentValidator.split_options(["--limit"], ["limit"]))
+
+    def test_validate_list_options(self):
+        """Test parsing the list command arguments"""
+        options = ArgumentValidator.validate_list_options(
+            ["task-cli", "list", "DONE", "--limit", "5"]
+        )
+
+        self.assertEqual(
+            options,
+            {
+                "status": "done",
+                "limit": 5,
+                "after": None,
+                "format": "text",
+                "since": None,
+                "until": None,
+                "updated_since": None,
+                "include_archived": False,
+                "all_projects": False,
+            },
+        )
+
+    def test_validate_list_options_defaults(self):
+        """Test list arguments without a status or options"""
+        options = ArgumentValidator.validate_list_options(["task-cli", "list"])
+
+        self.assertEqual(
+            options,
+            {
+                "status": "all",
+                "limit": None,
+                "after": None,
+                "format": "text",
+                "since": None,
+                "until": None,
+                "updated_since": None,
+                "include_archived": False,
+                "all_projects": False,
+            },
+        )
+
+    def test_validate_list_options_date_filters(self):
+        """Test the date filter options of the list command"""
+        options = ArgumentValidator.validate_list_options(
+            ["task-cli", "list", "--since", "2026-01-01", "--updated-since=today"]
+        )
+
+        self.assertEqual(options["since"], "2026-01-01")
+        self.assertIsNone(options["until"])
+        self.assertEqual(options["updated_since"], "today")
+
+    def test_validate_archive_options(self):
+        """Test parsing the archive command options"""
+        self.assertEqual(
+            ArgumentValidator.validate_archive_options(
+                ["task-cli", "archive", "--older-than=30d", "--compact"]
+            ),
+            {"older_than": "30d", "batch_size": 1000, "compact": True},
+        )
+        self.assertIsNone(
+            ArgumentValidator.validate_archive_options(["task-cli", "archive"])
+        )
+        self.assertIsNone(
+            ArgumentValidator.validate_archive_options(
+                ["task-cli", "archive", "--older-than", "1d", "--batch-size", "x"]
+            )
+        )
+
+    def test_validate_list_options_invalid_limit(self):
+        """Test that a non-numeric limit is rejected"""
+        self.assertIsNone(
+            ArgumentValidator.validate_list_options(["task-cli", "list", "--limit", "x"])
+        )
+
+    def test_validate_stats_options(self):
+        """Test parsing the stats command flags"""
+        self.assertEqual(
+            ArgumentValidator.validate_stats_options(["task-cli", "stats", "--check"]),
+            {"check": True, "repair": False},
+        )
+        self.assertIsNone(
+            ArgumentValidator.validate_stats_options(["task-cli", "stats", "todo"])
+        )
+
+    def test_validate_list_options_format(self):
+        """Test the output format option of the list command"""
+        options = ArgumentValidator.validate_list_options(
+            ["task-cli", "list", "--format=CSV"]
+        )
+
+        self.assertEqual(options["format"], "csv")
+        self.assertIsNone(
+            ArgumentValidator.validate_list_options(
+                ["task-cli", "list", "--format", "xml"]
+            )
+        )
+
+    def test_validate_serve_options(self):
+        """Test that the port and worker count are range checked"""
+        self.assertEqual(
+            ArgumentValidator.validate_serve_options(
+                ["task-cli", "serve", "--port", "0", "--workers=2"]
+            ),
+            {"host": "127.0.0.1", "port": 0, "workers": 2, "verbose": False},
+        )
+        for args in (["--port", "99999"], ["--port", "-1"], ["--workers", "-1"]):
+            with self.subTest(args=args):
+                self.assertIsNone(
+                    ArgumentValidator.validate_serve_options(
+                        ["task-cli", "serve", *args]
+                    )
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()